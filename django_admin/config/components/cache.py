@@ -0,0 +1,19 @@
+# config/components/cache.py
+# Определение настроек кэша для приложения.
+
+from config.components.pydantic_config import cache_config
+
+CACHES = {
+    'default': {
+        'BACKEND': cache_config.backend,
+        'LOCATION': cache_config.location,
+    },
+    # Rendered responses of the movies API (movies/http_cache.py)
+    'api': {
+        'BACKEND': cache_config.api_backend,
+        'LOCATION': cache_config.api_location,
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+        },
+    },
+}
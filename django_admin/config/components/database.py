@@ -2,26 +2,84 @@
 # Определение настроек базы данных для приложения.
 
 import os
-from config.components.pydantic_config import primary_db_config, secondary_db_config
+from config.components.pydantic_config import db_pool_config, primary_db_config, secondary_db_config
+
+# Connections are borrowed from a pool of each process, or kept open by each thread for
+# DB_CONN_MAX_AGE seconds without one; either way a request does not connect
+if db_pool_config.enabled:
+    engine = 'config.db_backends.postgresql_pool'
+    conn_max_age = 0
+    pool = {
+        'min_size': db_pool_config.min_size,
+        'max_size': db_pool_config.max_size,
+        'timeout': db_pool_config.timeout,
+        'max_idle': db_pool_config.max_idle,
+    }
+else:
+    engine = 'django.db.backends.postgresql'
+    conn_max_age = db_pool_config.conn_max_age
+    pool = None
+
+
+def pool_options(**overrides) -> dict:
+    # OPTIONS of the pooled backend, nothing for the stock one
+    return {'pool': {**pool, **overrides}} if pool is not None else {}
+
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': engine,
         'NAME': primary_db_config.db_name,
         'USER': primary_db_config.db_user,
         'PASSWORD': primary_db_config.db_password.get_secret_value(),
         'HOST': primary_db_config.db_host,
         'PORT': primary_db_config.db_port,
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': db_pool_config.health_checks,
         'OPTIONS': {
-            'options': f"-c search_path={primary_db_config.search_path}"
+            'options': f"-c search_path={primary_db_config.search_path}",
+            **pool_options(),
         }
     },
     'secondary': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': engine,
         'NAME': secondary_db_config.db_name,
         'USER': secondary_db_config.db_user,
         'PASSWORD': secondary_db_config.db_password.get_secret_value(),
         'HOST': secondary_db_config.db_host,
         'PORT': secondary_db_config.db_port,
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': db_pool_config.health_checks,
+        'OPTIONS': {
+            # An unreachable replica must not hold up the requests that check it
+            'connect_timeout': 2,
+            **pool_options(timeout=2),
+        },
+        'TEST': {
+            'MIRROR': 'default',
+        },
     }
+}
+
+# Async pool of each process of the ASGI server (movies/async_views.py); one request borrows
+# up to three connections at once, so it is larger than the pool of a uWSGI process
+ASYNC_DB_POOL = {
+    'min_size': db_pool_config.async_min_size,
+    'max_size': db_pool_config.async_max_size,
+    'timeout': db_pool_config.timeout,
+    'max_idle': db_pool_config.max_idle,
+}
+
+# Reads of the movies read paths go to the secondary while it is healthy (movies/db_routing.py)
+DATABASE_ROUTERS = ['movies.db_routing.PrimaryReplicaRouter']
+REPLICA_DATABASE = 'secondary'
+REPLICA_READS = secondary_db_config.reads
+REPLICA_MAX_LAG = secondary_db_config.max_lag
+REPLICA_STICKY_SECONDS = secondary_db_config.sticky_seconds
+
+# Admin views that read from the secondary; the API views are marked with use_replica
+REPLICA_READ_VIEWS = {
+    'admin:movies_filmwork_changelist',
+    'admin:movies_genre_changelist',
+    'admin:movies_person_changelist',
 }
\ No newline at end of file
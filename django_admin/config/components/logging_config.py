@@ -118,4 +118,7 @@ def get_logger(name:str) -> logging.Logger:
 
     return logger
 
-logger = get_logger('APP')
\ No newline at end of file
+logger = get_logger('APP')
+
+# Per-request query statistics of movies.query_budget.QueryBudgetMiddleware
+query_logger = get_logger('QUERIES')
\ No newline at end of file
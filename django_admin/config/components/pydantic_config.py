@@ -27,6 +27,8 @@ class AppConfig(BaseConfig):
     language_code: str = Field(default="ru-RU", validation_alias="LANGUAGE_CODE")
     time_zone: str = Field(default="UTC", validation_alias="TIME_ZONE")
     allowed_hosts: List[str] = Field(default=["127.0.0.1"], validation_alias="ALLOWED_HOSTS")
+    admin_exact_count_threshold: int = Field(default=100_000, validation_alias="ADMIN_EXACT_COUNT_THRESHOLD")
+    query_budget_strict: bool = Field(default=False, validation_alias="QUERY_BUDGET_STRICT")
 
 class PrimaryDatabaseConfig(BaseConfig):
     """
@@ -48,7 +50,35 @@ class SecondaryDatabaseConfig(BaseConfig):
     db_password: SecretStr | None = Field(default=None, validation_alias="SECONDARY_DB_PASSWORD")
     db_host: str = Field(default="127.0.0.1", validation_alias="SECONDARY_DB_HOST")
     db_port: int = Field(default=5432, validation_alias="SECONDARY_DB_PORT")
+    reads: bool = Field(default=False, validation_alias="SECONDARY_DB_READS")
+    max_lag: float = Field(default=5.0, validation_alias="SECONDARY_DB_MAX_LAG")
+    sticky_seconds: int = Field(default=10, validation_alias="SECONDARY_DB_STICKY_SECONDS")
+
+class DatabasePoolConfig(BaseConfig):
+    """
+    Класс конфигурации пула соединений с базами данных, отдельного в каждом процессе uWSGI.
+    """
+    enabled: bool = Field(default=True, validation_alias="DB_POOL")
+    min_size: int = Field(default=2, validation_alias="DB_POOL_MIN_SIZE")
+    max_size: int = Field(default=16, validation_alias="DB_POOL_MAX_SIZE")
+    timeout: float = Field(default=10.0, validation_alias="DB_POOL_TIMEOUT")
+    max_idle: float = Field(default=600.0, validation_alias="DB_POOL_MAX_IDLE")
+    health_checks: bool = Field(default=True, validation_alias="DB_HEALTH_CHECKS")
+    conn_max_age: int = Field(default=60, validation_alias="DB_CONN_MAX_AGE")
+    async_min_size: int = Field(default=4, validation_alias="ASYNC_DB_POOL_MIN_SIZE")
+    async_max_size: int = Field(default=30, validation_alias="ASYNC_DB_POOL_MAX_SIZE")
+
+class CacheConfig(BaseConfig):
+    """
+    Класс конфигурации кэша, общего для процессов приложения.
+    """
+    backend: str = Field(default="django.core.cache.backends.locmem.LocMemCache", validation_alias="CACHE_BACKEND")
+    location: str = Field(default="kinoservice", validation_alias="CACHE_LOCATION")
+    api_backend: str = Field(default="django.core.cache.backends.locmem.LocMemCache", validation_alias="API_CACHE_BACKEND")
+    api_location: str = Field(default="kinoservice-api", validation_alias="API_CACHE_LOCATION")
 
 app_config = AppConfig()
 primary_db_config = PrimaryDatabaseConfig()
 secondary_db_config = SecondaryDatabaseConfig()
+db_pool_config = DatabasePoolConfig()
+cache_config = CacheConfig()
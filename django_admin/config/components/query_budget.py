@@ -0,0 +1,22 @@
+# config/components/query_budget.py
+# Бюджеты запросов к базе данных для представлений (movies.query_budget.QueryBudgetMiddleware).
+
+from config.components.pydantic_config import app_config
+
+# Maximum number of queries by view name; the admin pages run a fixed number of them
+# whatever the size of the catalog, so an N+1 regression goes over the budget
+QUERY_BUDGETS = {
+    'admin:index': 6,
+    'admin:autocomplete': 4,
+    'admin:movies_filmwork_changelist': 14,
+    'admin:movies_filmwork_change': 18,
+    'admin:movies_filmwork_add': 8,
+    'admin:movies_filmwork_inline_page': 9,
+    'admin:movies_genre_changelist': 9,
+    'admin:movies_genre_change': 7,
+    'admin:movies_person_changelist': 9,
+    'admin:movies_person_change': 7,
+}
+
+# Fail the request instead of logging it when a view goes over its budget
+QUERY_BUDGET_STRICT = app_config.query_budget_strict
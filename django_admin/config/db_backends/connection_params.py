@@ -0,0 +1,29 @@
+# config/db_backends/connection_params.py
+
+from django.db import connections
+
+# Parameters of Django's backends that only fit the connections it wraps: the pool
+# of the pooled backend, and its cursor class and adapters, which are sync-only and
+# cannot be pickled
+DJANGO_PARAMS = ('pool', 'cursor_factory', 'context')
+
+
+def get_psycopg_params(alias: str, autocommit: bool = False) -> dict:
+    """
+    Builds the psycopg connection parameters of a database the way its Django backend does.
+
+    The parameters keep what the backend adds to the settings, e.g. client_encoding.
+
+    Args:
+        alias (str): Alias of the database.
+        autocommit (bool): Whether the connection commits every statement.
+
+    Returns:
+        dict: Keyword arguments of psycopg.connect and AsyncConnection.connect.
+    """
+    params = connections[alias].get_connection_params()
+    for key in DJANGO_PARAMS:
+        params.pop(key, None)
+    if autocommit:
+        params['autocommit'] = True
+    return params
@@ -0,0 +1,141 @@
+# config/db_backends/postgresql_pool/base.py
+
+import json
+import os
+import threading
+import time
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.base.base import NO_DB_ALIAS
+from psycopg import IsolationLevel
+from psycopg_pool import ConnectionPool
+from config.components.logging_config import query_logger
+from .creation import DatabaseCreation
+
+# How often a process writes the statistics of each of its pools to the QUERIES log, in seconds
+STATS_INTERVAL = 60
+
+# Pools of this process by alias and database name. A process forked after they were
+# created finds another pid and opens its own: the threads of the inherited pools did
+# not survive the fork and their sockets belong to the parent.
+pools = {}
+pools_pid = None
+pools_lock = threading.Lock()
+stats_logged = {}
+
+
+def close_pool(alias: str, name: str):
+    """
+    Closes the pool of the database of this process and forgets it, e.g. before the database is dropped.
+
+    The connections still borrowed from the pool are closed when they are returned.
+
+    Args:
+        alias (str): Alias of the database.
+        name (str): Name of the database the pool connects to.
+    """
+    with pools_lock:
+        pool = pools.pop((alias, name), None) if pools_pid == os.getpid() else None
+        stats_logged.pop(pool.name if pool else None, None)
+    if pool is not None:
+        pool.close()
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """
+    PostgreSQL backend that borrows its connections from a psycopg_pool pool of the process.
+
+    Closing the connection, which Django does at the end of every request, returns it
+    to the pool, so a request neither connects nor authenticates. OPTIONS["pool"] holds
+    the arguments of ConnectionPool (min_size, max_size, timeout, max_idle, ...); with
+    CONN_HEALTH_CHECKS the pool checks every connection before lending it.
+
+    Attributes:
+        pool_wait (float): Seconds the current connection waited for the pool.
+        borrowed_from (Optional[ConnectionPool]): Pool the current connection was borrowed from.
+    """
+    creation_class = DatabaseCreation
+    pool_wait = 0.0
+    borrowed_from = None
+
+    @property
+    def pool(self) -> ConnectionPool:
+        global pools_pid
+        key = (self.alias, self.settings_dict['NAME'])
+        with pools_lock:
+            if pools_pid != os.getpid():
+                pools.clear()
+                stats_logged.clear()
+                pools_pid = os.getpid()
+            if key not in pools:
+                pools[key] = self.create_pool()
+            return pools[key]
+
+    def create_pool(self) -> ConnectionPool:
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured('A pooled database needs CONN_MAX_AGE = 0, the pool keeps the connections.')
+        conn_params = self.get_connection_params()
+        # Django switches autocommit on after connecting; the pool checks idle connections in it
+        conn_params['autocommit'] = True
+        return ConnectionPool(
+            kwargs=conn_params,
+            # Opened by the first connection, so that no pool thread exists before a fork
+            open=False,
+            check=ConnectionPool.check_connection if self.settings_dict['CONN_HEALTH_CHECKS'] else None,
+            name=f'{self.alias}-{os.getpid()}',
+            **self.settings_dict['OPTIONS'].get('pool', {}),
+        )
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        if self.alias == NO_DB_ALIAS:
+            # The short connections to the "postgres" database, e.g. to create the test database
+            return super().get_new_connection(conn_params)
+
+        pool = self.pool
+        pool.open()
+        started = time.perf_counter()
+        connection = pool.getconn()
+        self.pool_wait = time.perf_counter() - started
+        self.borrowed_from = pool
+        self.log_pool_stats(pool)
+
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = IsolationLevel(options.get('isolation_level', IsolationLevel.READ_COMMITTED))
+        if 'isolation_level' in options:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.alias == NO_DB_ALIAS:
+            return super()._close()
+        # The pool the connection came from, even if the settings changed since
+        pool, self.borrowed_from = self.borrowed_from, None
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
+
+    def pop_pool_wait(self) -> float:
+        """
+        Returns the time the connection waited for the pool once; the next calls get 0 until it is borrowed again.
+        """
+        pool_wait, self.pool_wait = self.pool_wait, 0.0
+        return pool_wait
+
+    def log_pool_stats(self, pool: ConnectionPool):
+        """
+        Writes the statistics gathered since the previous record, at most every STATS_INTERVAL seconds.
+
+        requests_wait_ms is the time the connections waited for in total, requests_waiting
+        the number of requests waiting right now and pool_size / pool_available the
+        connections open and idle.
+        """
+        now = time.monotonic()
+        with pools_lock:
+            if now - stats_logged.get(pool.name, 0.0) < STATS_INTERVAL:
+                return
+            stats_logged[pool.name] = now
+        query_logger.info(json.dumps({'pool': pool.name, **pool.pop_stats()}))
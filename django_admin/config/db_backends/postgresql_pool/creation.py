@@ -0,0 +1,47 @@
+# config/db_backends/postgresql_pool/creation.py
+
+from django.db import connections
+from django.db.backends.postgresql.creation import DatabaseCreation as PostgresDatabaseCreation
+
+
+class DatabaseCreation(PostgresDatabaseCreation):
+    """
+    Creation of the test databases that closes the pools of a database whose name changes.
+
+    The pools of the process are kept by alias and database name, so the pool of the
+    previous name would otherwise keep its connections open, and a test database
+    could not be dropped while a pool of any alias is connected to it.
+    """
+    def close_pool(self, name: str):
+        from .base import close_pool
+        close_pool(self.connection.alias, name)
+
+    def create_test_db(self, *args, **kwargs):
+        name = self.connection.settings_dict['NAME']
+        try:
+            return super().create_test_db(*args, **kwargs)
+        finally:
+            if self.connection.settings_dict['NAME'] != name:
+                self.close_pool(name)
+
+    def set_as_test_mirror(self, primary_settings_dict):
+        name = self.connection.settings_dict['NAME']
+        super().set_as_test_mirror(primary_settings_dict)
+        if self.connection.settings_dict['NAME'] != name:
+            self.close_pool(name)
+
+    def destroy_test_db(self, *args, **kwargs):
+        name = self.connection.settings_dict['NAME']
+        super().destroy_test_db(*args, **kwargs)
+        if self.connection.settings_dict['NAME'] != name:
+            self.close_pool(name)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Mirrors of this database have pools of their own connected to it
+        for connection in connections.all(initialized_only=True):
+            if connection.settings_dict['NAME'] == test_database_name:
+                connection.close()
+                if hasattr(connection.creation, 'close_pool'):
+                    connection.creation.close_pool(test_database_name)
+        self.close_pool(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
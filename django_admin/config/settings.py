@@ -22,17 +22,21 @@ DEBUG = app_config.debug
 ALLOWED_HOSTS = app_config.allowed_hosts
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'movies.apps.MoviesAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'movies.apps.MoviesConfig',
 ]
 
 MIDDLEWARE = [
+    # First, so that the queries of the other middleware are counted too
+    'movies.query_budget.QueryBudgetMiddleware',
+    'movies.db_routing.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -42,6 +46,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Admin change lists count the rows exactly below this planner estimate and show "~N" above it
+ADMIN_EXACT_COUNT_THRESHOLD = app_config.admin_exact_count_threshold
+
 # URLs
 ROOT_URLCONF = 'config.urls'
 
@@ -67,6 +74,12 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 include('components/database.py')
 
+# Cache
+include('components/cache.py')
+
+# Query budgets
+include('components/query_budget.py')
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -1,7 +1,17 @@
 # movies/admin.py
 
-from django.contrib import admin
-from .models import Genre, Filmwork, Person, GenreFilmwork, PersonFilmwork
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.html import format_html
+from . import bulk_actions
+from .facets import GenreFacetFilter, TypeFacetFilter
+from .forms import BulkFieldsForm, BulkGenreForm, BulkPersonForm
+from .inlines import PaginatedInlinesAdminMixin, PaginatedTabularInline
+from .models import BulkActionJob, Genre, Filmwork, Person, GenreFilmwork, PersonFilmwork
+from .pagination import ApproximateCountAdminMixin, KeysetPaginationAdminMixin, count_rows
+from .search import IndexedSearchAdminMixin
 from django.utils.translation import gettext_lazy as _
 
 
@@ -9,47 +19,150 @@ class GenreFilmworkInline(admin.TabularInline):
     model = GenreFilmwork
     autocomplete_fields = ('genre',)
 
-class PersonFilmworkInline(admin.TabularInline):
+class PersonFilmworkInline(PaginatedTabularInline):
+    # Series have thousands of credits, so they are shown and submitted page by page
     model = PersonFilmwork
     autocomplete_fields = ('person',)
+    ordering = ('role', 'person__full_name', 'id')
 
 @admin.register(Genre)
-class GenreAdmin(admin.ModelAdmin):
+class GenreAdmin(ApproximateCountAdminMixin, admin.ModelAdmin):
     # Display fields in the list
     list_display = ('name', 'created', 'modified')
     # Search by fields
     search_fields = ('name',)
+    autocomplete_prefix_field = 'name'
     # Filtering in the list
     list_filter = ('created', 'modified')
     empty_value_display = _('--empty--')
 
 @admin.register(Person)
-class PersonAdmin(admin.ModelAdmin):
+class PersonAdmin(IndexedSearchAdminMixin, ApproximateCountAdminMixin, admin.ModelAdmin):
     list_display = ('full_name', 'created', 'modified')
     search_fields = ('full_name',)
+    trigram_search_fields = ('full_name',)
+    autocomplete_prefix_field = 'full_name'
     list_filter = ('created', 'modified')
     empty_value_display = _('--empty--')
 
 @admin.register(Filmwork)
-class FilmworkAdmin(admin.ModelAdmin):
+class FilmworkAdmin(IndexedSearchAdminMixin, KeysetPaginationAdminMixin, PaginatedInlinesAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'type', 'creation_date', 'rating', 'get_genres', 'get_persons')
-    search_fields = ('title', 'description', 'id')
-    list_filter = ('type', 'genres')
+    # Ids are found by the UUID lookup of IndexedSearchAdminMixin
+    search_fields = ('title', 'description')
+    trigram_search_fields = ('title',)
+    fulltext_search_fields = ('search_vector',)
+    keyset_field = 'creation_date'
+    # Counts from the facet table, kept by triggers
+    list_filter = (('type', TypeFacetFilter), ('genres', GenreFacetFilter))
     empty_value_display = _('--empty--')
     inlines = (GenreFilmworkInline, PersonFilmworkInline)
+    actions = ('add_genre', 'remove_genre', 'assign_person', 'set_fields')
 
     def get_queryset(self, request):
-        # Optimize queries for genres and persons
-        queryset = super().get_queryset(request).prefetch_related('genres', 'persons')
+        # Genres and persons of every film come from its summary row in the same query,
+        # so a page costs the same number of queries whatever its size
+        queryset = super().get_queryset(request).select_related('summary').defer('search_vector')
         return queryset
 
     def get_genres(self, obj):
         # Return a string with genres
-        return ', '.join([genre.name for genre in obj.genres.all()])
+        summary = getattr(obj, 'summary', None)
+        return ', '.join(summary.genres) if summary else None
     get_genres.short_description = _('genres')
 
     def get_persons(self, obj):
-        # Return a string with personal data (role and full_name)
-        persons = obj.personfilmwork_set.all()
-        return ', '.join([f"{person.person.full_name} ({person.role})" for person in persons])
-    get_persons.short_description = _('persons')
\ No newline at end of file
+        # Return a string with personal data (full_name and role)
+        summary = getattr(obj, 'summary', None)
+        if not summary:
+            return None
+        return ', '.join(
+            f"{person['name']} ({role})"
+            for role, persons in sorted(summary.persons.items())
+            for person in persons
+        )
+    get_persons.short_description = _('persons')
+
+    def run_bulk_action(self, request, queryset, form_class, operation, description):
+        # Asks for the parameters of the action first, then applies it to the whole
+        # selection in set-based statements; large selections are queued as jobs
+        # for the run_bulk_actions command
+        form = form_class(request.POST if 'apply' in request.POST else None, admin_site=self.admin_site)
+        count = count_rows(queryset, bulk_actions.BULK_CHUNK_SIZE)
+        if form.is_valid():
+            if count > bulk_actions.BULK_CHUNK_SIZE:
+                job = bulk_actions.queue_bulk_action(operation, queryset, form.get_params(), str(description))
+                self.message_user(
+                    request,
+                    format_html(
+                        _('{action}: queued for {count} films, <a href="{url}">follow its progress</a>.'),
+                        action=description,
+                        count=job.total,
+                        url=reverse(f'{self.admin_site.name}:movies_bulkactionjob_change', args=[job.pk]),
+                    ),
+                    messages.INFO,
+                )
+            else:
+                changed = bulk_actions.run_bulk_action(operation, queryset, form.get_params())
+                self.message_user(
+                    request,
+                    _('%(action)s: %(changed)s of %(count)s films changed.') % {'action': description, 'changed': changed, 'count': count},
+                    messages.SUCCESS,
+                )
+            return None
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': description,
+            'opts': self.model._meta,
+            'form': form,
+            'media': self.media + form.media,
+            'count': count,
+            'action': request.POST['action'],
+            'select_across': request.POST.get('select_across') == '1',
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(request, 'admin/movies/filmwork/bulk_action.html', context)
+
+    def add_genre(self, request, queryset):
+        return self.run_bulk_action(request, queryset, BulkGenreForm, bulk_actions.add_genre, self.add_genre.short_description)
+    add_genre.short_description = _('Add a genre to the selected films')
+    add_genre.allowed_permissions = ('change',)
+
+    def remove_genre(self, request, queryset):
+        return self.run_bulk_action(request, queryset, BulkGenreForm, bulk_actions.remove_genre, self.remove_genre.short_description)
+    remove_genre.short_description = _('Remove a genre from the selected films')
+    remove_genre.allowed_permissions = ('change',)
+
+    def assign_person(self, request, queryset):
+        return self.run_bulk_action(request, queryset, BulkPersonForm, bulk_actions.assign_person, self.assign_person.short_description)
+    assign_person.short_description = _('Assign a person with a role to the selected films')
+    assign_person.allowed_permissions = ('change',)
+
+    def set_fields(self, request, queryset):
+        return self.run_bulk_action(request, queryset, BulkFieldsForm, bulk_actions.set_fields, self.set_fields.short_description)
+    set_fields.short_description = _('Set the type or rating of the selected films')
+    set_fields.allowed_permissions = ('change',)
+
+@admin.register(BulkActionJob)
+class BulkActionJobAdmin(admin.ModelAdmin):
+    # Jobs are created by the bulk actions of the films and changed by the run_bulk_actions command only
+    list_display = ('description', 'status', 'get_progress', 'changed', 'created', 'modified')
+    list_filter = ('status',)
+    fields = ('description', 'operation', 'params', 'status', 'get_progress', 'changed', 'error', 'created', 'modified')
+    readonly_fields = fields
+
+    def get_queryset(self, request):
+        # The ids of the films of a job are never shown
+        return super().get_queryset(request).defer('film_ids')
+
+    def get_progress(self, obj):
+        return f'{obj.processed} / {obj.total}'
+    get_progress.short_description = _('processed films')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.contrib.admin.apps import AdminConfig
 from django.utils.translation import gettext_lazy as _
 
 
@@ -6,3 +7,12 @@ class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     verbose_name = _('movies')
     name = 'movies'
+
+    def ready(self):
+        # Connect the receivers that keep the film summary fresh
+        from . import signals  # noqa: F401
+
+
+class MoviesAdminConfig(AdminConfig):
+    # Replaces the default admin site, so the models registered with admin.register use it
+    default_site = 'movies.sites.MoviesAdminSite'
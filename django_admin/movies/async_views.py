@@ -0,0 +1,218 @@
+# movies/async_views.py
+
+import asyncio
+import json
+import os
+import time
+import uuid
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import router
+from django.http import HttpResponse, HttpResponseNotAllowed
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+from config.db_backends.connection_params import get_psycopg_params
+from .db_routing import use_replica
+from .http_cache import conditional_response, make_validators
+from .models import Filmwork
+from .query_budget import current_stats, query_budget
+from .views import get_next_url, get_page_params, json_error
+
+# Ids of the films of a page; every query of the page repeats it, so that they do not wait for each other
+PAGE_IDS_SQL = "SELECT fw.id FROM content.film_work fw {condition} ORDER BY fw.id LIMIT %(limit)s"
+
+# Films of the page, without their genres and persons
+FILMS_SQL = """
+    SELECT fw.id, fw.title, fw.type, fw.rating, fw.creation_date{columns}
+    FROM content.film_work fw
+    {condition}
+    ORDER BY fw.id
+    LIMIT %(limit)s
+"""
+
+# Names of the genres of every film of the page, as a JSON array
+GENRES_SQL = f"""
+    SELECT gfw.film_work_id, json_agg(g.name ORDER BY g.name)::text
+    FROM ({PAGE_IDS_SQL}) page
+    JOIN content.genre_film_work gfw ON gfw.film_work_id = page.id
+    JOIN content.genre g ON g.id = gfw.genre_id
+    GROUP BY gfw.film_work_id
+"""
+
+# Persons of every film of the page grouped by role, as a JSON object
+PERSONS_SQL = f"""
+    SELECT roles.film_work_id, json_object_agg(roles.role, roles.persons)::text
+    FROM (
+        SELECT pfw.film_work_id, pfw.role,
+            json_agg(json_build_object('id', p.id, 'name', p.full_name) ORDER BY p.full_name) AS persons
+        FROM ({PAGE_IDS_SQL}) page
+        JOIN content.person_film_work pfw ON pfw.film_work_id = page.id
+        JOIN content.person p ON p.id = pfw.person_id
+        GROUP BY pfw.film_work_id, pfw.role
+    ) roles
+    GROUP BY roles.film_work_id
+"""
+
+# Pools of this process by event loop and database alias; a pool only works on the loop it was opened on
+pools: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncConnectionPool]]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def get_pool(alias: str) -> AsyncConnectionPool:
+    """
+    Returns the pool of the database for the running event loop, opening it on first use.
+    """
+    loop_pools = pools.setdefault(asyncio.get_running_loop(), {})
+    pool = loop_pools.get(alias)
+    if pool is None:
+        pool = loop_pools[alias] = AsyncConnectionPool(
+            kwargs=get_psycopg_params(alias, autocommit=True),
+            open=False,
+            check=AsyncConnectionPool.check_connection,
+            name=f'{alias}-async-{os.getpid()}',
+            **settings.ASYNC_DB_POOL,
+        )
+    # Also waits for the opening started by a concurrent request
+    await pool.open()
+    return pool
+
+
+@asynccontextmanager
+async def borrow_connection(alias: str, pooled: bool) -> AsyncIterator[AsyncConnection]:
+    """
+    Borrows a connection from the pool, or opens one for a single query without it.
+
+    Args:
+        alias (str): Alias of the database.
+        pooled (bool): Whether the event loop outlives the request, which is only so under ASGI.
+    """
+    if pooled:
+        pool = await get_pool(alias)
+        async with pool.connection() as connection:
+            yield connection
+    else:
+        async with await AsyncConnection.connect(**get_psycopg_params(alias, autocommit=True)) as connection:
+            yield connection
+
+
+async def fetch_all(alias: str, pooled: bool, sql: str, params: dict) -> List[tuple]:
+    """ Runs the query on a connection of its own and records it in the statistics of the request. """
+    async with borrow_connection(alias, pooled) as connection:
+        started = time.perf_counter()
+        cursor = await connection.execute(sql, params)
+        rows = await cursor.fetchall()
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record(sql, time.perf_counter() - started)
+    return rows
+
+
+async def fetch_films(request, condition: str, params: dict, columns: str = '') -> List[Tuple[uuid.UUID, str]]:
+    """
+    Reads the films matching the condition with their genres and persons.
+
+    The films, their genres and their persons are read by three queries at once, each
+    on a connection of its own; the genres and persons of a film changed between them
+    may be a moment newer than the film.
+
+    Args:
+        condition (str): WHERE clause on film_work "fw", with %(name)s placeholders.
+        params (dict): Parameters of the condition and "limit", the maximum number of films.
+        columns (str): Additional columns of film_work, as ", fw.column" items.
+
+    Returns:
+        List[Tuple[uuid.UUID, str]]: Id and JSON document of every film, in the order of their ids.
+    """
+    alias = await sync_to_async(router.db_for_read)(Filmwork)
+    pooled = isinstance(request, ASGIRequest)
+    films, genres, persons = await asyncio.gather(
+        fetch_all(alias, pooled, FILMS_SQL.format(columns=columns, condition=condition), params),
+        fetch_all(alias, pooled, GENRES_SQL.format(condition=condition), params),
+        fetch_all(alias, pooled, PERSONS_SQL.format(condition=condition), params),
+    )
+    genres = dict(genres)
+    persons = dict(persons)
+    extra_columns = [column.strip()[len('fw.'):] for column in columns.split(',')[1:]]
+
+    documents = []
+    for film_id, title, film_type, rating, creation_date, *extra in films:
+        fields = {
+            'id': str(film_id),
+            'title': title,
+            'type': film_type,
+            'rating': rating,
+            'creation_date': creation_date.isoformat() if creation_date is not None else None,
+        }
+        fields.update(zip(extra_columns, extra))
+        # The arrays and objects built by the database are joined into the document as they are
+        documents.append((
+            film_id,
+            f"{json.dumps(fields)[:-1]}, "
+            f"\"genres\": {genres.get(film_id, '[]')}, \"persons\": {persons.get(film_id, '{}')}}}",
+        ))
+    return documents
+
+
+def json_response(request, body: str) -> HttpResponse:
+    """ Response of a rendered document that nginx may cache and revalidate by its ETag. """
+    etag, modified = make_validators(body)
+    return conditional_response(request, HttpResponse(body, content_type='application/json'), etag, modified)
+
+
+def check_method(request) -> Optional[HttpResponse]:
+    # require_GET only wraps sync views in this version of Django
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    return None
+
+
+def seek_condition(cursor_id: Optional[uuid.UUID]) -> Tuple[str, dict]:
+    return ('WHERE fw.id > %(cursor)s', {'cursor': cursor_id}) if cursor_id is not None else ('', {})
+
+
+@query_budget(3)
+@use_replica
+async def movies_list(request):
+    """
+    Async counterpart of views.movies_list, served by the ASGI server.
+
+    Reads the film_work tables rather than the summaries, with the films, genres and
+    persons of the page queried concurrently, and waits for the database and for
+    slow clients without holding a thread. The responses are not cached here.
+    """
+    not_allowed = check_method(request)
+    if not_allowed is not None:
+        return not_allowed
+    try:
+        cursor_id, page_size = get_page_params(request)
+    except ValueError as e:
+        return json_error(str(e), 400)
+
+    condition, params = seek_condition(cursor_id)
+    # One more film than the page holds tells whether there is a next page
+    films = await fetch_films(request, condition, {**params, 'limit': page_size + 1})
+    next_url = None
+    if len(films) > page_size:
+        films = films[:page_size]
+        next_url = get_next_url(request, films[-1][0], page_size)
+    return json_response(request, f'{{"next": {json.dumps(next_url)}, "results": [{",".join(film for _, film in films)}]}}')
+
+
+@query_budget(3)
+@use_replica
+async def movie_detail(request, pk: uuid.UUID):
+    """
+    Async counterpart of views.movie_detail.
+    """
+    not_allowed = check_method(request)
+    if not_allowed is not None:
+        return not_allowed
+    films = await fetch_films(request, 'WHERE fw.id = %(id)s', {'id': pk, 'limit': 1}, columns=', fw.description')
+    if not films:
+        return json_error('Film not found', 404)
+    return json_response(request, films[0][1])
@@ -0,0 +1,169 @@
+# movies/autocomplete.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Type
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db import models
+from django.db.models.functions import Collate, Lower
+from django.http import Http404, JsonResponse
+
+# Per-process cache of the hot prefixes; other processes see an invalidation after at most LOCAL_CACHE_TTL
+LOCAL_CACHE_SIZE = 1024
+LOCAL_CACHE_TTL = 5
+# Lifetime of the responses in the cache shared by the processes
+SHARED_CACHE_TTL = 60
+
+
+class LRUCache:
+    """
+    Thread-safe least recently used cache whose entries expire after ttl seconds.
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_cache = LRUCache(LOCAL_CACHE_SIZE, LOCAL_CACHE_TTL)
+
+
+def version_key(model: Type[models.Model]) -> str:
+    return f'autocomplete:{model._meta.label_lower}:version'
+
+
+def get_cached(model: Type[models.Model], key: tuple, compute: Callable[[], dict]) -> dict:
+    """
+    Returns the cached autocomplete response, computing and caching it on a miss.
+
+    The response is looked up in the cache of the process first, then in the shared
+    cache under the current version of the model, which every save of the model renews.
+
+    Args:
+        model (Type[models.Model]): Model of the suggested objects.
+        key (tuple): Parameters the response depends on.
+        compute (Callable[[], dict]): Builds the response.
+
+    Returns:
+        dict: Response.
+    """
+    local_key = (model._meta.label_lower, *key)
+    response = local_cache.get(local_key)
+    if response is not None:
+        return response
+
+    version = cache.get(version_key(model))
+    if version is None:
+        cache.add(version_key(model), time.time_ns(), timeout=None)
+        version = cache.get(version_key(model))
+
+    digest = hashlib.md5(repr(key).encode()).hexdigest()
+    shared_key = f'autocomplete:{model._meta.label_lower}:{version}:{digest}'
+    response = cache.get(shared_key)
+    if response is None:
+        response = compute()
+        cache.set(shared_key, response, SHARED_CACHE_TTL)
+
+    local_cache.set(local_key, response)
+    return response
+
+
+def invalidate_autocomplete(model: Type[models.Model]):
+    """
+    Drops the cached autocomplete responses of the model.
+
+    A new version is a new timestamp rather than an increment, so an evicted version
+    never brings back the responses cached under an old one.
+
+    Args:
+        model (Type[models.Model]): Model of the suggested objects.
+    """
+    local_cache.clear()
+    cache.set(version_key(model), time.time_ns(), timeout=None)
+
+
+class PrefixAutocompleteJsonView(AutocompleteJsonView):
+    """
+    Autocomplete that suggests the objects whose name starts with the term.
+
+    Used for the model admins that set autocomplete_prefix_field. The prefix is matched
+    on the lowercased field in the "C" collation, which an index on the same expression
+    serves both for the match and for the order, so a short prefix does not sort the
+    matching rows. The responses are cached; other admins get the stock view.
+    """
+    def get(self, request, *args, **kwargs):
+        self.term, self.model_admin, self.source_field, to_field_name = self.process_request(request)
+        if not self.has_perm(request):
+            raise PermissionDenied
+
+        if self.get_prefix_field() is None:
+            return super().get(request, *args, **kwargs)
+
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            raise Http404('Invalid page')
+        if page < 1:
+            raise Http404('Invalid page')
+
+        source = self.source_field.model._meta.label_lower, self.source_field.name
+        key = (*source, to_field_name, self.term.strip().lower(), page)
+        return JsonResponse(get_cached(self.model_admin.model, key, lambda: self.get_page(page, to_field_name)))
+
+    def get_prefix_field(self) -> Optional[str]:
+        return getattr(self.model_admin, 'autocomplete_prefix_field', None)
+
+    def get_queryset(self):
+        field = self.get_prefix_field()
+        if field is None:
+            return super().get_queryset()
+
+        queryset = self.model_admin.get_queryset(self.request)
+        queryset = queryset.complex_filter(self.source_field.get_limit_choices_to())
+        queryset = queryset.alias(autocomplete_key=Collate(Lower(field), 'C'))
+        term = self.term.strip().lower()
+        if term:
+            queryset = queryset.filter(autocomplete_key__startswith=term)
+        return queryset.order_by('autocomplete_key', 'pk')
+
+    def get_page(self, page: int, to_field_name: str) -> dict:
+        """
+        Builds the response for a page of the suggestions.
+
+        One more row than the page holds tells whether there is a next page,
+        so the matching rows are never counted.
+        """
+        bottom = (page - 1) * self.paginate_by
+        objects = list(self.get_queryset()[bottom:bottom + self.paginate_by + 1])
+        return {
+            'results': [self.serialize_result(obj, to_field_name) for obj in objects[:self.paginate_by]],
+            'pagination': {'more': len(objects) > self.paginate_by},
+        }
@@ -0,0 +1,234 @@
+# movies/bulk_actions.py
+
+import time
+from datetime import timedelta
+from typing import Callable, Iterator, List, Optional
+from django.db import connections, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from config.components.logging_config import logger
+from .models import BulkActionJob
+from .summary import refresh_film_summaries
+
+# Number of films changed by one statement; larger selections are queued as jobs
+BULK_CHUNK_SIZE = 5000
+
+# A running job that saved no progress for this long is taken over by another worker
+BULK_JOB_STALE_SECONDS = 600
+
+
+def add_genre(film_ids: List, using: str, genre_id) -> int:
+    """
+    Links the genre to the films; existing links are kept (film_work_genre_idx).
+
+    Returns:
+        int: Number of created links.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO content.genre_film_work (id, film_work_id, genre_id, created) "
+            "SELECT gen_random_uuid(), film_work_id, %s, now() FROM unnest(%s::uuid[]) AS film_work_id "
+            "ON CONFLICT (film_work_id, genre_id) DO NOTHING",
+            [genre_id, film_ids],
+        )
+        return cursor.rowcount
+
+
+def remove_genre(film_ids: List, using: str, genre_id) -> int:
+    """
+    Unlinks the genre from the films.
+
+    Returns:
+        int: Number of removed links.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM content.genre_film_work WHERE genre_id = %s AND film_work_id = ANY(%s::uuid[])",
+            [genre_id, film_ids],
+        )
+        return cursor.rowcount
+
+
+def assign_person(film_ids: List, using: str, person_id, role: str) -> int:
+    """
+    Links the person in the role to the films; existing links are kept (film_work_person_role_idx).
+
+    Returns:
+        int: Number of created links.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO content.person_film_work (id, film_work_id, person_id, role, created) "
+            "SELECT gen_random_uuid(), film_work_id, %s, %s, now() FROM unnest(%s::uuid[]) AS film_work_id "
+            "ON CONFLICT (film_work_id, person_id, role) DO NOTHING",
+            [person_id, role, film_ids],
+        )
+        return cursor.rowcount
+
+
+def set_fields(film_ids: List, using: str, values: dict) -> int:
+    """
+    Sets the fields of the films to the same values.
+
+    Args:
+        values (dict): New values by column name, e.g. {"type": "movie", "rating": 7.5}.
+
+    Returns:
+        int: Number of changed films.
+    """
+    assignments = ', '.join(f'{column} = %s' for column in values)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"UPDATE content.film_work SET {assignments}, modified = now() "
+            f"WHERE id = ANY(%s::uuid[]) AND ({', '.join(values)}) IS DISTINCT FROM ({', '.join(['%s'] * len(values))})",
+            [*values.values(), film_ids, *values.values()],
+        )
+        return cursor.rowcount
+
+
+def iter_film_ids(queryset: QuerySet, chunk_size: int) -> Iterator[List]:
+    """
+    Reads the ids of the films of the queryset in chunks, seeking by the primary key.
+
+    Args:
+        queryset (QuerySet): Selected films.
+        chunk_size (int): Number of ids per chunk.
+
+    Yields:
+        Iterator[List]: Ids of the films.
+    """
+    film_ids = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        chunk = list((film_ids if last is None else film_ids.filter(pk__gt=last))[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+def apply_chunk(operation: Callable, film_ids: List, using: str, params: dict) -> int:
+    """
+    Applies the operation to a chunk of films and refreshes their summaries.
+
+    The statements bypass the model signals, so the summaries are refreshed in the
+    transaction of the caller.
+
+    Returns:
+        int: Number of changed rows.
+    """
+    changed = operation(film_ids, using, **params)
+    refresh_film_summaries(film_ids, using=using)
+    return changed
+
+
+def run_bulk_action(operation: Callable, queryset: QuerySet, params: dict, chunk_size: int = BULK_CHUNK_SIZE) -> int:
+    """
+    Applies the operation to the selected films, one transaction per chunk.
+
+    Args:
+        operation (Callable): Operation, called with the ids of a chunk, the database alias and the params.
+        queryset (QuerySet): Selected films.
+        params (dict): Parameters of the operation.
+        chunk_size (int): Number of films per statement.
+
+    Returns:
+        int: Number of changed rows.
+    """
+    using = queryset.db
+    started = time.perf_counter()
+    changed = films = 0
+    for film_ids in iter_film_ids(queryset, chunk_size):
+        with transaction.atomic(using=using):
+            changed += apply_chunk(operation, film_ids, using, params)
+        films += len(film_ids)
+    logger.info(f"Bulk action {operation.__name__} changed {changed} rows of {films} films in {time.perf_counter() - started:.2f}s")
+    return changed
+
+
+def queue_bulk_action(operation: Callable, queryset: QuerySet, params: dict, description: str) -> BulkActionJob:
+    """
+    Saves the bulk action as a job for the run_bulk_actions command.
+
+    The ids of the selected films are read now, so the job changes the films
+    selected in the admin even if the filters match other films later.
+
+    Args:
+        operation (Callable): Operation, one of OPERATIONS.
+        queryset (QuerySet): Selected films.
+        params (dict): Parameters of the operation.
+        description (str): Description of the action shown with the job.
+
+    Returns:
+        BulkActionJob: Saved job.
+    """
+    film_ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+    return BulkActionJob.objects.using(queryset.db).create(
+        operation=operation.__name__,
+        description=description,
+        params=params,
+        film_ids=film_ids,
+        total=len(film_ids),
+    )
+
+
+def claim_job(using: str) -> Optional[BulkActionJob]:
+    """
+    Takes the oldest waiting job, or a running one whose worker stopped reporting progress.
+
+    The row is locked with SKIP LOCKED, so several workers never take the same job.
+
+    Returns:
+        Optional[BulkActionJob]: Job marked as running, or None if there is no job to run.
+    """
+    stale = timezone.now() - timedelta(seconds=BULK_JOB_STALE_SECONDS)
+    with transaction.atomic(using=using):
+        job = (
+            BulkActionJob.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .filter(Q(status=BulkActionJob.Statuses.PENDING) | Q(status=BulkActionJob.Statuses.RUNNING, modified__lt=stale))
+            .order_by('created')
+            .first()
+        )
+        if job is not None:
+            job.status = BulkActionJob.Statuses.RUNNING
+            job.save(update_fields=['status', 'modified'])
+    return job
+
+
+def run_job(job: BulkActionJob, chunk_size: int = BULK_CHUNK_SIZE) -> BulkActionJob:
+    """
+    Applies the job to its films after the ones already processed, one transaction per chunk.
+
+    The progress is saved with every chunk, so the job can be followed in the admin
+    and continues after the last applied chunk if the worker stops.
+
+    Args:
+        job (BulkActionJob): Claimed job.
+        chunk_size (int): Number of films per statement.
+
+    Returns:
+        BulkActionJob: Job marked as done or failed.
+    """
+    using = job._state.db
+    operation = OPERATIONS[job.operation]
+    started = time.perf_counter()
+    try:
+        while job.processed < job.total:
+            film_ids = job.film_ids[job.processed:job.processed + chunk_size]
+            with transaction.atomic(using=using):
+                job.changed += apply_chunk(operation, film_ids, using, job.params)
+                job.processed += len(film_ids)
+                job.save(update_fields=['processed', 'changed', 'modified'])
+        job.status = BulkActionJob.Statuses.DONE
+    except Exception as e:
+        logger.error(f"Error in bulk action {job.operation} (job {job.pk}) after {job.processed} films: {e}")
+        job.status = BulkActionJob.Statuses.FAILED
+        job.error = str(e)
+    job.save(update_fields=['status', 'error', 'modified'])
+    logger.info(f"Bulk action {job.operation} changed {job.changed} rows of {job.processed} films in {time.perf_counter() - started:.2f}s")
+    return job
+
+
+# Operations that can be queued as jobs, by name
+OPERATIONS = {operation.__name__: operation for operation in (add_genre, remove_genre, assign_person, set_fields)}
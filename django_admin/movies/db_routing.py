@@ -0,0 +1,195 @@
+# movies/db_routing.py
+
+import contextvars
+import threading
+import time
+from typing import Callable, Optional
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.dispatch import receiver
+from config.components.logging_config import logger
+
+# Apps whose models may be read from the replica
+ROUTED_APPS = {'movies'}
+# Cookie that keeps the reads of a client on the primary for a while after it wrote
+STICKY_COOKIE = 'db_sticky'
+# How often a process checks the health and the lag of the replica, in seconds
+HEALTH_CHECK_INTERVAL = 5
+
+# Seconds the replica is behind the primary; 0 when it has replayed all it received,
+# so that an idle primary does not look like lag
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+# Whether the reads of the current request may go to the replica, and whether it wrote.
+# Kept until the request finishes, so that a streaming response reads like its view.
+replica_reads = contextvars.ContextVar('replica_reads', default=False)
+wrote = contextvars.ContextVar('wrote', default=False)
+
+
+def use_replica(view_func: Callable) -> Callable:
+    """
+    Marks a read-only view whose GET and HEAD requests may read from the replica.
+
+    Admin views are listed in REPLICA_READ_VIEWS instead.
+    """
+    view_func.replica_reads = True
+    return view_func
+
+
+class ReplicaHealth:
+    """
+    Health of the replica as seen by this process, checked at most every interval seconds.
+
+    The replica is healthy when it answers and is at most max_lag seconds behind the
+    primary. Databases other than PostgreSQL, e.g. SQLite stand-ins, are only checked
+    for a connection.
+
+    Attributes:
+        alias (str): Alias of the replica.
+        max_lag (float): Largest acceptable lag, in seconds.
+        interval (float): Seconds between two checks.
+    """
+    def __init__(self, alias: str, max_lag: float, interval: float = HEALTH_CHECK_INTERVAL):
+        self.alias = alias
+        self.max_lag = max_lag
+        self.interval = interval
+        self.healthy = False
+        self.checked: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def is_healthy(self) -> bool:
+        if self.checked is not None and time.monotonic() - self.checked < self.interval:
+            return self.healthy
+        # One thread checks at a time; the others go on with the previous result
+        if not self.lock.acquire(blocking=False):
+            return self.healthy
+        try:
+            healthy = self.check()
+            if healthy != self.healthy:
+                logger.info(f"Replica {self.alias} is {'healthy' if healthy else 'unhealthy'}, reads {'use' if healthy else 'leave'} it")
+            self.healthy = healthy
+            self.checked = time.monotonic()
+        finally:
+            self.lock.release()
+        return self.healthy
+
+    def check(self) -> bool:
+        """
+        Checks the replica now.
+
+        Returns:
+            bool: True if the replica answers and its lag is acceptable.
+        """
+        connection = connections[self.alias]
+        try:
+            if connection.vendor != 'postgresql':
+                connection.ensure_connection()
+                return True
+            with connection.cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = cursor.fetchone()[0]
+        except DatabaseError as e:
+            logger.error(f"Replica {self.alias} is unavailable: {e}")
+            return False
+        if lag > self.max_lag:
+            logger.info(f"Replica {self.alias} lags {float(lag):.1f}s behind the primary")
+            return False
+        return True
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends the reads of the movies models to the replica while a read path is served.
+
+    Everything else stays on the primary: writes, reads after a write of the request,
+    reads inside a transaction of the primary, the requests of clients that wrote
+    less than REPLICA_STICKY_SECONDS ago, and all reads while the replica is unhealthy
+    or lags more than REPLICA_MAX_LAG seconds. Which requests are read paths is decided
+    by ReplicaRoutingMiddleware.
+    """
+    def __init__(self):
+        self.health = ReplicaHealth(settings.REPLICA_DATABASE, settings.REPLICA_MAX_LAG)
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        if (
+            not replica_reads.get()
+            or wrote.get()
+            or model._meta.app_label not in ROUTED_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        return settings.REPLICA_DATABASE if self.health.is_healthy() else None
+
+    def db_for_write(self, model, **hints) -> str:
+        wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> Optional[bool]:
+        # The replica gets its schema from the primary
+        return False if db == settings.REPLICA_DATABASE else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets the GET and HEAD requests of the read paths read from the replica and keeps
+    a client on the primary for REPLICA_STICKY_SECONDS after it wrote.
+
+    The read paths are the views marked with use_replica and the views named in
+    REPLICA_READ_VIEWS. Nothing is routed unless REPLICA_READS is set.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        replica_reads.set(False)
+        wrote.set(False)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        replica_reads.set(False)
+        wrote.set(False)
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        # Raw SQL bypasses the router, so every unsafe request counts as a write
+        if settings.REPLICA_READS and (wrote.get() or request.method not in ('GET', 'HEAD', 'OPTIONS')):
+            response.set_cookie(
+                STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            settings.REPLICA_READS
+            and request.method in ('GET', 'HEAD')
+            and STICKY_COOKIE not in request.COOKIES
+            and (
+                getattr(view_func, 'replica_reads', False)
+                or request.resolver_match.view_name in settings.REPLICA_READ_VIEWS
+            )
+        ):
+            replica_reads.set(True)
+
+
+@receiver(request_finished)
+def reset_routing(**kwargs):
+    replica_reads.set(False)
+    wrote.set(False)
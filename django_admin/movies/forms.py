@@ -0,0 +1,62 @@
+# movies/forms.py
+
+from django import forms
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils.translation import gettext_lazy as _
+from .models import Filmwork, Genre, GenreFilmwork, Person, PersonFilmwork
+
+
+class BulkGenreForm(forms.Form):
+    """ Genre added to or removed from the selected films. """
+    def __init__(self, *args, admin_site, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['genre'] = forms.ModelChoiceField(
+            queryset=Genre.objects.all(),
+            widget=AutocompleteSelect(GenreFilmwork._meta.get_field('genre'), admin_site),
+            label=_('genre'),
+        )
+
+    def get_params(self) -> dict:
+        return {'genre_id': self.cleaned_data['genre'].pk}
+
+
+class BulkPersonForm(forms.Form):
+    """ Person assigned in a role to the selected films. """
+    role = forms.ChoiceField(choices=PersonFilmwork.Roles.choices, initial=PersonFilmwork.Roles.ACTOR, label=_('role'))
+
+    def __init__(self, *args, admin_site, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['person'] = forms.ModelChoiceField(
+            queryset=Person.objects.all(),
+            widget=AutocompleteSelect(PersonFilmwork._meta.get_field('person'), admin_site),
+            label=_('person'),
+        )
+        self.order_fields(['person', 'role'])
+
+    def get_params(self) -> dict:
+        return {'person_id': self.cleaned_data['person'].pk, 'role': self.cleaned_data['role']}
+
+
+class BulkFieldsForm(forms.Form):
+    """ Type and rating set on the selected films; empty fields are left unchanged. """
+    type = forms.ChoiceField(choices=[('', '---------')] + Filmwork.FilmTypes.choices, required=False, label=_('type'))
+    rating = forms.FloatField(
+        required=False,
+        validators=[MinValueValidator(1.0), MaxValueValidator(10.0)],
+        label=_('rating'),
+    )
+
+    def __init__(self, *args, admin_site, **kwargs):
+        # Same signature as the other bulk forms; no field needs the admin site
+        super().__init__(*args, **kwargs)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not self.get_params().get('values'):
+            raise forms.ValidationError(_('Choose a type or a rating.'))
+        return cleaned_data
+
+    def get_params(self) -> dict:
+        values = {field: self.cleaned_data.get(field) for field in ('type', 'rating')}
+        return {'values': {field: value for field, value in values.items() if value not in (None, '')}}
@@ -0,0 +1,118 @@
+# movies/http_cache.py
+
+import hashlib
+import time
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+# Alias of the cache of the rendered API responses (see config/components/cache.py)
+API_CACHE = 'api'
+# Lifetime of a rendered response in the cache; bounds the staleness left by a missed invalidation
+PAYLOAD_TTL = 60
+# How long clients and nginx may reuse a response before revalidating it
+MAX_AGE = 60
+
+VERSION_KEY = 'api:version'
+
+# ETag and Last-Modified of a resource
+Validators = Tuple[str, Optional[datetime]]
+
+
+def make_validators(*parts, modified: Optional[datetime] = None) -> Validators:
+    """
+    Builds the validators of a resource.
+
+    Args:
+        parts: Values that change with the resource, e.g. the number of its rows.
+        modified (Optional[datetime]): Latest modification of the resource.
+
+    Returns:
+        Validators: ETag and Last-Modified.
+    """
+    digest = hashlib.md5(repr((modified, *parts)).encode()).hexdigest()
+    return quote_etag(digest), modified
+
+
+def get_version() -> int:
+    api_cache = caches[API_CACHE]
+    version = api_cache.get(VERSION_KEY)
+    if version is None:
+        api_cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = api_cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_api_cache():
+    """
+    Drops the rendered API responses; called whenever film summaries change.
+
+    A new version is a new timestamp rather than an increment, so an evicted version
+    never brings back the responses cached under an old one.
+    """
+    caches[API_CACHE].set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def set_validators(response: HttpResponse, etag: str, modified: Optional[datetime]):
+    response['ETag'] = etag
+    if modified is not None:
+        response['Last-Modified'] = http_date(modified.timestamp())
+    patch_cache_control(response, public=True, max_age=MAX_AGE)
+
+
+def conditional_response(request, response: HttpResponse, etag: str, modified: Optional[datetime]) -> HttpResponse:
+    """
+    Sets the validators and caching headers of the response and answers a request
+    that already holds the same representation with 304 Not Modified.
+
+    Returns:
+        HttpResponse: The response, or a 304 response carrying its headers.
+    """
+    set_validators(response, etag, modified)
+    last_modified = int(modified.timestamp()) if modified is not None else None
+    return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+
+def cached_json_response(
+        request,
+        get_validators: Callable[[], Optional[Validators]],
+        render: Callable[[], str],
+    ) -> Optional[HttpResponse]:
+    """
+    Serves a JSON resource from the cache of rendered responses.
+
+    A cached response is returned with its validators without touching the database.
+    On a miss the validators are read first, so that a conditional request is answered
+    with 304 without rendering; otherwise the resource is rendered and cached.
+
+    Args:
+        get_validators (Callable[[], Optional[Validators]]): Reads the validators; None if the resource does not exist.
+        render (Callable[[], str]): Renders the JSON document.
+
+    Returns:
+        Optional[HttpResponse]: Response, or None if the resource does not exist.
+    """
+    api_cache = caches[API_CACHE]
+    path_digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    key = f'api:{get_version()}:{path_digest}'
+
+    entry = api_cache.get(key)
+    if entry is not None:
+        etag, modified, body = entry
+        return conditional_response(request, HttpResponse(body, content_type='application/json'), etag, modified)
+
+    validators = get_validators()
+    if validators is None:
+        return None
+    etag, modified = validators
+    response = conditional_response(request, HttpResponse(content_type='application/json'), etag, modified)
+    if response.status_code == 304:
+        return response
+
+    body = render()
+    api_cache.set(key, (etag, modified, body), PAYLOAD_TTL)
+    response.content = body
+    return response
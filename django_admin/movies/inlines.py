@@ -0,0 +1,153 @@
+# movies/inlines.py
+
+from django.contrib import admin
+from django.contrib.admin.utils import quote, unquote
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.forms.models import BaseInlineFormSet
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    """
+    Inline formset that holds a page of the related objects instead of all of them.
+
+    An unbound formset holds the rows of its page. A bound one holds only the rows
+    submitted with it, so a POST validates and saves the changed rows alone.
+
+    Attributes:
+        per_page (int): Number of rows of a page.
+        page_url (Optional[str]): Address of the view that renders the other pages.
+    """
+    per_page = 20
+    page_url = None
+    has_next = False
+
+    def __init__(self, *args, page: int = 1, **kwargs):
+        self.page = page
+        super().__init__(*args, **kwargs)
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            queryset = super().get_queryset()
+            if self.is_bound:
+                self._queryset = queryset.filter(pk__in=self.get_submitted_pks())
+            else:
+                # One more row than the page holds tells whether there is a next page
+                bottom = (self.page - 1) * self.per_page
+                rows = list(queryset[bottom:bottom + self.per_page + 1])
+                self.has_next = len(rows) > self.per_page
+                self._queryset = rows[:self.per_page]
+        return self._queryset
+
+    def get_submitted_pks(self) -> list:
+        """
+        Reads the primary keys of the existing rows submitted with the formset.
+
+        Returns:
+            list: Primary keys; malformed values are skipped and fail the validation of their form.
+        """
+        pk_field = self.model._meta.pk
+        pks = []
+        for i in range(self.initial_form_count()):
+            try:
+                pk = pk_field.to_python(self.data.get(f'{self.add_prefix(i)}-{pk_field.name}'))
+            except ValidationError:
+                continue
+            if pk is not None:
+                pks.append(pk)
+        return pks
+
+    def validate_unique(self):
+        # The stock check compares the submitted rows with each other; the rows that
+        # were not submitted are compared here in the database
+        super().validate_unique()
+        submitted = [form.instance.pk for form in self.initial_forms if form.instance.pk is not None]
+        for form in self.forms:
+            if not form.is_valid() or not form.has_changed() or self._should_delete_form(form):
+                continue
+            unique_checks, _ = form.instance._get_unique_checks(include_meta_constraints=True)
+            for model_class, unique_check in unique_checks:
+                if self.fk.name not in unique_check:
+                    continue
+                lookup = {field: getattr(form.instance, model_class._meta.get_field(field).attname) for field in unique_check}
+                if None in lookup.values():
+                    continue
+                if model_class._default_manager.filter(**lookup).exclude(pk__in=submitted).exists():
+                    form.add_error(None, form.instance.unique_error_message(model_class, unique_check))
+
+
+class PaginatedTabularInline(admin.TabularInline):
+    """
+    Tabular inline that renders the first page of the related objects and loads the
+    next ones on demand, for parents with thousands of them.
+
+    The rows of the other pages are fetched from the view of PaginatedInlinesAdminMixin,
+    which the parent admin must include. Before the form is submitted the unchanged
+    rows are dropped from it, so the size of a POST depends on the edited rows only.
+
+    Attributes:
+        per_page (int): Number of rows loaded at a time.
+    """
+    formset = PaginatedInlineFormSet
+    template = 'admin/movies/paginated_tabular.html'
+    per_page = 20
+    extra = 0
+
+    class Media:
+        js = ('admin/js/jquery.init.js', 'movies/js/paginated_inline.js')
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.per_page = self.per_page
+        if obj is not None and obj.pk is not None:
+            opts = self.parent_model._meta
+            formset.page_url = reverse(
+                f'{self.admin_site.name}:{opts.app_label}_{opts.model_name}_inline_page',
+                args=(quote(obj.pk), formset.get_default_prefix()),
+            )
+        return formset
+
+
+class PaginatedInlinesAdminMixin:
+    """
+    Admin mixin that serves the pages of its PaginatedTabularInline inlines.
+    """
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                '<path:object_id>/inlines/<str:prefix>/',
+                self.admin_site.admin_view(self.inline_page_view),
+                name='%s_%s_inline_page' % info,
+            ),
+        ] + super().get_urls()
+
+    def inline_page_view(self, request, object_id, prefix):
+        """
+        Renders a page of the rows of an inline of the object.
+
+        Args:
+            object_id (str): Quoted primary key of the object.
+            prefix (str): Default prefix of the formset of the inline.
+        """
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404
+        if not self.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            raise Http404('Invalid page')
+        if page < 1:
+            raise Http404('Invalid page')
+
+        for formset_class, inline in self.get_formsets_with_inlines(request, obj):
+            if isinstance(inline, PaginatedTabularInline) and formset_class.get_default_prefix() == prefix:
+                formset = formset_class(**self.get_formset_kwargs(request, obj, inline, prefix), page=page)
+                inline_admin_formset, = self.get_inline_formsets(request, [formset], [inline], obj)
+                return TemplateResponse(request, inline.template, {'inline_admin_formset': inline_admin_formset})
+        raise Http404
@@ -1,7 +1,17 @@
 # movies/management/commands/migrate_sqlite_to_postgres.py
 
-from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from config.db_backends.connection_params import get_psycopg_params
+from movies.models import GenreFilmwork, PersonFilmwork
+from movies.summary import refresh_film_summaries
 from utils.sqlite_to_postgres.run import run_migration
+from utils.sqlite_to_postgres.data_transfer import LOADERS, TRANSFORMS
+from utils.sqlite_to_postgres.scheduler import POOLS
+from utils.sqlite_to_postgres.pipeline import Pipeline
+from utils.sqlite_to_postgres.batching import AdaptiveBatching
+from utils.sqlite_to_postgres.bulk_load import BulkLoad
 from django.conf import settings
 from types import MappingProxyType
 from pathlib import Path
@@ -13,7 +23,7 @@ class Command(BaseCommand):
     to a PostgreSQL database.
 
     Usage:
-        python manage.py migrate_sqlite_to_postgres
+        python manage.py migrate_sqlite_to_postgres [--loader copy] [--batch-size 5000] [--workers 3] [--transform validate] [--pipeline] [--adaptive-batching] [--bulk-load] [--resume | --incremental]
 
     Steps:
         1. Get the SQLite database path.
@@ -22,6 +32,112 @@ class Command(BaseCommand):
     """
     help = "Migrate data from SQLite to PostgreSQL"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loader",
+            choices=LOADERS,
+            default="insert",
+            help="How rows are written into PostgreSQL: batched INSERT or binary COPY through a staging table.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of rows read from SQLite and written to PostgreSQL per batch.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of tables transferred at the same time. Tables wait for the tables they reference.",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=POOLS,
+            default="thread",
+            help="Kind of the worker pool used with --workers.",
+        )
+        parser.add_argument(
+            "--transform",
+            choices=TRANSFORMS,
+            default="fast",
+            help="How rows are converted: precompiled tuples, or dataclasses that validate every row.",
+        )
+        parser.add_argument(
+            "--pipeline",
+            action="store_true",
+            help="Overlap reading SQLite, converting the rows and loading PostgreSQL within every table.",
+        )
+        parser.add_argument(
+            "--queue-depth",
+            type=int,
+            default=4,
+            help="Number of batches waiting between the stages of the pipeline.",
+        )
+        parser.add_argument(
+            "--queue-mb",
+            type=int,
+            default=64,
+            help="Size of the batches waiting between the stages of the pipeline, in megabytes.",
+        )
+        parser.add_argument(
+            "--transform-processes",
+            type=int,
+            default=0,
+            help="Number of processes converting the rows in the pipeline; 0 converts them in a thread.",
+        )
+        parser.add_argument(
+            "--adaptive-batching",
+            action="store_true",
+            help="Tune the batch size of every table from the measured commits, starting from --batch-size "
+                 "or from the size saved by the previous run.",
+        )
+        parser.add_argument(
+            "--batch-mb",
+            type=float,
+            default=4,
+            help="Size of a batch the adaptive batching aims for, in megabytes.",
+        )
+        parser.add_argument(
+            "--batch-seconds",
+            type=float,
+            default=1.0,
+            help="Time of loading and committing a batch the adaptive batching aims for.",
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=1,
+            help="Number of read-only SQLite connections scanning the rowid ranges of a table at the same time.",
+        )
+        parser.add_argument(
+            "--bulk-load",
+            action="store_true",
+            help="Drop the secondary indexes and constraints for a full reload and rebuild them in parallel afterwards.",
+        )
+        parser.add_argument(
+            "--rebuild-workers",
+            type=int,
+            default=4,
+            help="Number of indexes and constraints rebuilt at the same time after a bulk load.",
+        )
+        parser.add_argument(
+            "--maintenance-work-mem",
+            default="512MB",
+            help="maintenance_work_mem of the connections rebuilding the indexes and constraints.",
+        )
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted migration from the saved checkpoints without truncating the tables.",
+        )
+        mode.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Upsert only the rows changed since the previous run and remove deleted link rows.",
+        )
+
     def handle(self, *args, **options):
         logger.info("Migration started.")
         try:
@@ -33,39 +149,99 @@ class Command(BaseCommand):
             dls_postgres = self.get_postgres_dls()
             logger.info(f"PostgreSQL connection settings: {dls_postgres}")
 
+            pipeline = None
+            if options["pipeline"]:
+                pipeline = Pipeline(
+                    queue_depth=options["queue_depth"],
+                    queue_bytes=options["queue_mb"] * 1024 * 1024,
+                    processes=options["transform_processes"],
+                )
+
+            batching = None
+            if options["adaptive_batching"]:
+                batching = AdaptiveBatching(
+                    target_bytes=int(options["batch_mb"] * 1024 * 1024),
+                    target_seconds=options["batch_seconds"],
+                )
+
+            bulk_load = None
+            if options["bulk_load"]:
+                if options["incremental"]:
+                    raise CommandError("--bulk-load applies to full reloads only")
+                bulk_load = BulkLoad(
+                    dict(dls_postgres),
+                    workers=options["rebuild_workers"],
+                    maintenance_work_mem=options["maintenance_work_mem"],
+                )
+
             # Run the migration function
-            run_migration(sqlite_db_path, dls_postgres)
+            stats = run_migration(
+                sqlite_db_path,
+                dls_postgres,
+                loader=options["loader"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                pool=options["pool"],
+                resume=options["resume"],
+                incremental=options["incremental"],
+                transform=options["transform"],
+                pipeline=pipeline,
+                batching=batching,
+                readers=options["readers"],
+                bulk_load=bulk_load,
+            )
+            for table_stats in stats:
+                self.stdout.write(
+                    f"{table_stats.table_name}: {table_stats.rows} rows in {table_stats.seconds:.2f}s "
+                    f"({table_stats.rows_per_second:.0f} rows/sec)"
+                    + (f", batch size {table_stats.batch_size}" if table_stats.batch_size else "")
+                )
+            # The loaded rows bypass the signals that keep the film summary fresh
+            if options["incremental"]:
+                self.refresh_changed_films(stats)
+            else:
+                call_command("rebuild_film_summary", stdout=self.stdout)
             logger.info("Migration completed successfully.")
         except Exception as e:
             logger.error(f"Migration failed: {e}")
             raise e
     
+    def refresh_changed_films(self, stats: list):
+        """
+        Refresh the summaries of the films changed by an incremental sync.
+
+        These are the changed films, the films of the changed or deleted links,
+        and the films of the changed genres and persons.
+
+        Args:
+            stats (list): Transfer statistics of the tables, with the keys of their changed rows.
+        """
+        changed = {table_stats.table_name: table_stats.changed for table_stats in stats}
+        film_ids = set(changed["film_work"].get("id", ()))
+        film_ids.update(changed["genre_film_work"].get("film_work_id", ()))
+        film_ids.update(changed["person_film_work"].get("film_work_id", ()))
+        for links, key, table_name in ((GenreFilmwork, "genre_id", "genre"), (PersonFilmwork, "person_id", "person")):
+            ids = changed[table_name].get("id")
+            if ids:
+                film_ids.update(links.objects.filter(**{f"{key}__in": ids}).values_list("film_work_id", flat=True))
+
+        rows = refresh_film_summaries(film_ids)
+        self.stdout.write(f"Refreshed {rows} film summaries of {len(film_ids)} changed films")
+
     def get_postgres_dls(self) -> dict:
         """
         Fetch and transform PostgreSQL connection settings from Django settings.
 
-        Removes unsupported options and validates that the database engine is PostgreSQL.
+        The parameters are built by the backend of the database, which must be
+        PostgreSQL, through the stock backend or the pooled one.
 
         Returns:
             dict: A dictionary of PostgreSQL connection settings.
         """
-        dls = settings.DATABASES['default'].copy()
-
-        if dls.get('ENGINE') != 'django.db.backends.postgresql':
+        if connections['default'].vendor != 'postgresql':
             raise ValueError("The default database is not configured for PostgreSQL.")
 
-        transformed_dls = {
-            'dbname': dls.get('NAME'),
-            'user': dls.get('USER'),
-            'password': dls.get('PASSWORD'),
-            'host': dls.get('HOST'),
-            'port': dls.get('PORT'),
-        }
-
-        # Handle additional options, if any
-        options = dls.get('OPTIONS', {}).get('options')
-        if options:
-            transformed_dls['options'] = options
+        transformed_dls = get_psycopg_params('default')
 
         return MappingProxyType(transformed_dls)
 
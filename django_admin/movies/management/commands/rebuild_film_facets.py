@@ -0,0 +1,26 @@
+# movies/management/commands/rebuild_film_facets.py
+
+from django.core.management.base import BaseCommand
+from movies.facets import rebuild_film_facets
+from config.components.logging_config import logger
+
+class Command(BaseCommand):
+    """
+    Django management command to recount the films of the facets of the film admin.
+
+    Usage:
+        python manage.py rebuild_film_facets [--database <alias>]
+    """
+    help = "Recount the films of the film facets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Alias of the database.",
+        )
+
+    def handle(self, *args, **options):
+        logger.info("Rebuilding the film facets.")
+        rows = rebuild_film_facets(using=options["database"])
+        self.stdout.write(f"Counted {rows} facet values")
@@ -0,0 +1,32 @@
+# movies/management/commands/rebuild_film_summary.py
+
+from django.core.management.base import BaseCommand
+from movies.summary import refresh_film_summaries
+from config.components.logging_config import logger
+
+class Command(BaseCommand):
+    """
+    Django management command to rebuild the film summary table in bulk.
+
+    Usage:
+        python manage.py rebuild_film_summary [--film-id <uuid> ...]
+    """
+    help = "Rebuild the film summary table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--film-id",
+            action="append",
+            dest="film_ids",
+            help="Rebuild only the summary of this film. Can be repeated.",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Alias of the database.",
+        )
+
+    def handle(self, *args, **options):
+        logger.info("Rebuilding the film summary.")
+        rows = refresh_film_summaries(options["film_ids"], using=options["database"])
+        self.stdout.write(f"Refreshed {rows} film summaries")
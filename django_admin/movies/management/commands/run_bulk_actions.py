@@ -0,0 +1,54 @@
+# movies/management/commands/run_bulk_actions.py
+
+import time
+from django.core.management.base import BaseCommand
+from movies.bulk_actions import BULK_CHUNK_SIZE, claim_job, run_job
+from config.components.logging_config import logger
+
+class Command(BaseCommand):
+    """
+    Django management command to run the bulk actions queued by the film admin.
+
+    Usage:
+        python manage.py run_bulk_actions [--loop] [--interval <seconds>] [--database <alias>]
+    """
+    help = "Run the queued bulk actions of the film admin"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep waiting for new jobs instead of exiting when the queue is empty.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds between the checks of an empty queue with --loop.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=BULK_CHUNK_SIZE,
+            help="Number of films per statement.",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Alias of the database.",
+        )
+
+    def handle(self, *args, **options):
+        logger.info("Running the queued bulk actions.")
+        while True:
+            job = claim_job(options["database"])
+            if job is None:
+                if not options["loop"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+
+            job = run_job(job, options["chunk_size"])
+            self.stdout.write(
+                f"{job.description}: {job.status}, {job.changed} rows of {job.processed} of {job.total} films changed"
+            )
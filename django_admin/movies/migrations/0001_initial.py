@@ -14,6 +14,8 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
+        # Created by movies_database.ddl in the containers, but not in the test databases
+        migrations.RunSQL('CREATE SCHEMA IF NOT EXISTS content', reverse_sql=migrations.RunSQL.noop),
         migrations.CreateModel(
             name='Filmwork',
             fields=[
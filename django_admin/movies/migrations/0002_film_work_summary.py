@@ -0,0 +1,36 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:22
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmworkSummary',
+            fields=[
+                ('film_work', models.OneToOneField(db_column='id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='movies.filmwork', verbose_name='film')),
+                ('title', models.CharField(max_length=255, verbose_name='title')),
+                ('type', models.CharField(choices=[('movie', 'movie'), ('tv show', 'tv show')], max_length=7, verbose_name='type')),
+                ('rating', models.FloatField(blank=True, null=True, verbose_name='rating')),
+                ('creation_date', models.DateField(blank=True, null=True, verbose_name='creation_date')),
+                ('genres', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), default=list, size=None, verbose_name='genres')),
+                ('person_ids', django.contrib.postgres.fields.ArrayField(base_field=models.UUIDField(), default=list, size=None)),
+                ('persons', models.JSONField(default=dict, verbose_name='persons')),
+                ('refreshed', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'film summary',
+                'verbose_name_plural': 'film summaries',
+                'db_table': 'content"."film_work_summary',
+                'indexes': [models.Index(fields=['creation_date', 'rating'], name='film_summary_creation_idx'), django.contrib.postgres.indexes.GinIndex(fields=['genres'], name='film_summary_genres_idx'), django.contrib.postgres.indexes.GinIndex(fields=['person_ids'], name='film_summary_persons_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:27
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+CREATE FUNCTION content.film_work_search_vector() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('russian', coalesce(NEW.description, ''))
+        || to_tsvector('english', coalesce(NEW.description, ''));
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER film_work_search_vector
+    BEFORE INSERT OR UPDATE ON content.film_work
+    FOR EACH ROW EXECUTE FUNCTION content.film_work_search_vector();
+
+UPDATE content.film_work
+SET search_vector = to_tsvector('russian', coalesce(description, ''))
+    || to_tsvector('english', coalesce(description, ''));
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP TRIGGER film_work_search_vector ON content.film_work;
+DROP FUNCTION content.film_work_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0002_film_work_summary'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.AddField(
+            model_name='filmwork',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, DROP_SEARCH_VECTOR_SQL),
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('title', name='gin_trgm_ops'), name='film_work_title_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='film_work_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('full_name', name='gin_trgm_ops'), name='person_full_name_trgm_idx'),
+        ),
+    ]
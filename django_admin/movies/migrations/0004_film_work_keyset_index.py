@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=models.Index(fields=['-creation_date', '-id'], name='film_work_creation_id_idx'),
+        ),
+    ]
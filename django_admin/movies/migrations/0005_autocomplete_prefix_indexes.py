@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:34
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_film_work_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(django.db.models.functions.comparison.Collate(django.db.models.functions.text.Lower('name'), 'C'), name='genre_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(django.db.models.functions.comparison.Collate(django.db.models.functions.text.Lower('full_name'), 'C'), name='person_full_name_prefix_idx'),
+        ),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:49
+
+from django.db import migrations, models
+
+# Statement-level triggers add the change of every statement to the counts, one
+# upsert per touched value, so bulk statements do not update a count row by row.
+# {name} is the trigger, {table} the counted table, {facet} and {value} the facet
+# and the expression of its value. PL/pgSQL plans a statement when it first runs
+# it, so every branch only reads the transition tables of its own event.
+FACET_UPSERT_SQL = """
+        INSERT INTO content.film_work_facet AS f (facet, value, films)
+        SELECT '{{facet}}', value, sum(delta) FROM ({changes}) changes
+        GROUP BY value
+        HAVING sum(delta) <> 0
+        ORDER BY value
+        ON CONFLICT (facet, value) DO UPDATE SET films = f.films + EXCLUDED.films;"""
+
+FACET_TRIGGER_SQL = """
+CREATE FUNCTION content.{name}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN""" + FACET_UPSERT_SQL.format(
+    changes="SELECT {value} AS value, 1 AS delta FROM new_rows",
+) + """
+    ELSIF TG_OP = 'DELETE' THEN""" + FACET_UPSERT_SQL.format(
+    changes="SELECT {value} AS value, -1 AS delta FROM old_rows",
+) + """
+    ELSIF TG_OP = 'UPDATE' THEN""" + FACET_UPSERT_SQL.format(
+    changes="SELECT {value} AS value, 1 AS delta FROM new_rows UNION ALL SELECT {value}, -1 FROM old_rows",
+) + """
+    ELSE
+        DELETE FROM content.film_work_facet WHERE facet = '{facet}';
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+FACET_TRIGGERS_SQL = """
+CREATE TRIGGER {name}_insert AFTER INSERT ON content.{table}
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION content.{name}();
+CREATE TRIGGER {name}_update AFTER UPDATE ON content.{table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION content.{name}();
+CREATE TRIGGER {name}_delete AFTER DELETE ON content.{table}
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION content.{name}();
+CREATE TRIGGER {name}_truncate AFTER TRUNCATE ON content.{table}
+    FOR EACH STATEMENT EXECUTE FUNCTION content.{name}();
+"""
+
+DROP_FACET_TRIGGERS_SQL = """
+DROP TRIGGER {name}_insert ON content.{table};
+DROP TRIGGER {name}_update ON content.{table};
+DROP TRIGGER {name}_delete ON content.{table};
+DROP TRIGGER {name}_truncate ON content.{table};
+DROP FUNCTION content.{name}();
+"""
+
+FACETS = (
+    {'name': 'film_work_type_facet', 'table': 'film_work', 'facet': 'type', 'value': 'type'},
+    {'name': 'genre_film_work_facet', 'table': 'genre_film_work', 'facet': 'genre', 'value': 'genre_id::text'},
+)
+
+BACKFILL_FACETS_SQL = """
+INSERT INTO content.film_work_facet (facet, value, films)
+SELECT 'type', type, count(*) FROM content.film_work GROUP BY type
+UNION ALL
+SELECT 'genre', genre_id::text, count(*) FROM content.genre_film_work GROUP BY genre_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_autocomplete_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmworkFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('genre', 'genre'), ('type', 'type')], max_length=20, verbose_name='facet')),
+                ('value', models.TextField(verbose_name='value')),
+                ('films', models.IntegerField(default=0, verbose_name='films')),
+            ],
+            options={
+                'verbose_name': 'film facet',
+                'verbose_name_plural': 'film facets',
+                'db_table': 'content"."film_work_facet',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='genrefilmwork',
+            index=models.Index(fields=['genre', 'film_work'], name='genre_film_work_genre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personfilmwork',
+            index=models.Index(fields=['person', 'film_work'], name='person_film_work_person_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='filmworkfacet',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='film_work_facet_idx'),
+        ),
+        *(
+            migrations.RunSQL(
+                FACET_TRIGGER_SQL.format(**facet) + FACET_TRIGGERS_SQL.format(**facet),
+                DROP_FACET_TRIGGERS_SQL.format(**facet),
+            )
+            for facet in FACETS
+        ),
+        migrations.RunSQL(BACKFILL_FACETS_SQL, migrations.RunSQL.noop),
+    ]
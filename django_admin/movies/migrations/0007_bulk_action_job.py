@@ -0,0 +1,40 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:25
+
+import django.contrib.postgres.fields
+import django.core.serializers.json
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_film_work_facets'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkActionJob',
+            fields=[
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('operation', models.CharField(max_length=50, verbose_name='operation')),
+                ('description', models.CharField(max_length=255, verbose_name='description')),
+                ('params', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='parameters')),
+                ('film_ids', django.contrib.postgres.fields.ArrayField(base_field=models.UUIDField(), default=list, size=None)),
+                ('total', models.IntegerField(default=0, verbose_name='films')),
+                ('processed', models.IntegerField(default=0, verbose_name='processed films')),
+                ('changed', models.IntegerField(default=0, verbose_name='changed rows')),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('running', 'running'), ('done', 'done'), ('failed', 'failed')], default='pending', max_length=10, verbose_name='status')),
+                ('error', models.TextField(blank=True, default='', verbose_name='error')),
+            ],
+            options={
+                'verbose_name': 'bulk action',
+                'verbose_name_plural': 'bulk actions',
+                'db_table': 'content"."bulk_action_job',
+                'ordering': ['-created'],
+                'indexes': [models.Index(fields=['status', 'created'], name='bulk_action_job_status_idx')],
+            },
+        ),
+    ]
@@ -1,7 +1,12 @@
 # movies/models.py
 
 import uuid
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.functions import Collate, Lower
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
 from config.components.logging_config import logger
@@ -46,6 +51,10 @@ class Genre(UUIDMixin, TimeStampedMixin):
         # Model names in the Django admin interface.
         verbose_name = _('genre')
         verbose_name_plural = _('genres')
+        indexes = [
+            # Serves the prefix lookups and the order of the admin autocomplete
+            models.Index(Collate(Lower('name'), 'C'), name='genre_name_prefix_idx'),
+        ]
 
 class Person(UUIDMixin, TimeStampedMixin):
     class Gender(models.TextChoices):
@@ -73,6 +82,12 @@ class Person(UUIDMixin, TimeStampedMixin):
         db_table = 'content"."person'
         verbose_name = _('person')
         verbose_name_plural = _('persons')
+        indexes = [
+            # Serves the substring search of the admin
+            GinIndex(OpClass('full_name', name='gin_trgm_ops'), name='person_full_name_trgm_idx'),
+            # Serves the prefix lookups and the order of the admin autocomplete
+            models.Index(Collate(Lower('full_name'), 'C'), name='person_full_name_prefix_idx'),
+        ]
 
 class Filmwork(UUIDMixin, TimeStampedMixin):
     class FilmTypes(models.TextChoices):
@@ -99,6 +114,8 @@ class Filmwork(UUIDMixin, TimeStampedMixin):
     # The upload_to parameter specifies in which subfolder the uploaded files will be stored.
     # The base folder is specified in the settings file as MEDIA_ROOT
     file_path = models.FileField(_('file'), blank=True, null=True, upload_to='movies/')
+    # Filled by a trigger from the description in every language of the site, see movies.search
+    search_vector = SearchVectorField(null=True, editable=False)
 
     genres = models.ManyToManyField(
         Genre,
@@ -124,6 +141,10 @@ class Filmwork(UUIDMixin, TimeStampedMixin):
                 fields=['creation_date', 'rating'],
                 name='film_work_creation_rating_idx',
             ),
+            # Matches the default ordering, the admin seeks on it page by page
+            models.Index(fields=['-creation_date', '-id'], name='film_work_creation_id_idx'),
+            GinIndex(OpClass('title', name='gin_trgm_ops'), name='film_work_title_trgm_idx'),
+            GinIndex(fields=['search_vector'], name='film_work_search_vector_idx'),
         ]
 
 class GenreFilmwork(UUIDMixin):
@@ -152,6 +173,10 @@ class GenreFilmwork(UUIDMixin):
                 name='film_work_genre_idx',
             ),
         ]
+        indexes = [
+            # Films of a genre, for the genre filter of the admin
+            models.Index(fields=['genre', 'film_work'], name='genre_film_work_genre_idx'),
+        ]
  
 
 class PersonFilmwork(UUIDMixin):
@@ -188,6 +213,112 @@ class PersonFilmwork(UUIDMixin):
                 name='film_work_person_role_idx',
             ),
         ]
+        indexes = [
+            # Films of a person
+            models.Index(fields=['person', 'film_work'], name='person_film_work_person_idx'),
+        ]
+
+
+class FilmworkSummary(models.Model):
+    """
+    Read model of a film: the film with its genres and persons in a single row.
+
+    The rows are refreshed when the film or its links change (see movies/signals.py)
+    and rebuilt in bulk by the rebuild_film_summary command.
+    """
+    film_work = models.OneToOneField(
+        Filmwork,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='summary',
+        db_column='id',
+        verbose_name=_('film'),
+    )
+    title = models.CharField(_('title'), max_length=255)
+    type = models.CharField(_('type'), max_length=7, choices=Filmwork.FilmTypes.choices)
+    rating = models.FloatField(_('rating'), null=True, blank=True)
+    creation_date = models.DateField(_('creation_date'), null=True, blank=True)
+    # Names of the genres in alphabetical order
+    genres = ArrayField(models.TextField(), default=list, verbose_name=_('genres'))
+    # Ids of all persons of the film, for lookups of the films of a person
+    person_ids = ArrayField(models.UUIDField(), default=list)
+    # Persons grouped by role: {"actor": [{"id": "...", "name": "..."}], ...}
+    persons = models.JSONField(default=dict, verbose_name=_('persons'))
+    refreshed = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'content"."film_work_summary'
+        verbose_name = _('film summary')
+        verbose_name_plural = _('film summaries')
+        indexes = [
+            models.Index(
+                fields=['creation_date', 'rating'],
+                name='film_summary_creation_idx',
+            ),
+            GinIndex(fields=['genres'], name='film_summary_genres_idx'),
+            GinIndex(fields=['person_ids'], name='film_summary_persons_idx'),
+        ]
+
 
+class FilmworkFacet(models.Model):
+    """
+    Number of films by facet value, shown by the filters of the film admin.
 
+    The counts are kept up to date by triggers on the film and genre link tables
+    (see migration 0006) and rebuilt by the rebuild_film_facets command.
+    """
+    class Facets(models.TextChoices):
+        GENRE = 'genre', _('genre')
+        TYPE = 'type', _('type')
+
+    facet = models.CharField(_('facet'), max_length=20, choices=Facets.choices)
+    # Id of the genre for the genre facet, the type itself for the type facet
+    value = models.TextField(_('value'))
+    films = models.IntegerField(_('films'), default=0)
+
+    class Meta:
+        db_table = 'content"."film_work_facet'
+        verbose_name = _('film facet')
+        verbose_name_plural = _('film facets')
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='film_work_facet_idx'),
+        ]
 
+
+class BulkActionJob(UUIDMixin, TimeStampedMixin):
+    """
+    Bulk action of the film admin run outside the web workers by the run_bulk_actions command.
+
+    The ids of the selected films are saved with the job, and its progress is saved
+    in the transaction of every chunk, so a stopped job continues after the last
+    applied chunk.
+    """
+    class Statuses(models.TextChoices):
+        PENDING = 'pending', _('pending')
+        RUNNING = 'running', _('running')
+        DONE = 'done', _('done')
+        FAILED = 'failed', _('failed')
+
+    # Name of the function of movies.bulk_actions.OPERATIONS
+    operation = models.CharField(_('operation'), max_length=50)
+    description = models.CharField(_('description'), max_length=255)
+    params = models.JSONField(_('parameters'), default=dict, encoder=DjangoJSONEncoder)
+    film_ids = ArrayField(models.UUIDField(), default=list)
+    total = models.IntegerField(_('films'), default=0)
+    processed = models.IntegerField(_('processed films'), default=0)
+    changed = models.IntegerField(_('changed rows'), default=0)
+    status = models.CharField(_('status'), max_length=10, choices=Statuses.choices, default=Statuses.PENDING)
+    error = models.TextField(_('error'), blank=True, default='')
+
+    def __str__(self):
+        return self.description
+
+    class Meta:
+        db_table = 'content"."bulk_action_job'
+        verbose_name = _('bulk action')
+        verbose_name_plural = _('bulk actions')
+        ordering = ['-created']
+        indexes = [
+            # Jobs waiting for a worker, oldest first
+            models.Index(fields=['status', 'created'], name='bulk_action_job_status_idx'),
+        ]
@@ -0,0 +1,351 @@
+# movies/pagination.py
+
+import base64
+import binascii
+import json
+from typing import List, Optional, Tuple
+from django.conf import settings
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, InvalidPage, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models
+from django.db.models import F, Func, QuerySet, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from django.utils.functional import cached_property
+
+# Query string parameter of the keyset cursor and the directions it seeks in
+CURSOR_VAR = 'cursor'
+AFTER, BEFORE = 'after', 'before'
+
+
+class ApproximateCount(int):
+    """
+    Number of rows estimated by the planner; rendered as "~N" in the admin templates.
+    """
+    def __str__(self):
+        return f'~{int(self)}'
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """
+    Estimates the number of rows of the queryset without counting them.
+
+    An unfiltered queryset is estimated from the statistics of its table, scaled
+    to the current size of the table the way the planner does it; a filtered one
+    from the plan of the query.
+
+    Args:
+        queryset (QuerySet): Queryset to estimate.
+
+    Returns:
+        Optional[int]: Estimated number of rows, or None if the database gives no estimate.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.is_sliced:
+            cursor.execute(
+                "SELECT (CASE WHEN c.relpages = 0 THEN 0 ELSE c.reltuples / c.relpages END "
+                "* (pg_relation_size(c.oid) / current_setting('block_size')::int))::bigint "
+                "FROM pg_class c WHERE c.oid = to_regclass(%s) AND c.reltuples >= 0",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+        sql, params = queryset.values('pk').order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Plan']['Plan Rows']
+
+
+class ApproximatePaginator(Paginator):
+    """
+    Paginator that counts the rows exactly only when there are few of them.
+
+    Above the threshold the planner estimate is used. The estimate may be off in
+    both directions, so pages past the estimated last one stay reachable and the
+    last page is never cut at the estimate.
+    """
+    def __init__(self, *args, exact_count_threshold: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exact_count_threshold = exact_count_threshold
+
+    @cached_property
+    def count(self) -> int:
+        return count_rows(self.object_list, self.exact_count_threshold)
+
+    @property
+    def approximate(self) -> bool:
+        return isinstance(self.count, ApproximateCount)
+
+    def validate_number(self, number):
+        if not self.approximate:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        if not self.approximate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+def count_rows(queryset: QuerySet, exact_count_threshold: int) -> int:
+    """
+    Counts the rows of the queryset, approximately above the threshold.
+
+    Args:
+        queryset (QuerySet): Queryset to count.
+        exact_count_threshold (int): Estimated number of rows below which the rows are counted exactly.
+
+    Returns:
+        int: Exact number of rows, or an ApproximateCount.
+    """
+    estimate = estimate_count(queryset)
+    if estimate is None or estimate < exact_count_threshold:
+        return queryset.count()
+    return ApproximateCount(estimate)
+
+
+class ApproximateCountChangeList(ChangeList):
+    """
+    Change list that estimates both the filtered and the total number of rows.
+
+    Same as ChangeList.get_results, except that the total is counted by count_rows
+    and that approximately counted lists are always paginated.
+    """
+    def get_results(self, request):
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        result_count = paginator.count
+
+        if self.model_admin.show_full_result_count:
+            full_result_count = count_rows(self.root_queryset, self.model_admin.get_exact_count_threshold())
+        else:
+            full_result_count = None
+        # An estimate may be far below the real number of rows, so an approximately
+        # counted list is always sliced into pages and never shown whole
+        approximate = isinstance(result_count, ApproximateCount)
+        can_show_all = not approximate and result_count <= self.list_max_show_all
+        multi_page = approximate or result_count > self.list_per_page
+
+        if (self.show_all and can_show_all) or not multi_page:
+            result_list = self.queryset._clone()
+        else:
+            try:
+                result_list = paginator.page(self.page_num).object_list
+            except InvalidPage:
+                raise IncorrectLookupParameters
+
+        self.result_count = result_count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(full_result_count)
+        self.full_result_count = full_result_count
+        self.result_list = result_list
+        self.can_show_all = can_show_all
+        self.multi_page = multi_page
+        self.paginator = paginator
+
+
+class ApproximateCountAdminMixin:
+    """
+    Admin mixin that replaces the exact counts of the change list by planner estimates on large tables.
+
+    Attributes:
+        exact_count_threshold (Optional[int]): Estimated number of rows below which the rows
+            are counted exactly; defaults to the ADMIN_EXACT_COUNT_THRESHOLD setting.
+    """
+    exact_count_threshold = None
+    paginator = ApproximatePaginator
+
+    def get_exact_count_threshold(self) -> int:
+        if self.exact_count_threshold is not None:
+            return self.exact_count_threshold
+        return settings.ADMIN_EXACT_COUNT_THRESHOLD
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            exact_count_threshold=self.get_exact_count_threshold(),
+        )
+
+    def get_changelist(self, request, **kwargs):
+        return ApproximateCountChangeList
+
+
+class Row(Func):
+    """ Row constructor, so that the sort key is compared as a whole: (creation_date, id) < (%s, %s). """
+    template = '(%(expressions)s)'
+    output_field = models.Field()
+
+
+def seek_keys(queryset: QuerySet, field: str, descending: bool, key: Optional[Tuple], limit: int) -> List[Tuple]:
+    """
+    Reads the sort keys of the rows that follow the key in the (field, pk) order.
+
+    NULLs of the field sort first in descending order and last in ascending order,
+    as in PostgreSQL by default. A row comparison cannot step over them, so the rows
+    are read in two segments, each bounded by the index.
+
+    Args:
+        queryset (QuerySet): Queryset ordered by the field and the primary key.
+        field (str): Name of the sort field.
+        descending (bool): Whether the queryset is ordered in descending order.
+        key (Optional[Tuple]): Value of the field and primary key of the row to seek after,
+            None to read from the top of the list.
+        limit (int): Largest number of keys to read.
+
+    Returns:
+        List[Tuple]: Keys as (value of the field, primary key).
+    """
+    keys = queryset.values_list(field, 'pk')
+    if key is None:
+        return list(keys[:limit])
+
+    value, pk = key
+    if value is None:
+        segments = [keys.filter(**{f'{field}__isnull': True, f'pk__{"lt" if descending else "gt"}': pk})]
+        if descending:
+            segments.append(keys.filter(**{f'{field}__isnull': False}))
+    else:
+        comparison = LessThan if descending else GreaterThan
+        segments = [keys.filter(comparison(Row(F(field), F('pk')), Row(Value(value), Value(pk))))]
+        if not descending:
+            segments.append(keys.filter(**{f'{field}__isnull': True}))
+
+    result = []
+    for segment in segments:
+        result += segment[:limit - len(result)]
+        if len(result) == limit:
+            break
+    return result
+
+
+class KeysetChangeList(ApproximateCountChangeList):
+    """
+    Change list that seeks from a cursor instead of skipping rows with OFFSET.
+
+    When the list is sorted by the keyset field of the admin in either direction, the
+    pages are walked with next/previous cursors holding the sort key of a row, so every
+    page costs an index seek whatever its depth. Any other sorting falls back to the
+    numbered pages.
+    """
+    keyset = False
+    first_url = previous_url = next_url = None
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filters and sorting start again from the first page
+        new_params = new_params or {}
+        remove = list(remove or [])
+        if CURSOR_VAR not in new_params:
+            remove.append(CURSOR_VAR)
+        return super().get_query_string(new_params, remove)
+
+    def get_ordering(self, request, queryset):
+        ordering = super().get_ordering(request, queryset)
+        # The primary key only breaks ties, so it may follow the direction of the
+        # keyset field and let an ascending sort seek as well
+        if ordering == [self.model_admin.keyset_field, '-pk']:
+            ordering[-1] = 'pk'
+        return ordering
+
+    def get_keyset_direction(self) -> Optional[bool]:
+        """ Whether the list is sorted by the keyset descending, ascending, or None if it is sorted otherwise. """
+        field = self.model_admin.keyset_field
+        ordering = tuple(self.queryset.query.order_by)
+        if field is None:
+            return None
+        if ordering == (f'-{field}', '-pk'):
+            return True
+        if ordering == (field, 'pk'):
+            return False
+        return None
+
+    def encode_cursor(self, direction: str, key: Tuple) -> str:
+        data = json.dumps([direction, *key], cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> Tuple[str, Tuple]:
+        """
+        Decodes the cursor of the query string.
+
+        Raises:
+            IncorrectLookupParameters: If the cursor is malformed.
+        """
+        try:
+            direction, value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if direction not in (AFTER, BEFORE):
+                raise ValueError(direction)
+            field = self.lookup_opts.get_field(self.model_admin.keyset_field)
+            return direction, (field.to_python(value), self.lookup_opts.pk.to_python(pk))
+        except (binascii.Error, ValueError, TypeError, ValidationError) as e:
+            raise IncorrectLookupParameters(e) from e
+
+    def get_results(self, request):
+        descending = self.get_keyset_direction()
+        if descending is None:
+            return super().get_results(request)
+
+        # Counts and actions are set up as usual; the page itself is replaced below
+        self.page_num = 1
+        super().get_results(request)
+        if self.show_all and self.can_show_all:
+            return
+
+        field = self.model_admin.keyset_field
+        per_page = self.list_per_page
+        cursor = self.params.get(CURSOR_VAR)
+        direction, key = self.decode_cursor(cursor) if cursor else (AFTER, None)
+
+        if direction == BEFORE:
+            # The previous page starts right after the row preceding it, or at the top of the list
+            keys = seek_keys(self.queryset.reverse(), field, not descending, key, per_page + 1)
+            key = keys[per_page] if len(keys) > per_page else None
+
+        # One more key tells whether there is a next page
+        keys = seek_keys(self.queryset, field, descending, key, per_page + 1)
+        has_previous, has_next = key is not None, len(keys) > per_page
+        keys = keys[:per_page]
+
+        self.keyset = True
+        self.result_list = self.queryset.filter(pk__in=[pk for _, pk in keys])
+        self.can_show_all = False
+        self.multi_page = has_previous or has_next
+        if cursor:
+            self.first_url = self.get_query_string()
+        if has_previous:
+            self.previous_url = self.get_query_string({CURSOR_VAR: self.encode_cursor(BEFORE, keys[0])}, [PAGE_VAR]) if keys else self.first_url
+        if has_next and keys:
+            self.next_url = self.get_query_string({CURSOR_VAR: self.encode_cursor(AFTER, keys[-1])}, [PAGE_VAR])
+
+
+class KeysetPaginationAdminMixin(ApproximateCountAdminMixin):
+    """
+    Admin mixin that paginates the change list with cursors when it is sorted by keyset_field.
+
+    Attributes:
+        keyset_field (Optional[str]): Sort field of the keyset; the primary key breaks the ties.
+            A composite index on (keyset_field, pk) is expected.
+    """
+    keyset_field = None
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
@@ -0,0 +1,225 @@
+# movies/query_budget.py
+
+import contextvars
+import json
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import Callable, List, Optional
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from config.components.logging_config import query_logger
+
+# Number of the most repeated statements written to the log record of a request
+TOP_DUPLICATES = 3
+
+# Literals and lists of placeholders, replaced to group the statements that differ only in their values
+STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_LIST_RE = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+
+# Statistics of the current request, for the queries that do not go through a Django connection
+current_stats = contextvars.ContextVar('current_stats', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """ Raised in the strict mode when a view runs more queries than its budget. """
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declares the number of queries a view is expected to run at most.
+
+    Args:
+        max_queries (int): Budget of the view.
+
+    Returns:
+        Callable: Decorator that marks the view with the budget.
+    """
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Reduces the statement to its shape, so that the queries of an N+1 loop share one fingerprint.
+
+    Args:
+        sql (str): Statement with placeholders.
+
+    Returns:
+        str: Statement with the literals replaced by "?" and the lists of placeholders collapsed.
+    """
+    sql = STRING_LITERAL_RE.sub('?', sql)
+    sql = NUMBER_LITERAL_RE.sub('?', sql)
+    return PLACEHOLDER_LIST_RE.sub('(...)', sql)
+
+
+class QueryStats:
+    """
+    Execute wrapper that counts the queries of a request on every connection it is installed on.
+
+    Attributes:
+        count (int): Number of executed statements; executemany counts once.
+        duration (float): Time spent in the database, in seconds.
+        fingerprints (Counter): Number of executions by fingerprint.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.perf_counter() - started)
+
+    def record(self, sql: str, duration: float):
+        """
+        Counts an executed statement.
+
+        Args:
+            sql (str): Statement with placeholders.
+            duration (float): Time it took, in seconds.
+        """
+        self.duration += duration
+        self.count += 1
+        self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """ Number of executions that repeated an earlier statement of the same shape. """
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def top_duplicates(self, limit: int = TOP_DUPLICATES) -> List[dict]:
+        """
+        Lists the most repeated statements.
+
+        Args:
+            limit (int): Maximum number of statements.
+
+        Returns:
+            List[dict]: Fingerprint and number of executions of the statements run more than once.
+        """
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+
+class QueryBudgetMiddleware:
+    """
+    Measures the queries of every request and checks them against the budget of its view.
+
+    The numbers are returned in the X-DB-Queries, X-DB-Duplicates and Server-Timing
+    headers and written as a JSON record to the QUERIES log. A view over its budget
+    is logged as an error, or fails the request with QueryBudgetExceeded when
+    QUERY_BUDGET_STRICT is set, which turns N+1 regressions into failing tests.
+
+    The budget of a view is set with the query_budget decorator or in QUERY_BUDGETS
+    by the name of its URL pattern. The queries of a streaming response that run
+    after the view has returned are not counted.
+
+    Under ASGI only the queries recorded into current_stats, i.e. those of the async
+    views, are counted: the sync code of the request runs in other threads, on
+    connections the wrappers are not installed on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        token = current_stats.set(stats)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.process_stats(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        token = current_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.process_stats(request, response, stats)
+
+    def process_stats(self, request, response, stats: QueryStats):
+        """
+        Reports the queries of the request in its headers and in the log.
+
+        Raises:
+            QueryBudgetExceeded: In the strict mode, if the view ran more queries than its budget.
+        """
+        view_name, budget = self.get_view_budget(request)
+        pool_wait = self.get_pool_wait()
+        response['X-DB-Queries'] = str(stats.count)
+        response['X-DB-Duplicates'] = str(stats.duplicates)
+        response['Server-Timing'] = (
+            f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", db-pool;dur={pool_wait * 1000:.1f}'
+        )
+
+        record = {
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(stats.duration * 1000, 1),
+            'pool_wait_ms': round(pool_wait * 1000, 1),
+            'duplicates': stats.duplicates,
+            'budget': budget,
+            'top_duplicates': stats.top_duplicates(),
+        }
+        if budget is not None and stats.count > budget:
+            query_logger.error(json.dumps(record))
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(
+                    f"{view_name} ran {stats.count} queries, the budget is {budget}: {record['top_duplicates']}"
+                )
+        else:
+            query_logger.info(json.dumps(record))
+        return response
+
+    @staticmethod
+    def get_pool_wait() -> float:
+        """ Sums the time the connections borrowed by the request waited for the pool of the pooled backend. """
+        return sum(
+            connections[alias].pop_pool_wait()
+            for alias in connections
+            if hasattr(connections[alias], 'pop_pool_wait')
+        )
+
+    @staticmethod
+    def get_view_budget(request) -> tuple:
+        """
+        Finds the view of the request and its budget.
+
+        Returns:
+            tuple: Name of the view, or None for unresolved requests, and its budget, or None.
+        """
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return None, None
+        budget: Optional[int] = getattr(match.func, 'query_budget', None)
+        if budget is None:
+            budget = getattr(settings, 'QUERY_BUDGETS', {}).get(match.view_name)
+        return match.view_name, budget
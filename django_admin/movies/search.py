@@ -0,0 +1,87 @@
+# movies/search.py
+
+import uuid
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import F, Lookup, Q
+from django.utils.text import smart_split, unescape_string_literal
+
+# Text search configurations of the site languages; the search vectors are built with all of them
+SEARCH_CONFIGS = ('russian', 'english')
+
+
+class ILike(Lookup):
+    """
+    Case-insensitive substring match written as ILIKE, which a gin_trgm_ops index serves.
+
+    The icontains lookup wraps the column in UPPER(), so no index on the column can be used.
+    The lookup is not registered on any field and is only used as an expression,
+    e.g. ILike(F('title'), term).
+    """
+    lookup_name = 'ilike'
+    # Keeps the term a plain value instead of a Value expression, so it is escaped and wrapped in %
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        return '%s', [f'%{connection.ops.prep_for_like_query(value)}%']
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} ILIKE {rhs}', lhs_params + rhs_params
+
+
+def search_query(term: str) -> SearchQuery:
+    """
+    Builds the full-text query of the term in every search configuration.
+
+    Args:
+        term (str): Search term.
+
+    Returns:
+        SearchQuery: Query matching the term stemmed by any of the configurations.
+    """
+    query = SearchQuery(term, config=SEARCH_CONFIGS[0])
+    for config in SEARCH_CONFIGS[1:]:
+        query |= SearchQuery(term, config=config)
+    return query
+
+
+class IndexedSearchAdminMixin:
+    """
+    Admin mixin that searches through the trigram and full-text indexes instead of
+    the icontains lookups of search_fields.
+
+    A search term shaped like a UUID is looked up by the primary key. Otherwise every
+    word of the term must match one of the fields, as in the stock admin search.
+    search_fields only has to be set for the admin to show the search box.
+
+    Attributes:
+        trigram_search_fields (tuple): Char fields with a gin_trgm_ops index, matched by substring.
+        fulltext_search_fields (tuple): Search vector fields with a GIN index, matched by stemmed words.
+    """
+    trigram_search_fields = ()
+    fulltext_search_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+
+        try:
+            return queryset.filter(pk=uuid.UUID(search_term)), False
+        except ValueError:
+            pass
+
+        if not self.trigram_search_fields and not self.fulltext_search_fields:
+            return super().get_search_results(request, queryset, search_term)
+
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            condition = Q()
+            for field in self.trigram_search_fields:
+                condition |= Q(ILike(F(field), bit))
+            for field in self.fulltext_search_fields:
+                condition |= Q(**{field: search_query(bit)})
+            queryset = queryset.filter(condition)
+        return queryset, False
@@ -0,0 +1,79 @@
+# movies/signals.py
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .autocomplete import invalidate_autocomplete
+from .http_cache import invalidate_api_cache
+from .models import Filmwork, Genre, GenreFilmwork, Person, PersonFilmwork
+from .summary import schedule_refresh
+
+# Models whose deletion cascades to the links; their own receivers take care of the summaries
+LINKED_MODELS = (Filmwork, Genre, Person)
+
+
+@receiver(post_save, sender=Filmwork)
+def refresh_saved_film(sender, instance, using, **kwargs):
+    # The summary row of a deleted film is removed by the cascade
+    schedule_refresh([instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Filmwork)
+def invalidate_deleted_film(sender, using, **kwargs):
+    # The summary row goes with the cascade, which refreshes nothing for a film without links
+    transaction.on_commit(invalidate_api_cache, using=using)
+
+
+def is_cascaded(origin) -> bool:
+    """ Whether a link is deleted by the cascade of a film, genre or person rather than on its own. """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, LINKED_MODELS)
+
+
+@receiver(post_save, sender=GenreFilmwork)
+@receiver(post_delete, sender=GenreFilmwork)
+@receiver(post_save, sender=PersonFilmwork)
+@receiver(post_delete, sender=PersonFilmwork)
+def refresh_linked_film(sender, instance, using, origin=None, **kwargs):
+    if origin is not None and is_cascaded(origin):
+        return
+    schedule_refresh([instance.film_work_id], using=using)
+
+
+@receiver(post_save, sender=Genre)
+def refresh_genre_films(sender, instance, using, created, **kwargs):
+    # A renamed genre changes the summary of all its films
+    if not created:
+        film_ids = GenreFilmwork.objects.using(using).filter(genre=instance).values_list('film_work_id', flat=True)
+        schedule_refresh(film_ids, using=using)
+
+
+@receiver(post_save, sender=Person)
+def refresh_person_films(sender, instance, using, created, **kwargs):
+    # A renamed person changes the summary of all their films
+    if not created:
+        film_ids = PersonFilmwork.objects.using(using).filter(person=instance).values_list('film_work_id', flat=True)
+        schedule_refresh(film_ids, using=using)
+
+
+@receiver(pre_delete, sender=Genre)
+def refresh_deleted_genre_films(sender, instance, using, **kwargs):
+    # Read before the cascade removes the links; the films are refreshed without the genre after the commit
+    film_ids = GenreFilmwork.objects.using(using).filter(genre=instance).values_list('film_work_id', flat=True)
+    schedule_refresh(film_ids, using=using)
+
+
+@receiver(pre_delete, sender=Person)
+def refresh_deleted_person_films(sender, instance, using, **kwargs):
+    film_ids = PersonFilmwork.objects.using(using).filter(person=instance).values_list('film_work_id', flat=True)
+    schedule_refresh(film_ids, using=using)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def invalidate_suggestions(sender, using, **kwargs):
+    # After the commit, so a concurrent request does not cache the old names again
+    transaction.on_commit(lambda: invalidate_autocomplete(sender), using=using)
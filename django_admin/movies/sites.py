@@ -0,0 +1,12 @@
+# movies/sites.py
+
+from django.contrib import admin
+from .autocomplete import PrefixAutocompleteJsonView
+
+
+class MoviesAdminSite(admin.AdminSite):
+    """
+    Admin site of the project; serves the autocomplete of the inlines from the cached prefix lookups.
+    """
+    def autocomplete_view(self, request):
+        return PrefixAutocompleteJsonView.as_view(admin_site=self)(request)
@@ -0,0 +1,131 @@
+// movies/static/movies/js/paginated_inline.js
+// Loads the rows of a paginated tabular inline page by page and submits only the changed ones.
+'use strict';
+{
+    const $ = django.jQuery;
+
+    function getGroup(control) {
+        return document.getElementById(control.dataset.prefix + '-group');
+    }
+
+    function getValues(row) {
+        return Array.from(row.querySelectorAll('input, select, textarea'), (field) => {
+            return field.type === 'checkbox' ? String(field.checked) : field.value;
+        }).join('\u001f');
+    }
+
+    function remember(row) {
+        row.dataset.initial = getValues(row);
+    }
+
+    // Numbers the forms in the order of the rows, the existing objects first,
+    // and updates the management form to match.
+    function renumber(control) {
+        const prefix = control.dataset.prefix;
+        const group = getGroup(control);
+        const pattern = new RegExp('(' + prefix + '-(\\d+|__prefix__))');
+        const rows = group.querySelectorAll('tr.form-row:not(.empty-form)');
+        rows.forEach((row, index) => {
+            const replacement = prefix + '-' + index;
+            row.id = replacement;
+            row.querySelectorAll('[id], [name], [for]').forEach((element) => {
+                for (const attribute of ['id', 'name', 'for']) {
+                    const value = element.getAttribute(attribute);
+                    if (value) {
+                        element.setAttribute(attribute, value.replace(pattern, replacement));
+                    }
+                }
+            });
+        });
+        document.getElementById('id_' + prefix + '-TOTAL_FORMS').value = rows.length;
+        document.getElementById('id_' + prefix + '-INITIAL_FORMS').value =
+            group.querySelectorAll('tr.form-row.has_original').length;
+    }
+
+    function loadPage(control, link) {
+        const group = getGroup(control);
+        const url = new URL(control.dataset.url, window.location.href);
+        url.searchParams.set('page', control.dataset.nextPage);
+        link.classList.add('disabled');
+        fetch(url, {credentials: 'same-origin'})
+            .then((response) => {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            })
+            .then((html) => {
+                const page = new DOMParser().parseFromString(html, 'text/html');
+                const shown = new Set(Array.from(
+                    group.querySelectorAll('tr.has_original input[name$="-id"]'), (input) => input.value
+                ));
+                // The loaded rows go after the shown ones and before the added ones
+                const tbody = group.querySelector('tbody');
+                const before = tbody.querySelector('tr.form-row:not(.has_original)');
+                page.querySelectorAll('tr.form-row.has_original').forEach((loaded) => {
+                    if (shown.has(loaded.querySelector('input[name$="-id"]').value)) {
+                        return;
+                    }
+                    const row = document.importNode(loaded, true);
+                    row.classList.add('dynamic-' + control.dataset.prefix);
+                    tbody.insertBefore(row, before);
+                    remember(row);
+                    $(row).find('.admin-autocomplete').djangoAdminSelect2();
+                });
+                renumber(control);
+
+                const next = page.querySelector('.paginated-inline');
+                if (next && next.dataset.nextPage) {
+                    control.dataset.nextPage = next.dataset.nextPage;
+                    link.classList.remove('disabled');
+                } else {
+                    link.remove();
+                }
+            })
+            .catch(() => link.classList.remove('disabled'));
+    }
+
+    // Drops the unchanged rows of the existing objects, so that they are neither
+    // submitted nor validated again.
+    function dropUnchanged(control) {
+        getGroup(control).querySelectorAll('tr.form-row.has_original').forEach((row) => {
+            if (row.dataset.initial !== undefined && row.dataset.initial === getValues(row)) {
+                const previous = row.previousElementSibling;
+                if (previous && previous.classList.contains('row-form-errors')) {
+                    previous.remove();
+                }
+                row.remove();
+            }
+        });
+        renumber(control);
+    }
+
+    $(function() {
+        document.querySelectorAll('.paginated-inline').forEach((control) => {
+            const group = getGroup(control);
+            // The rows of a form returned with errors hold submitted changes
+            if (!control.dataset.bound) {
+                group.querySelectorAll('tr.form-row.has_original').forEach(remember);
+            }
+            const link = control.querySelector('.paginated-inline-more');
+            if (link) {
+                link.addEventListener('click', (event) => {
+                    event.preventDefault();
+                    if (!link.classList.contains('disabled')) {
+                        loadPage(control, link);
+                    }
+                });
+            }
+            group.closest('form').addEventListener('submit', () => dropUnchanged(control));
+        });
+    });
+
+    document.addEventListener('formset:added', (event) => {
+        const control = document.querySelector(
+            '.paginated-inline[data-prefix="' + event.detail.formsetName + '"]'
+        );
+        if (control) {
+            renumber(control);
+        }
+    });
+}
@@ -0,0 +1,160 @@
+# movies/summary.py
+
+import weakref
+from typing import Iterable, Optional
+from django.db import connections, transaction
+from config.components.logging_config import logger
+from .http_cache import invalidate_api_cache
+
+SUMMARY_TABLE = 'content.film_work_summary'
+# Attribute of a connection holding a weak reference to the refresh of its current transaction
+PENDING_REFRESH = 'pending_film_summary_refresh'
+
+# Builds the summary rows of the films; {condition} restricts the films
+SUMMARY_SELECT = """
+    SELECT
+        fw.id,
+        fw.title,
+        fw.type,
+        fw.rating,
+        fw.creation_date,
+        COALESCE((
+            SELECT array_agg(g.name ORDER BY g.name)
+            FROM content.genre_film_work gfw
+            JOIN content.genre g ON g.id = gfw.genre_id
+            WHERE gfw.film_work_id = fw.id
+        ), '{{}}') AS genres,
+        COALESCE((
+            SELECT array_agg(DISTINCT pfw.person_id)
+            FROM content.person_film_work pfw
+            WHERE pfw.film_work_id = fw.id
+        ), '{{}}') AS person_ids,
+        COALESCE((
+            SELECT jsonb_object_agg(roles.role, roles.persons)
+            FROM (
+                SELECT pfw.role, jsonb_agg(jsonb_build_object('id', p.id, 'name', p.full_name) ORDER BY p.full_name) AS persons
+                FROM content.person_film_work pfw
+                JOIN content.person p ON p.id = pfw.person_id
+                WHERE pfw.film_work_id = fw.id
+                GROUP BY pfw.role
+            ) roles
+        ), '{{}}') AS persons,
+        now() AS refreshed
+    FROM content.film_work fw
+    {condition}
+"""
+
+SUMMARY_COLUMNS = ('title', 'type', 'rating', 'creation_date', 'genres', 'person_ids', 'persons')
+
+
+def refresh_film_summaries(film_ids: Optional[Iterable] = None, using: str = 'default') -> int:
+    """
+    Rebuilds the summary rows of the films in a single statement.
+
+    Rows are only rewritten when their content changed, and the rows of deleted
+    films are removed.
+
+    Args:
+        film_ids (Optional[Iterable]): Ids of the films; None rebuilds every film.
+        using (str): Alias of the database.
+
+    Returns:
+        int: Number of inserted or updated rows.
+    """
+    params = []
+    condition = ''
+    if film_ids is not None:
+        film_ids = [str(film_id) for film_id in film_ids]
+        if not film_ids:
+            return 0
+        condition = 'WHERE fw.id = ANY(%s::uuid[])'
+        params = [film_ids]
+
+    assignments = ', '.join(f'{column} = EXCLUDED.{column}' for column in SUMMARY_COLUMNS + ('refreshed',))
+    changed = ', '.join(f'{SUMMARY_TABLE}.{column}' for column in SUMMARY_COLUMNS)
+    excluded = ', '.join(f'EXCLUDED.{column}' for column in SUMMARY_COLUMNS)
+
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SUMMARY_TABLE} (id, {', '.join(SUMMARY_COLUMNS)}, refreshed) "
+            f"{SUMMARY_SELECT.format(condition=condition)} "
+            f"ON CONFLICT (id) DO UPDATE SET {assignments} "
+            f"WHERE ({changed}) IS DISTINCT FROM ({excluded})",
+            params,
+        )
+        refreshed = cursor.rowcount
+        cursor.execute(
+            f"DELETE FROM {SUMMARY_TABLE} s "
+            f"WHERE {'s.id = ANY(%s::uuid[]) AND ' if film_ids is not None else ''}"
+            "NOT EXISTS (SELECT 1 FROM content.film_work fw WHERE fw.id = s.id)",
+            params,
+        )
+        deleted = cursor.rowcount
+        # The API serves the summaries, so its cached responses go once they are committed
+        transaction.on_commit(invalidate_api_cache, using=using)
+
+    if film_ids is None:
+        logger.info(f"Rebuilt the film summary: {refreshed} rows refreshed, {deleted} removed")
+    return refreshed
+
+
+class PendingRefresh:
+    """
+    Films of a transaction whose summaries are refreshed together once it commits.
+
+    Attributes:
+        using (str): Alias of the database.
+        film_ids (set): Ids of the films.
+    """
+    def __init__(self, using: str):
+        self.using = using
+        self.film_ids = set()
+
+    def __call__(self):
+        connection = connections[self.using]
+        reference = getattr(connection, PENDING_REFRESH, None)
+        if reference is not None and reference() is self:
+            delattr(connection, PENDING_REFRESH)
+        if self.film_ids:
+            refresh_film_summaries(self.film_ids, using=self.using)
+
+
+def get_pending_refresh(using: str) -> Optional[PendingRefresh]:
+    """
+    Returns the refresh registered on the current transaction of the database, registering it on first use.
+
+    Returns:
+        Optional[PendingRefresh]: The refresh, or None outside a transaction.
+    """
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        return None
+    # Only the on_commit hooks hold the refresh: the rollback of the transaction, or of the
+    # savepoint it was registered in, discards it together with the films of the undone changes
+    reference = getattr(connection, PENDING_REFRESH, None)
+    pending = reference() if reference is not None else None
+    if pending is None:
+        pending = PendingRefresh(using)
+        setattr(connection, PENDING_REFRESH, weakref.ref(pending))
+        transaction.on_commit(pending, using=using)
+    return pending
+
+
+def schedule_refresh(film_ids: Iterable, using: str = 'default'):
+    """
+    Refreshes the summary rows of the films once the current transaction commits.
+
+    All the films scheduled during a transaction are refreshed by a single refresh
+    after its commit; outside a transaction they are refreshed at once.
+
+    Args:
+        film_ids (Iterable): Ids of the films.
+        using (str): Alias of the database.
+    """
+    pending = get_pending_refresh(using)
+    if pending is not None:
+        pending.film_ids.update(film_ids)
+        return
+    film_ids = set(film_ids)
+    if film_ids:
+        refresh_film_summaries(film_ids, using=using)
@@ -1,3 +1,107 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import resolve, reverse
 
-# Create your tests here.
+from .models import Filmwork, Genre, GenreFilmwork, Person, PersonFilmwork
+from .query_budget import QueryBudgetExceeded
+from .summary import refresh_film_summaries
+
+
+def create_catalog(films: int = 5) -> list:
+    # Every film has several genres and persons, so a query per row would go over the budgets
+    genres = [Genre.objects.create(name=f'Genre {index}') for index in range(3)]
+    persons = [Person.objects.create(full_name=f'Person {index}') for index in range(6)]
+    film_works = []
+    for index in range(films):
+        film = Filmwork.objects.create(title=f'Film {index}', rating=5.0 + index, type=Filmwork.FilmTypes.MOVIE)
+        for genre in genres[:2]:
+            GenreFilmwork.objects.create(film_work=film, genre=genre)
+        for person, role in zip(persons[index % 3:], PersonFilmwork.Roles.values):
+            PersonFilmwork.objects.create(film_work=film, person=person, role=role)
+        film_works.append(film)
+    refresh_film_summaries()
+    return film_works
+
+
+class QueryBudgetTestMixin:
+    def assertWithinBudget(self, url: str, **extra):
+        # In the strict mode a view over its budget fails the request with QueryBudgetExceeded
+        response = self.client.get(url, **extra)
+        match = resolve(url.split('?')[0])
+        budget = getattr(match.func, 'query_budget', None) or settings.QUERY_BUDGETS[match.view_name]
+        self.assertEqual(response.status_code, 200, url)
+        self.assertLessEqual(int(response['X-DB-Queries']), budget, url)
+        return response
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    databases = {'default', 'secondary'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.films = create_catalog()
+        cls.genre = Genre.objects.first()
+        cls.person = Person.objects.first()
+        cls.user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_admin_views(self):
+        film = self.films[0]
+        urls = [
+            reverse('admin:index'),
+            reverse('admin:movies_filmwork_changelist'),
+            reverse('admin:movies_filmwork_change', args=[film.pk]),
+            reverse('admin:movies_filmwork_add'),
+            reverse('admin:movies_filmwork_inline_page', args=[film.pk, 'personfilmwork_set']),
+            reverse('admin:movies_genre_changelist'),
+            reverse('admin:movies_genre_change', args=[self.genre.pk]),
+            reverse('admin:movies_person_changelist'),
+            reverse('admin:movies_person_change', args=[self.person.pk]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertWithinBudget(url)
+
+    def test_admin_autocomplete(self):
+        for field_name, model_name, term in (('genre', 'genrefilmwork', 'gen'), ('person', 'personfilmwork', 'per')):
+            with self.subTest(field_name=field_name):
+                response = self.assertWithinBudget(
+                    f"{reverse('admin:autocomplete')}?app_label=movies&model_name={model_name}&field_name={field_name}&term={term}"
+                )
+                self.assertTrue(response.json()['results'])
+
+    def test_api_views(self):
+        response = self.assertWithinBudget(reverse('movies:movies_list'))
+        self.assertEqual(len(response.json()['results']), len(self.films))
+        self.assertWithinBudget(reverse('movies:movie_detail', args=[self.films[0].pk]))
+        self.assertWithinBudget(reverse('movies:movies_export'))
+
+    @override_settings(QUERY_BUDGETS={**settings.QUERY_BUDGETS, 'admin:index': 1})
+    def test_strict_mode_fails_over_budget(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('admin:index'))
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class AsyncQueryBudgetTests(QueryBudgetTestMixin, TransactionTestCase):
+    # The async views read over connections of their own, which only see committed rows
+    databases = {'default', 'secondary'}
+
+    def setUp(self):
+        self.films = create_catalog()
+
+    def tearDown(self):
+        # The flush between the tests does not find the tables of the content schema
+        Filmwork.objects.all().delete()
+        Genre.objects.all().delete()
+        Person.objects.all().delete()
+
+    def test_async_api_views(self):
+        response = self.assertWithinBudget(reverse('movies:async_movies_list'))
+        self.assertEqual(len(response.json()['results']), len(self.films))
+        response = self.assertWithinBudget(reverse('movies:async_movie_detail', args=[self.films[0].pk]))
+        self.assertEqual(len(response.json()['genres']), 2)
@@ -1,9 +1,15 @@
 from django.urls import path
 
-from movies.views import movies_list
+from movies import async_views
+from movies.views import movie_detail, movies_export, movies_list
 
 app_name = 'movies_list'
 
 urlpatterns = [
-    # path('', movies_list, name='movies_list'),
-]
\ No newline at end of file
+    path('api/v1/movies/', movies_list, name='movies_list'),
+    path('api/v1/movies/export/', movies_export, name='movies_export'),
+    path('api/v1/movies/<uuid:pk>/', movie_detail, name='movie_detail'),
+    # Served by the ASGI server (config/asgi.py)
+    path('api/async/v1/movies/', async_views.movies_list, name='async_movies_list'),
+    path('api/async/v1/movies/<uuid:pk>/', async_views.movie_detail, name='async_movie_detail'),
+]
@@ -1,4 +1,234 @@
-from django.shortcuts import render
+# movies/views.py
 
+import json
+import uuid
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+from django.db import connections, router
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from .db_routing import use_replica
+from .http_cache import Validators, cached_json_response, conditional_response, make_validators
+from .models import FilmworkSummary
+from .query_budget import query_budget
+from .summary import SUMMARY_TABLE
+
+# Number of films of a page of the list, by default and at most
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+# Number of films read by one query of the export
+EXPORT_BATCH_SIZE = 1000
+
+# JSON document of a film, built by the database from its summary row "s"
+FILM_JSON = """json_build_object(
+    'id', s.id,
+    'title', s.title,
+    'type', s.type,
+    'rating', s.rating,
+    'creation_date', s.creation_date,
+    'genres', s.genres,
+    'persons', s.persons{extra}
+)::text"""
+
+# Films after the cursor in the order of their ids, as (id, JSON document) rows
+FILMS_PAGE_SQL = f"""
+    SELECT s.id, {FILM_JSON.format(extra='')}
+    FROM {SUMMARY_TABLE} s
+    {{condition}}
+    ORDER BY s.id
+    LIMIT %s
+"""
+
+# Validators of a page: the latest refresh of its summary rows, their number and ids
+FILMS_PAGE_VALIDATORS_SQL = f"""
+    SELECT max(p.refreshed), count(*), md5(string_agg(p.id::text, ',' ORDER BY p.id))
+    FROM (
+        SELECT s.id, s.refreshed
+        FROM {SUMMARY_TABLE} s
+        {{condition}}
+        ORDER BY s.id
+        LIMIT %s
+    ) p
+"""
+
+# Validators of the export; a deleted film changes the number of rows
+FILMS_VALIDATORS_SQL = f"SELECT max(s.refreshed), count(*) FROM {SUMMARY_TABLE} s"
+
+# The film with its description, which the summary does not hold
+FILM_DETAIL_SQL = f"""
+    SELECT {FILM_JSON.format(extra=", 'description', fw.description")}
+    FROM {SUMMARY_TABLE} s
+    JOIN content.film_work fw ON fw.id = s.id
+    WHERE s.id = %s
+"""
+
+# Validators of the film; the description is only tracked by the film itself
+FILM_VALIDATORS_SQL = f"""
+    SELECT greatest(s.refreshed, fw.modified)
+    FROM {SUMMARY_TABLE} s
+    JOIN content.film_work fw ON fw.id = s.id
+    WHERE s.id = %s
+"""
+
+
+def fetch_all(sql: str, params: list) -> List[tuple]:
+    """ Runs the query on the database the summaries are read from. """
+    with connections[router.db_for_read(FilmworkSummary)].cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def seek_condition(cursor_id: Optional[uuid.UUID]) -> Tuple[str, list]:
+    return ('WHERE s.id > %s', [cursor_id]) if cursor_id is not None else ('', [])
+
+
+def fetch_films(cursor_id: Optional[uuid.UUID], limit: int) -> List[Tuple[uuid.UUID, str]]:
+    """
+    Reads the JSON documents of the films that follow the cursor, in a single query.
+
+    Args:
+        cursor_id (Optional[uuid.UUID]): Id of the last film already read; None starts from the first one.
+        limit (int): Maximum number of films.
+
+    Returns:
+        List[Tuple[uuid.UUID, str]]: Id and JSON document of every film.
+    """
+    condition, params = seek_condition(cursor_id)
+    return fetch_all(FILMS_PAGE_SQL.format(condition=condition), params + [limit])
+
+
+def get_page_validators(cursor_id: Optional[uuid.UUID], limit: int) -> Validators:
+    """
+    Reads the validators of the films that follow the cursor, without building their documents.
+
+    A new, changed or deleted film of the page changes the latest refresh, the number
+    of rows or their ids, so it changes the ETag.
+    """
+    condition, params = seek_condition(cursor_id)
+    (modified, rows, ids_digest), = fetch_all(FILMS_PAGE_VALIDATORS_SQL.format(condition=condition), params + [limit])
+    return make_validators(rows, ids_digest, modified=modified)
+
+
+def json_error(message: str, status: int) -> JsonResponse:
+    """ Error response of the API. """
+    return JsonResponse({'error': message}, status=status)
+
+
+def get_page_params(request) -> Tuple[Optional[uuid.UUID], int]:
+    """
+    Reads the cursor and the page size of a list request.
+
+    Returns:
+        Tuple[Optional[uuid.UUID], int]: Id of the last film of the previous page, or None, and the page size.
+
+    Raises:
+        ValueError: If a parameter is malformed or the page size is out of range.
+    """
+    try:
+        page_size = int(request.GET.get('page_size', DEFAULT_PAGE_SIZE))
+        cursor_id = uuid.UUID(request.GET['cursor']) if request.GET.get('cursor') else None
+    except ValueError:
+        raise ValueError('Invalid cursor or page_size')
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f'page_size must be between 1 and {MAX_PAGE_SIZE}')
+    return cursor_id, page_size
+
+
+def get_next_url(request, cursor_id: uuid.UUID, page_size: int) -> str:
+    return f"{request.path}?{urlencode({'cursor': cursor_id, 'page_size': page_size})}"
+
+
+@query_budget(2)
+@use_replica
+@require_GET
 def movies_list(request):
-    return render(request, 'movies_list.html')
+    """
+    Lists the films with their genres and persons grouped by role.
+
+    The films are ordered by id and paged with a cursor: "next" holds the address
+    of the following page, or null on the last one. The documents are built by the
+    database and joined into the response as they are; the rendered pages are cached
+    and revalidated with their ETag.
+
+    Query parameters:
+        cursor: Id of the last film of the previous page.
+        page_size: Number of films, up to MAX_PAGE_SIZE.
+    """
+    try:
+        cursor_id, page_size = get_page_params(request)
+    except ValueError as e:
+        return json_error(str(e), 400)
+
+    def render() -> str:
+        # One more film than the page holds tells whether there is a next page
+        rows = fetch_films(cursor_id, page_size + 1)
+        next_url = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_url = get_next_url(request, rows[-1][0], page_size)
+        return f'{{"next": {json.dumps(next_url)}, "results": [{",".join(film for _, film in rows)}]}}'
+
+    return cached_json_response(request, lambda: get_page_validators(cursor_id, page_size + 1), render)
+
+
+@query_budget(2)
+@use_replica
+@require_GET
+def movie_detail(request, pk: uuid.UUID):
+    """
+    Returns the film with its description, genres and persons grouped by role.
+    """
+    def get_validators() -> Optional[Validators]:
+        rows = fetch_all(FILM_VALIDATORS_SQL, [pk])
+        return make_validators(pk, modified=rows[0][0]) if rows else None
+
+    response = cached_json_response(request, get_validators, lambda: fetch_all(FILM_DETAIL_SQL, [pk])[0][0])
+    if response is None:
+        return json_error('Film not found', 404)
+    return response
+
+
+def iter_export(batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """
+    Yields the JSON array of all films piece by piece, reading them in batches by id.
+
+    Every batch is a short query of its own, so the export neither holds a transaction
+    nor a server-side cursor open while the client reads it.
+
+    Args:
+        batch_size (int): Number of films per query.
+
+    Yields:
+        Iterator[str]: Parts of the JSON array.
+    """
+    yield '['
+    cursor_id = None
+    separator = ''
+    while True:
+        rows = fetch_films(cursor_id, batch_size)
+        if not rows:
+            break
+        yield separator + ','.join(film for _, film in rows)
+        separator = ','
+        cursor_id = rows[-1][0]
+    yield ']'
+
+
+@query_budget(1)
+@use_replica
+@require_GET
+def movies_export(request):
+    """
+    Streams every film as a JSON array; the queries run while the response is sent.
+
+    The export is too large to be cached here, but a client or nginx holding the
+    current one is answered with 304.
+    """
+    (modified, rows), = fetch_all(FILMS_VALIDATORS_SQL, [])
+    etag, modified = make_validators(rows, modified=modified)
+    response = StreamingHttpResponse(content_type='application/json')
+    response['Content-Disposition'] = 'attachment; filename="films.json"'
+    response = conditional_response(request, response, etag, modified)
+    if response.status_code != 304:
+        response.streaming_content = iter_export()
+    return response
@@ -0,0 +1,96 @@
+# utils/sqlite_to_postgres/batching.py
+
+from dataclasses import dataclass, field
+from typing import List
+
+# Number of the last batch sizes checked to decide whether the size has settled
+SETTLE_WINDOW = 3
+# Relative change of the size still considered settled
+SETTLE_TOLERANCE = 0.1
+
+
+@dataclass
+class AdaptiveBatcher:
+    """
+    Batch size of a single table tuned from the measured batches.
+
+    After every committed batch the cost of a row is measured in bytes and in
+    seconds, and the size moves towards the number of rows that fits both the
+    byte budget and the latency target. A single step changes the size at most
+    by the factor of max_step, so one slow commit does not collapse the batch.
+    """
+    size: int
+    target_bytes: int
+    target_seconds: float
+    min_size: int
+    max_size: int
+    max_step: float
+    history: List[int] = field(default_factory=list)
+
+    def record(self, rows: int, size_bytes: int, seconds: float):
+        """
+        Adjusts the batch size to a committed batch.
+
+        Args:
+            rows (int): Number of rows in the batch.
+            size_bytes (int): Estimated size of the batch in bytes.
+            seconds (float): Time spent on loading and committing the batch.
+        """
+        if rows * self.max_step < self.size:
+            # The last batch of a table is partial; its fixed costs say nothing about the current size
+            return
+
+        # Number of rows that fits each budget at the measured cost of a row
+        by_bytes = self.target_bytes * rows / max(size_bytes, 1)
+        by_latency = self.target_seconds * rows / max(seconds, 1e-6)
+        target = min(by_bytes, by_latency, self.size * self.max_step)
+        target = max(target, self.size / self.max_step)
+
+        self.size = int(min(max(target, self.min_size), self.max_size))
+        self.history.append(self.size)
+
+    @property
+    def settled(self) -> bool:
+        """ Whether the size stopped changing over the last batches. """
+        recent = self.history[-SETTLE_WINDOW:]
+        if len(recent) < SETTLE_WINDOW:
+            return False
+        return max(recent) - min(recent) <= SETTLE_TOLERANCE * max(recent)
+
+
+@dataclass
+class AdaptiveBatching:
+    """
+    Settings of the adaptive batch sizing shared by all tables.
+
+    Attributes:
+        target_bytes (int): Size of a batch the batcher aims for, in bytes.
+        target_seconds (float): Time of loading and committing a batch the batcher aims for.
+        min_size (int): Smallest batch size, in rows.
+        max_size (int): Largest batch size, in rows.
+        max_step (float): Largest factor by which a single batch changes the size.
+    """
+    target_bytes: int = 4 * 1024 * 1024
+    target_seconds: float = 1.0
+    min_size: int = 50
+    max_size: int = 50_000
+    max_step: float = 2.0
+
+    def create(self, initial_size: int) -> AdaptiveBatcher:
+        """
+        Creates the batcher of a table.
+
+        Args:
+            initial_size (int): Batch size to start from, e.g. the size saved by the previous run.
+
+        Returns:
+            AdaptiveBatcher: Batcher of the table.
+        """
+        return AdaptiveBatcher(
+            size=min(max(initial_size, self.min_size), self.max_size),
+            target_bytes=self.target_bytes,
+            target_seconds=self.target_seconds,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            max_step=self.max_step,
+        )
@@ -0,0 +1,207 @@
+# utils/sqlite_to_postgres/benchmark.py
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+from contextlib import closing
+from dataclasses import astuple
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Dict, List, Sequence, Tuple, Type
+from zoneinfo import ZoneInfo
+from utils.sqlite_to_postgres.data_transfer import TRANSFORMS, DataTransfer
+from utils.sqlite_to_postgres.db_manager import connect_sqlite_source
+from utils.sqlite_to_postgres.models import PersonFilmWork
+from utils.sqlite_to_postgres.run import TABLES
+from utils.sqlite_to_postgres.source_reader import ParallelReader
+
+SCHEMA = (
+    "CREATE TABLE person_film_work ("
+    "id TEXT PRIMARY KEY, film_work_id TEXT NOT NULL, person_id TEXT NOT NULL, "
+    "role TEXT NOT NULL, created_at TIMESTAMP WITH TIME ZONE)"
+)
+
+
+def create_source(rows: int, seed: int = 0, path: str = ":memory:") -> sqlite3.Connection:
+    """
+    Creates a SQLite database shaped like the largest table of the source, in memory by default.
+
+    Args:
+        rows (int): Number of rows in the table.
+        seed (int): Seed of the generated data.
+        path (str): Path of the database file.
+
+    Returns:
+        sqlite3.Connection: Connection to the database.
+    """
+    generator = random.Random(seed)
+    films = [str(uuid.UUID(int=generator.getrandbits(128))) for _ in range(max(1, rows // 10))]
+    persons = [str(uuid.UUID(int=generator.getrandbits(128))) for _ in range(max(1, rows // 5))]
+    start = datetime(2021, 6, 16, tzinfo=timezone.utc)
+
+    connection = sqlite3.connect(path)
+    connection.execute(SCHEMA)
+    connection.executemany(
+        "INSERT INTO person_film_work VALUES (?, ?, ?, ?, ?)",
+        (
+            (
+                str(uuid.UUID(int=generator.getrandbits(128))),
+                generator.choice(films),
+                generator.choice(persons),
+                generator.choice(("actor", "director", "writer")),
+                (start + timedelta(seconds=generator.randrange(3600))).isoformat(),
+            )
+            for _ in range(rows)
+        ),
+    )
+    connection.commit()
+    return connection
+
+
+def normalize_datetime(value) -> datetime:
+    """ Normalization of the datetime values by the original transformation. """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=ZoneInfo("UTC"))
+    return value.astimezone(ZoneInfo("UTC"))
+
+
+def convert_baseline(batch: List[tuple], source_columns: Sequence[str], model_cls: Type) -> List[tuple]:
+    """
+    Converts the rows as the transfer did before the transformations were added:
+    a dict per row, the mapped field names, the datetimes normalized with ZoneInfo,
+    a dataclass instance and astuple.
+    """
+    field_mapping = getattr(model_cls, "field_mapping", {})
+    items = []
+    for row in batch:
+        data = {field_mapping.get(key, key): value for key, value in dict(zip(source_columns[1:], row[1:])).items()}
+        items.append(model_cls(**{
+            key: (normalize_datetime(value) if key in ["created", "modified"] else value)
+            for key, value in data.items()
+        }))
+    return [astuple(item) for item in items]
+
+
+def measure(connection: sqlite3.Connection, table_name: str, model_cls: Type, transform: str, batch_size: int) -> Tuple[int, float]:
+    """
+    Measures the CPU time spent on converting the rows, without the time of reading them.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the source database.
+        table_name (str): Name of the table in the database.
+        model_cls (Type): Class of the dataclass.
+        transform (str): Transformation of the rows: "fast", "validate" or "baseline", the original one.
+        batch_size (int): Number of rows per batch.
+
+    Returns:
+        Tuple[int, float]: Number of the converted rows and CPU seconds spent on the conversion.
+    """
+    with closing(connection.cursor()) as cursor:
+        data_transfer = DataTransfer(cursor, None, None, batch_size=batch_size, transform="fast" if transform == "baseline" else transform)
+        rows, spent = 0, 0.0
+        for batch in data_transfer.extract_data(table_name):
+            started = time.process_time()
+            if transform == "baseline":
+                convert_baseline(batch, data_transfer.get_source_columns(), model_cls)
+            else:
+                data_transfer.convert_batch(batch, model_cls)
+            spent += time.process_time() - started
+            rows += len(batch)
+    return rows, spent
+
+
+def measure_reading(path: str, table_name: str, model_cls: Type, readers: int, batch_size: int) -> Tuple[int, float]:
+    """
+    Measures the wall-clock time of reading and converting the rows of the table.
+
+    Args:
+        path (str): Path to the SQLite database.
+        table_name (str): Name of the table in the database.
+        model_cls (Type): Class of the dataclass.
+        readers (int): Number of SQLite connections reading the table at the same time.
+        batch_size (int): Number of rows per batch.
+
+    Returns:
+        Tuple[int, float]: Number of the read rows and seconds spent.
+    """
+    reader = ParallelReader(partial(connect_sqlite_source, path, immutable=True), readers) if readers > 1 else None
+    with closing(connect_sqlite_source(path, immutable=True)) as connection, closing(connection.cursor()) as cursor:
+        data_transfer = DataTransfer(cursor, None, None, batch_size=batch_size, reader=reader)
+        rows, started = 0, time.perf_counter()
+        for batch in data_transfer.extract_data(table_name):
+            data_transfer.convert_batch(batch, model_cls)
+            rows += len(batch)
+    return rows, time.perf_counter() - started
+
+
+def run_benchmark(connection: sqlite3.Connection, tables: Dict[str, Type], batch_size: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Compares the CPU time per row of the transformations and of the original one.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the source database.
+        tables (Dict[str, Type]): Classes of the dataclasses by the table name.
+        batch_size (int): Number of rows per batch.
+        repeat (int): Number of runs; the best one is taken.
+
+    Returns:
+        Dict[str, Dict[str, float]]: CPU microseconds per row by the table name and the transformation.
+    """
+    results = {}
+    for table_name, model_cls in tables.items():
+        results[table_name] = {}
+        for transform in ("baseline", *TRANSFORMS):
+            runs = [measure(connection, table_name, model_cls, transform, batch_size) for _ in range(repeat)]
+            rows = runs[0][0]
+            results[table_name][transform] = min(spent for _, spent in runs) / max(rows, 1) * 1_000_000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the CPU cost of the row transformations.")
+    parser.add_argument("--sqlite", help="Path to a SQLite database; a generated person_film_work table is used by default.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of the generated rows.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--readers", type=int, help="Compare the reading of the table by one and by this many connections instead.")
+    options = parser.parse_args()
+
+    if options.readers:
+        with tempfile.TemporaryDirectory() as directory:
+            path = options.sqlite or f"{directory}/source.sqlite"
+            tables = TABLES if options.sqlite else {"person_film_work": PersonFilmWork}
+            if not options.sqlite:
+                create_source(options.rows, path=path).close()
+            for table_name, model_cls in tables.items():
+                seconds = {
+                    readers: min(measure_reading(path, table_name, model_cls, readers, options.batch_size)[1] for _ in range(options.repeat))
+                    for readers in (1, options.readers)
+                }
+                print(
+                    f"{table_name}: 1 reader {seconds[1]:.2f}s, {options.readers} readers {seconds[options.readers]:.2f}s, "
+                    f"speedup {seconds[1] / seconds[options.readers]:.1f}x"
+                )
+        return
+
+    if options.sqlite:
+        connection, tables = connect_sqlite_source(options.sqlite), TABLES
+    else:
+        connection, tables = create_source(options.rows), {"person_film_work": PersonFilmWork}
+
+    with closing(connection):
+        results = run_benchmark(connection, tables, options.batch_size, options.repeat)
+
+    for table_name, per_row in results.items():
+        print(
+            f"{table_name}: baseline {per_row['baseline']:.2f} µs, validate {per_row['validate']:.2f} µs, "
+            f"fast {per_row['fast']:.2f} µs CPU per row, speedup {per_row['baseline'] / per_row['fast']:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# utils/sqlite_to_postgres/bulk_load.py
+
+import time
+import psycopg
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List
+from psycopg.rows import dict_row
+from config.components.logging_config import logger
+from utils.sqlite_to_postgres.db_manager import postgres_connection
+
+# Kinds of the deferred definitions in the order they are rebuilt: foreign keys need the loaded tables
+INDEX, UNIQUE, FOREIGN_KEY = "index", "unique", "foreign_key"
+REBUILD_PHASES = ((INDEX, UNIQUE), (FOREIGN_KEY,))
+
+
+@dataclass
+class DeferredDefinition:
+    """
+    Definition of a secondary index or constraint dropped for the time of a bulk load.
+    """
+    table_name: str
+    name: str
+    kind: str
+    definition: str
+
+    @property
+    def drop_statement(self) -> str:
+        if self.kind == INDEX:
+            return f'DROP INDEX content."{self.name}"'
+        return f'ALTER TABLE content.{self.table_name} DROP CONSTRAINT "{self.name}"'
+
+    @property
+    def create_statement(self) -> str:
+        if self.kind == INDEX:
+            return self.definition
+        return f'ALTER TABLE content.{self.table_name} ADD CONSTRAINT "{self.name}" {self.definition}'
+
+
+class BulkLoad:
+    """
+    Drops the secondary indexes and constraints of the target tables during a full reload.
+
+    The definitions are taken from the catalog and saved in PostgreSQL in the same
+    transaction that drops them, so they survive a crash of the migration. After the
+    load they are rebuilt in parallel, each over its own connection with a larger
+    maintenance_work_mem, and the tables are analyzed. Primary keys are kept: the
+    loaders rely on them to skip the rows that already exist.
+    """
+    table = "content.transfer_deferred_ddl"
+
+    def __init__(self, dls_postgres: dict, workers: int = 4, maintenance_work_mem: str = "512MB"):
+        self.dls_postgres = dls_postgres
+        self.workers = max(1, workers)
+        self.maintenance_work_mem = maintenance_work_mem
+
+    def ensure_table(self, postgres_cursor: psycopg.Cursor):
+        """ Creates the table of the deferred definitions if it does not exist. """
+        postgres_cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "table_name TEXT NOT NULL, "
+            "name TEXT NOT NULL, "
+            "kind TEXT NOT NULL, "
+            "definition TEXT NOT NULL, "
+            "deferred_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+            "PRIMARY KEY (table_name, name))"
+        )
+
+    def pending(self, postgres_cursor: psycopg.Cursor) -> List[DeferredDefinition]:
+        """
+        Returns the definitions dropped and not rebuilt yet, e.g. by a migration that crashed.
+
+        Args:
+            postgres_cursor (psycopg.Cursor): Cursor of the PostgreSQL connection.
+
+        Returns:
+            List[DeferredDefinition]: Deferred definitions.
+        """
+        postgres_cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS exists", [self.table])
+        if not postgres_cursor.fetchone()["exists"]:
+            return []
+        postgres_cursor.execute(f"SELECT table_name, name, kind, definition FROM {self.table} ORDER BY table_name, name")
+        return [DeferredDefinition(**row) for row in postgres_cursor.fetchall()]
+
+    def capture(self, postgres_cursor: psycopg.Cursor, table_names: Iterable[str]) -> List[DeferredDefinition]:
+        """
+        Reads the definitions of the secondary indexes and constraints of the tables from the catalog.
+
+        Args:
+            postgres_cursor (psycopg.Cursor): Cursor of the PostgreSQL connection.
+            table_names (Iterable[str]): Names of the tables in the database.
+
+        Returns:
+            List[DeferredDefinition]: Definitions of the unique and foreign key constraints
+                and of the indexes that back no constraint.
+        """
+        table_names = list(table_names)
+        postgres_cursor.execute(
+            "SELECT t.relname AS table_name, c.conname AS name, "
+            f"CASE c.contype WHEN 'f' THEN '{FOREIGN_KEY}' ELSE '{UNIQUE}' END AS kind, "
+            "pg_get_constraintdef(c.oid) AS definition "
+            "FROM pg_constraint c JOIN pg_class t ON t.oid = c.conrelid "
+            "WHERE t.relnamespace = 'content'::regnamespace AND t.relname = ANY(%s) AND c.contype IN ('u', 'f') "
+            "UNION ALL "
+            f"SELECT t.relname, i.relname, '{INDEX}', pg_get_indexdef(x.indexrelid) "
+            "FROM pg_index x "
+            "JOIN pg_class t ON t.oid = x.indrelid "
+            "JOIN pg_class i ON i.oid = x.indexrelid "
+            "WHERE t.relnamespace = 'content'::regnamespace AND t.relname = ANY(%s) AND NOT x.indisprimary "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid AND c.conrelid = x.indrelid) "
+            "ORDER BY 1, 2",
+            [table_names, table_names],
+        )
+        return [DeferredDefinition(**row) for row in postgres_cursor.fetchall()]
+
+    def defer(self, table_names: Iterable[str]) -> List[DeferredDefinition]:
+        """
+        Saves and drops the secondary indexes and constraints of the tables in one transaction.
+
+        Args:
+            table_names (Iterable[str]): Names of the tables in the database.
+
+        Returns:
+            List[DeferredDefinition]: Dropped definitions.
+
+        Raises:
+            RuntimeError: If definitions dropped by a previous run are still pending.
+        """
+        with postgres_connection(self.dls_postgres) as postgres_conn:
+            with postgres_conn.cursor(row_factory=dict_row) as postgres_cur:
+                self.ensure_table(postgres_cur)
+                if self.pending(postgres_cur):
+                    raise RuntimeError(f"Definitions deferred by a previous run are not restored yet, see {self.table}")
+
+                definitions = self.capture(postgres_cur, table_names)
+                # Foreign keys are dropped first, they may depend on the unique indexes
+                for definition in sorted(definitions, key=lambda item: item.kind != FOREIGN_KEY):
+                    postgres_cur.execute(
+                        f"INSERT INTO {self.table} (table_name, name, kind, definition) VALUES (%s, %s, %s, %s)",
+                        [definition.table_name, definition.name, definition.kind, definition.definition],
+                    )
+                    postgres_cur.execute(definition.drop_statement)
+            postgres_conn.commit()
+
+        logger.info(f"Deferred {len(definitions)} indexes and constraints: {', '.join(item.name for item in definitions)}")
+        return definitions
+
+    def create(self, definition: DeferredDefinition):
+        """
+        Creates the index or constraint and removes it from the deferred definitions.
+
+        Args:
+            definition (DeferredDefinition): Deferred definition.
+        """
+        started = time.perf_counter()
+        with postgres_connection(self.dls_postgres) as postgres_conn:
+            with postgres_conn.cursor() as postgres_cur:
+                postgres_cur.execute(f"SET maintenance_work_mem = '{self.maintenance_work_mem}'")
+                postgres_cur.execute(definition.create_statement)
+                postgres_cur.execute(
+                    f"DELETE FROM {self.table} WHERE table_name = %s AND name = %s",
+                    [definition.table_name, definition.name],
+                )
+            postgres_conn.commit()
+        logger.info(f"Rebuilt {definition.kind} {definition.name} on {definition.table_name} in {time.perf_counter() - started:.2f}s")
+
+    def analyze(self, table_name: str):
+        """ Updates the planner statistics of the table. """
+        with postgres_connection(self.dls_postgres) as postgres_conn:
+            postgres_conn.autocommit = True
+            postgres_conn.execute(f"ANALYZE content.{table_name}")
+
+    def rebuild(self, table_names: Iterable[str]):
+        """
+        Rebuilds the deferred definitions in parallel and analyzes the tables.
+
+        Indexes and unique constraints are built first, the foreign keys after them.
+
+        Args:
+            table_names (Iterable[str]): Names of the loaded tables.
+        """
+        with postgres_connection(self.dls_postgres) as postgres_conn:
+            with postgres_conn.cursor(row_factory=dict_row) as postgres_cur:
+                definitions = self.pending(postgres_cur)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="rebuild") as executor:
+            for kinds in REBUILD_PHASES:
+                # list() waits for the phase and raises the first error
+                list(executor.map(self.create, [item for item in definitions if item.kind in kinds]))
+            list(executor.map(self.analyze, table_names))
+        logger.info(f"Rebuilt {len(definitions)} indexes and constraints and analyzed the tables in {time.perf_counter() - started:.2f}s")
+
+    def restore(self) -> List[DeferredDefinition]:
+        """
+        Restores the deferred definitions one by one after a failure.
+
+        A definition that cannot be restored is logged and kept, so it is retried
+        by the next run.
+
+        Returns:
+            List[DeferredDefinition]: Definitions that could not be restored.
+        """
+        with postgres_connection(self.dls_postgres) as postgres_conn:
+            with postgres_conn.cursor(row_factory=dict_row) as postgres_cur:
+                definitions = self.pending(postgres_cur)
+
+        failed = []
+        for kinds in REBUILD_PHASES:
+            for definition in definitions:
+                if definition.kind not in kinds:
+                    continue
+                try:
+                    self.create(definition)
+                except Exception as e:
+                    logger.error(f"Error restoring {definition.kind} {definition.name} on {definition.table_name}: {e}")
+                    failed.append(definition)
+        return failed
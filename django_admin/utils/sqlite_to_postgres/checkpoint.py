@@ -0,0 +1,134 @@
+# utils/sqlite_to_postgres/checkpoint.py
+
+import psycopg
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class Checkpoint:
+    """
+    Position of the last committed SQLite row of a table, the high-water mark
+    of its last synchronization and the batch size it settled on.
+    """
+    table_name: str
+    position: int = 0
+    completed: bool = False
+    watermark: Optional[str] = None
+    watermark_position: int = 0
+    batch_size: Optional[int] = None
+
+
+class CheckpointStore:
+    """
+    Stores the checkpoints of the transfer in PostgreSQL.
+
+    A checkpoint is written in the same transaction as the batch it belongs to,
+    so after a failure the transfer continues right after the last committed batch.
+    """
+    table = "content.transfer_checkpoint"
+
+    def __init__(self, postgres_cursor: psycopg.Cursor):
+        self.postgres_cursor = postgres_cursor
+
+    def ensure_table(self):
+        """ Creates the table of the checkpoints if it does not exist. """
+        self.postgres_cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "table_name TEXT PRIMARY KEY, "
+            "position BIGINT NOT NULL DEFAULT 0, "
+            "completed BOOLEAN NOT NULL DEFAULT FALSE, "
+            "updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now())"
+        )
+        self.postgres_cursor.execute(
+            f"ALTER TABLE {self.table} "
+            "ADD COLUMN IF NOT EXISTS watermark TEXT, "
+            "ADD COLUMN IF NOT EXISTS watermark_position BIGINT NOT NULL DEFAULT 0, "
+            "ADD COLUMN IF NOT EXISTS batch_size INTEGER"
+        )
+
+    def get(self, table_name: str) -> Checkpoint:
+        """
+        Returns the checkpoint of the table.
+
+        Args:
+            table_name (str): Name of the table in the database.
+
+        Returns:
+            Checkpoint: Saved checkpoint, or an empty one if the table was never transferred.
+        """
+        self.postgres_cursor.execute(
+            f"SELECT position, completed, watermark, watermark_position, batch_size FROM {self.table} WHERE table_name = %s",
+            [table_name],
+        )
+        row = self.postgres_cursor.fetchone()
+        if row is None:
+            return Checkpoint(table_name)
+        return Checkpoint(
+            table_name, row["position"], row["completed"], row["watermark"], row["watermark_position"], row["batch_size"],
+        )
+
+    def save(self, table_name: str, position: int, completed: bool = False):
+        """
+        Saves the checkpoint of the table. The transaction is committed by the caller.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            position (int): SQLite rowid of the last transferred row.
+            completed (bool): Whether the whole table is transferred.
+        """
+        self.postgres_cursor.execute(
+            f"INSERT INTO {self.table} (table_name, position, completed, updated_at) "
+            "VALUES (%s, %s, %s, now()) "
+            "ON CONFLICT (table_name) DO UPDATE "
+            "SET position = EXCLUDED.position, completed = EXCLUDED.completed, updated_at = EXCLUDED.updated_at",
+            [table_name, position, completed],
+        )
+
+    def save_watermark(self, table_name: str, watermark: Optional[str], position: int):
+        """
+        Saves the high-water mark of the table. The transaction is committed by the caller.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            watermark (Optional[str]): Greatest SQLite value of the change tracking column
+                among the transferred rows.
+            position (int): SQLite rowid of the last transferred row with that value.
+        """
+        self.postgres_cursor.execute(
+            f"INSERT INTO {self.table} (table_name, watermark, watermark_position, updated_at) "
+            "VALUES (%s, %s, %s, now()) "
+            "ON CONFLICT (table_name) DO UPDATE SET watermark = EXCLUDED.watermark, "
+            "watermark_position = EXCLUDED.watermark_position, updated_at = EXCLUDED.updated_at",
+            [table_name, watermark, position],
+        )
+
+    def save_batch_size(self, table_name: str, batch_size: int):
+        """
+        Saves the batch size the table settled on. The transaction is committed by the caller.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            batch_size (int): Number of rows per batch.
+        """
+        self.postgres_cursor.execute(
+            f"INSERT INTO {self.table} (table_name, batch_size, updated_at) "
+            "VALUES (%s, %s, now()) "
+            "ON CONFLICT (table_name) DO UPDATE SET batch_size = EXCLUDED.batch_size, updated_at = EXCLUDED.updated_at",
+            [table_name, batch_size],
+        )
+
+    def reset(self, table_names: List[str]):
+        """
+        Resets the progress of the tables. The transaction is committed by the caller.
+
+        The batch sizes are kept, so a full reload starts from the tuned sizes.
+
+        Args:
+            table_names (List[str]): Names of the tables in the database.
+        """
+        self.postgres_cursor.execute(
+            f"UPDATE {self.table} SET position = 0, completed = FALSE, watermark = NULL, "
+            "watermark_position = 0, updated_at = now() WHERE table_name = ANY(%s)",
+            [list(table_names)],
+        )
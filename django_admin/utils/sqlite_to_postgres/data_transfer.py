@@ -1,63 +1,333 @@
 # utils/sqlite_to_postgres/data_transfer.py
 
 import sqlite3
+import time
 import psycopg
-from dataclasses import astuple
-from typing import Generator, List, Type
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Sequence, Set, Tuple, Type
 from datetime import datetime
-from zoneinfo import ZoneInfo
 from config.components.logging_config import logger
+from utils.sqlite_to_postgres.checkpoint import CheckpointStore
+from utils.sqlite_to_postgres.fast_path import UTC, RowPlan
+from utils.sqlite_to_postgres.batching import AdaptiveBatcher, AdaptiveBatching
+from utils.sqlite_to_postgres.pipeline import Pipeline, estimate_batch_bytes
+from utils.sqlite_to_postgres.source_reader import ROWID_COLUMN, ParallelReader
+from utils.sqlite_to_postgres.verification import TransferVerifier
 # from utils.sqlite_to_postgres.models import Genre, Person, FilmWork, GenreFilmWork, PersonFilmWork
 
+# Available loaders: row-by-row INSERT or binary COPY through a staging table
+LOADERS = ("insert", "copy")
+
+# Available transformations: precompiled tuples or validated dataclass instances
+TRANSFORMS = ("fast", "validate")
+
+# Columns whose values in the rows changed by an incremental sync are reported with its statistics
+CHANGE_KEYS = ("id", "film_work_id")
+
+# Default limit of the parameters of a statement in SQLite before 3.32
+SQLITE_MAX_VARIABLES = 999
+
+
+def truncate_tables(postgres_cursor: psycopg.Cursor, table_names: Iterable[str]):
+    """
+    Truncates several tables in PostgreSQL with a single statement. The transaction is committed by the caller.
+
+    Args:
+        postgres_cursor (psycopg.Cursor): Cursor of the PostgreSQL connection.
+        table_names (Iterable[str]): Names of the tables in the database.
+    """
+    tables = ", ".join(f"content.{table_name}" for table_name in table_names)
+    postgres_cursor.execute(f"TRUNCATE TABLE {tables} CASCADE")
+
+
+@dataclass
+class TransferStats:
+    """
+    Statistics of the data transfer for a single table.
+
+    Attributes:
+        changed (Dict[str, Set]): Values of the CHANGE_KEYS columns of the rows upserted
+            or deleted by an incremental sync; empty for a full reload.
+    """
+    table_name: str
+    rows: int
+    seconds: float
+    batch_size: Optional[int] = None
+    changed: Dict[str, Set] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else float(self.rows)
+
+
 class DataTransfer:
     """
     Class for transferring data from SQLite to PostgreSQL.
     """
-    def __init__(self, sqlite_cursor: sqlite3.Cursor, postgres_cursor: psycopg.Cursor, postgres_conn: psycopg.Connection, batch_size: int = 100):
+    def __init__(self, sqlite_cursor: sqlite3.Cursor, postgres_cursor: psycopg.Cursor, postgres_conn: psycopg.Connection, batch_size: int = 100, loader: str = "insert", checkpoints: Optional[CheckpointStore] = None, transform: str = "fast", pipeline: Optional[Pipeline] = None, batching: Optional[AdaptiveBatching] = None, reader: Optional[ParallelReader] = None):
+        if loader not in LOADERS:
+            raise ValueError(f"Unknown loader: {loader}. Available loaders: {', '.join(LOADERS)}")
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Unknown transform: {transform}. Available transforms: {', '.join(TRANSFORMS)}")
+        if pipeline and pipeline.processes and transform != "fast":
+            raise ValueError("Only the fast transform can run in a process pool")
+
         self.sqlite_cursor = sqlite_cursor
         self.postgres_cursor = postgres_cursor
         self.postgres_conn = postgres_conn
         self.batch_size = batch_size
+        self.loader = loader
+        self.checkpoints = checkpoints
+        self.transform = transform
+        self.pipeline = pipeline
+        self.batching = batching
+        self.batchers: Dict[str, AdaptiveBatcher] = {}
+        self.reader = reader
+        self.source_columns: List[str] = []
+        self._column_types: Dict[str, Dict[str, str]] = {}
+        self._row_plans: Dict[Tuple[Type, Tuple[str, ...]], RowPlan] = {}
 
-    def extract_data(self, table_name: str) -> Generator[List[sqlite3.Row], None, None]:
+    def extract_data(self, table_name: str, start_after: int = 0) -> Generator[List[tuple], None, None]:
         """
-        Extracts data from the table in SQLite.
+        Extracts data from the table in SQLite in the order of rowid.
+
+        The rowid is returned as the first column of every row, so the position
+        of the last transferred row can be saved to the checkpoint. With a parallel
+        reader the rowid ranges of the table are read over several connections.
 
         Args:
             table_name (str): Name of the table in the database.
+            start_after (int): Rowid after which the extraction starts.
 
         Yields:
-            Generator[List[sqlite3.Row], None, None]: List of rows from the table.
+            Generator[List[tuple], None, None]: List of rows from the table.
         """
-        self.sqlite_cursor.execute(f"SELECT * FROM {table_name}")
-        while results := self.sqlite_cursor.fetchmany(self.batch_size):
+        query = f"SELECT rowid AS {ROWID_COLUMN}, * FROM {table_name}"
+        if self.reader:
+            self.sqlite_cursor.execute(f"{query} LIMIT 0")
+            self.source_columns = self.get_cursor_columns()
+            yield from self.reader.read(table_name, start_after, lambda: self.get_batch_size(table_name))
+            return
+
+        self.sqlite_cursor.execute(f"{query} WHERE rowid > ? ORDER BY rowid", (start_after,))
+        self.source_columns = self.get_cursor_columns()
+        while results := self.sqlite_cursor.fetchmany(self.get_batch_size(table_name)):
             yield results
 
-    def insert_data(self, table_name: str, data: List[Type]):
+    def extract_changes(self, table_name: str, column: str, watermark: Optional[str], position: int = 0) -> Generator[List[tuple], None, None]:
+        """
+        Extracts the rows changed since the high-water mark from the table in SQLite.
+
+        The rows are ordered by the change tracking column and rowid, so rows sharing
+        the same timestamp are neither lost nor extracted again across batches and runs.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            column (str): SQLite column that tracks the changes (updated_at or created_at).
+            watermark (Optional[str]): High-water mark of the previous run; None extracts every row.
+            position (int): Rowid of the last row extracted with the watermark value.
+
+        Yields:
+            Generator[List[tuple], None, None]: List of rows from the table.
+        """
+        if watermark is None:
+            self.sqlite_cursor.execute(
+                f"SELECT rowid AS {ROWID_COLUMN}, * FROM {table_name} ORDER BY {column}, rowid"
+            )
+        else:
+            self.sqlite_cursor.execute(
+                f"SELECT rowid AS {ROWID_COLUMN}, * FROM {table_name} "
+                f"WHERE {column} > ? OR ({column} = ? AND rowid > ?) ORDER BY {column}, rowid",
+                (watermark, watermark, position),
+            )
+        self.source_columns = self.get_cursor_columns()
+        while results := self.sqlite_cursor.fetchmany(self.get_batch_size(table_name)):
+            yield results
+
+    def extract_rows(self, table_name: str, columns: Sequence[str], keys: List[tuple]) -> Generator[List[tuple], None, None]:
+        """
+        Extracts the rows with the given values of the columns from the table in SQLite.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            columns (Sequence[str]): Columns that identify the rows.
+            keys (List[tuple]): Values of the columns of the extracted rows.
+
+        Yields:
+            Generator[List[tuple], None, None]: List of rows from the table.
+        """
+        chunk_size = SQLITE_MAX_VARIABLES // len(columns)
+        placeholders = f"({', '.join('?' for _ in columns)})"
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            self.sqlite_cursor.execute(
+                f"SELECT rowid AS {ROWID_COLUMN}, * FROM {table_name} "
+                f"WHERE ({', '.join(columns)}) IN (VALUES {', '.join(placeholders for _ in chunk)}) ORDER BY rowid",
+                [str(value) for key in chunk for value in key],
+            )
+            self.source_columns = self.get_cursor_columns()
+            while results := self.sqlite_cursor.fetchmany(self.get_batch_size(table_name)):
+                yield results
+
+    def get_batch_size(self, table_name: str) -> int:
+        """ Returns the current batch size of the table: the tuned one with adaptive batching. """
+        batcher = self.batchers.get(table_name)
+        return batcher.size if batcher else self.batch_size
+
+    def start_batching(self, table_name: str):
+        """
+        Starts tuning the batch size of the table from the size saved by the previous run.
+
+        Args:
+            table_name (str): Name of the table in the database.
+        """
+        if self.batching is None:
+            return
+        initial_size = self.batch_size
+        if self.checkpoints:
+            initial_size = self.checkpoints.get(table_name).batch_size or initial_size
+        self.batchers[table_name] = self.batching.create(initial_size)
+
+    def finish_batching(self, table_name: str) -> Optional[int]:
+        """
+        Stops tuning the batch size of the table and saves the size it settled on.
+        The transaction is committed by the caller.
+
+        Args:
+            table_name (str): Name of the table in the database.
+
+        Returns:
+            Optional[int]: Final batch size, or None without adaptive batching.
+        """
+        batcher = self.batchers.pop(table_name, None)
+        if batcher is None:
+            return None
+        if batcher.history:
+            state = "settled" if batcher.settled else "was still changing"
+            logger.info(f"Batch size of {table_name} {state} at {batcher.size} rows after {len(batcher.history)} batches")
+            if self.checkpoints:
+                self.checkpoints.save_batch_size(table_name, batcher.size)
+        return batcher.size
+
+    def conflict_clause(self, table_name: str, fields: List[str], upsert: bool = False) -> str:
+        """
+        Returns the ON CONFLICT clause for the rows inserted into the table.
+
+        By default the rows that already exist are skipped. When upserting, the existing
+        rows are updated if they were modified; rows without the modified column never
+        change, so they are skipped on any conflict, including the unique constraints
+        of the link tables.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            fields (List[str]): Inserted columns.
+            upsert (bool): Whether to update the existing rows.
+
+        Returns:
+            str: ON CONFLICT clause.
+        """
+        if not upsert:
+            return "ON CONFLICT (id) DO NOTHING"
+        if "modified" not in fields:
+            return "ON CONFLICT DO NOTHING"
+
+        updates = ", ".join(f"{field} = EXCLUDED.{field}" for field in fields if field != "id")
+        return f"ON CONFLICT (id) DO UPDATE SET {updates} " \
+               f"WHERE {table_name}.modified IS DISTINCT FROM EXCLUDED.modified"
+
+    def insert_data(self, table_name: str, fields: List[str], rows: List[tuple], upsert: bool = False):
         """
-        Inserts data into the table in PostgreSQL.
+        Inserts data into the table in PostgreSQL. The transaction is committed by the caller.
 
         Args:
             table_name (str): Name of the table in the database.
-            data (List[Type]): List of instances of the dataclass.
+            fields (List[str]): Names of the columns, in the order of the values in the rows.
+            rows (List[tuple]): Rows to insert.
+            upsert (bool): Whether to update the rows that already exist.
         """
-        if not data:
+        if not rows:
             return
 
-        fields = data[0].__dict__.keys()
         values_placeholder = ", ".join(["%s"] * len(fields))
-        query = f"INSERT INTO content.{table_name} ({', '.join(fields)}) VALUES ({values_placeholder}) " \
-                f"ON CONFLICT (id) DO NOTHING"
+        query = f"INSERT INTO content.{table_name} AS {table_name} ({', '.join(fields)}) VALUES ({values_placeholder}) " \
+                f"{self.conflict_clause(table_name, fields, upsert)}"
 
-        try:
-            for i in range(0, len(data), self.batch_size):
-                batch = data[i:i + self.batch_size]
-                batch_as_tuples = [astuple(item) for item in batch]
-                self.postgres_cursor.executemany(query, batch_as_tuples)
-            self.postgres_conn.commit()
-        except Exception as e:
-            logger.error(f"Error inserting data into {table_name}: {e}")
-            self.postgres_conn.rollback()
+        # The tuned batch size of the table, not the initial one
+        batch_size = self.get_batch_size(table_name)
+        for i in range(0, len(rows), batch_size):
+            self.postgres_cursor.executemany(query, rows[i:i + batch_size])
+
+    def copy_data(self, table_name: str, fields: List[str], rows: List[tuple], upsert: bool = False):
+        """
+        Loads data into the table in PostgreSQL with a binary COPY.
+
+        The rows are streamed into a temporary staging table and then merged into
+        the target table with a single INSERT ... SELECT, so conflicts are still
+        resolved by ON CONFLICT. The transaction is committed by the caller.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            fields (List[str]): Names of the columns, in the order of the values in the rows.
+            rows (List[tuple]): Rows to load.
+            upsert (bool): Whether to update the rows that already exist.
+        """
+        if not rows:
+            return
+
+        columns = ", ".join(fields)
+        column_types = self.get_column_types(table_name)
+        staging_table = f"{table_name}_staging"
+
+        # Rows of the staging table are dropped on every commit
+        self.postgres_cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {staging_table} "
+            f"(LIKE content.{table_name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        with self.postgres_cursor.copy(f"COPY {staging_table} ({columns}) FROM STDIN (FORMAT BINARY)") as copy:
+            copy.set_types([column_types[field] for field in fields])
+            for row in rows:
+                copy.write_row(row)
+        self.postgres_cursor.execute(
+            f"INSERT INTO content.{table_name} AS {table_name} ({columns}) SELECT {columns} FROM {staging_table} "
+            f"{self.conflict_clause(table_name, fields, upsert)}"
+        )
+
+    def load_data(self, table_name: str, fields: List[str], rows: List[tuple], upsert: bool = False):
+        """
+        Loads data into the table in PostgreSQL with the selected loader.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            fields (List[str]): Names of the columns, in the order of the values in the rows.
+            rows (List[tuple]): Rows to load.
+            upsert (bool): Whether to update the rows that already exist.
+        """
+        if self.loader == "copy":
+            self.copy_data(table_name, fields, rows, upsert)
+        else:
+            self.insert_data(table_name, fields, rows, upsert)
+
+    def get_column_types(self, table_name: str) -> Dict[str, str]:
+        """
+        Returns the PostgreSQL types of the table columns, required by the binary COPY.
+
+        Args:
+            table_name (str): Name of the table in the database.
+
+        Returns:
+            Dict[str, str]: Mapping of the column name to its type name.
+        """
+        if table_name not in self._column_types:
+            self.postgres_cursor.execute(
+                "SELECT attname AS column_name, atttypid::regtype::text AS type_name "
+                "FROM pg_attribute WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped",
+                [f"content.{table_name}"],
+            )
+            self._column_types[table_name] = {
+                row["column_name"]: row["type_name"] for row in self.postgres_cursor.fetchall()
+            }
+        return self._column_types[table_name]
 
     def transform_data(self, table_name: str, model_cls: Type) -> Generator[List[Type], None, None]:
         """
@@ -71,14 +341,123 @@ class DataTransfer:
             Generator[List[Type], None, None]: List of instances of the dataclass.
         """
         for batch in self.extract_data(table_name):
-            yield [
-                model_cls(**{
-                    key: (self.normalize_datetime(value) if key in ["created", "modified"] else value)
-                    for key, value in self.map_fields(dict(model_item), model_cls).items()
-                })
-                for model_item in batch
-            ]
-                
+            yield self.transform_batch(batch, model_cls)
+
+    def transform_batch(self, batch: List[tuple], model_cls: Type) -> List[Type]:
+        """
+        Transforms the rows extracted from SQLite into instances of the dataclass.
+
+        Args:
+            batch (List[tuple]): List of rows from the table, as returned by the last extraction.
+            model_cls (Type): Class of the dataclass.
+
+        Returns:
+            List[Type]: List of instances of the dataclass.
+        """
+        source_columns = self.get_source_columns()
+        return [
+            model_cls(**{
+                key: (self.normalize_datetime(value) if key in ["created", "modified"] else value)
+                for key, value in self.map_fields(dict(zip(source_columns, model_item)), model_cls).items()
+                if key != ROWID_COLUMN
+            })
+            for model_item in batch
+        ]
+
+    def get_cursor_columns(self) -> List[str]:
+        """ Returns the names of the columns of the last query of the SQLite cursor. """
+        return [description[0] for description in self.sqlite_cursor.description]
+
+    def get_source_columns(self) -> List[str]:
+        """ Returns the names of the columns of the last extraction from SQLite. """
+        return self.source_columns
+
+    def get_row_plan(self, model_cls: Type, source_columns: Sequence[str]) -> RowPlan:
+        """
+        Returns the precompiled conversion plan of the rows, compiled once per table.
+
+        Args:
+            model_cls (Type): Class of the dataclass.
+            source_columns (Sequence[str]): Names of the columns of the SQLite rows.
+
+        Returns:
+            RowPlan: Conversion plan of the rows.
+        """
+        key = (model_cls, tuple(source_columns))
+        if key not in self._row_plans:
+            self._row_plans[key] = RowPlan(model_cls, source_columns)
+        return self._row_plans[key]
+
+    def convert_batch(self, batch: List[tuple], model_cls: Type) -> List[tuple]:
+        """
+        Converts the rows extracted from SQLite into tuples ready for the loader.
+
+        The fast transformation converts the rows with a precompiled plan; the validating
+        one builds instances of the dataclass first.
+
+        Args:
+            batch (List[tuple]): List of rows from the table, as returned by the last extraction.
+            model_cls (Type): Class of the dataclass.
+
+        Returns:
+            List[tuple]: Rows ordered as the fields of the dataclass.
+        """
+        if self.transform == "fast":
+            return self.get_row_plan(model_cls, self.get_source_columns()).convert(batch)
+
+        as_tuple = attrgetter(*model_cls.__dataclass_fields__)
+        return [as_tuple(item) for item in self.transform_batch(batch, model_cls)]
+
+    def process_batches(self, table_name: str, model_cls: Type, batches: Iterable[List[tuple]], load_batch: Callable[[List[tuple], List[tuple]], None]) -> int:
+        """
+        Converts the extracted batches and passes them to the loader.
+
+        Without a pipeline every batch is read, converted and loaded in turn. With a
+        pipeline the three stages overlap and the loader is called from this thread,
+        which holds the PostgreSQL connection.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            model_cls (Type): Class of the dataclass.
+            batches (Iterable[List[tuple]]): Batches extracted from SQLite.
+            load_batch (Callable[[List[tuple], List[tuple]], None]): Loads and commits
+                the converted rows of an extracted batch.
+
+        Returns:
+            int: Number of loaded rows.
+        """
+        rows = 0
+
+        def load(batch: List[tuple], data: List[tuple]):
+            nonlocal rows
+            started = time.perf_counter()
+            load_batch(batch, data)
+            batcher = self.batchers.get(table_name)
+            if batcher:
+                batcher.record(len(data), estimate_batch_bytes(batch), time.perf_counter() - started)
+            rows += len(data)
+
+        if self.pipeline is None:
+            for batch in batches:
+                load(batch, self.convert_batch(batch, model_cls))
+            return rows
+
+        if self.pipeline.processes:
+            def transform(batch: List[tuple]):
+                plan = self.get_row_plan(model_cls, self.get_source_columns())
+                return self.pipeline.submit(plan.convert, batch)
+        else:
+            def transform(batch: List[tuple]):
+                return self.convert_batch(batch, model_cls)
+
+        stats = self.pipeline.run(batches, transform, load)
+        logger.info(
+            f"Pipeline of {table_name}: {stats.batches} batches in {stats.wall_seconds:.2f}s, "
+            f"read {stats.read_seconds:.2f}s, transform {stats.transform_seconds:.2f}s, "
+            f"load {stats.load_seconds:.2f}s (slowest stage: {stats.slowest_stage})"
+        )
+        return rows
+
     def map_fields(self, data: dict, model_cls: Type) -> dict:
         """
         Maps the fields from the extracted data to the fields of the dataclass.
@@ -93,6 +472,82 @@ class DataTransfer:
         field_mapping = getattr(model_cls, "field_mapping", {})
         return {field_mapping.get(key, key): value for key, value in data.items()}
 
+    def get_watermark_column(self, model_cls: Type) -> str:
+        """
+        Returns the SQLite column that tracks the changes of the rows.
+
+        Args:
+            model_cls (Type): Class of the dataclass.
+
+        Returns:
+            str: Source column mapped to modified, or to created for the rows that never change.
+        """
+        field_mapping = getattr(model_cls, "field_mapping", {})
+        source_columns = {field: column for column, field in field_mapping.items()}
+        return source_columns.get("modified") or source_columns.get("created", "created")
+
+    def get_max_watermark(self, table_name: str, model_cls: Type) -> Tuple[Optional[str], int]:
+        """
+        Returns the high-water mark of the whole table in SQLite.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            model_cls (Type): Class of the dataclass.
+
+        Returns:
+            Tuple[Optional[str], int]: Greatest value of the change tracking column
+                and the greatest rowid among the rows with that value.
+        """
+        column = self.get_watermark_column(model_cls)
+        self.sqlite_cursor.execute(f"SELECT {column}, rowid FROM {table_name} ORDER BY {column} DESC, rowid DESC LIMIT 1")
+        row = self.sqlite_cursor.fetchone()
+        return (row[0], row[1]) if row else (None, 0)
+
+    def delete_missing_rows(self, table_name: str, model_cls: Type, returning: Sequence[str] = ("id",)) -> List[dict]:
+        """
+        Deletes the rows that no longer exist in SQLite from the table in PostgreSQL.
+
+        The identifiers are first compared by the bucketed digests of the verifier, so
+        they are only copied to PostgreSQL when some bucket differs. Comparing the counts
+        would miss a row deleted and created again with a new id, which the unique
+        constraints keep out of PostgreSQL while the row with the old id stays there.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            model_cls (Type): Class of the dataclass.
+            returning (Sequence[str]): Columns of the deleted rows to return.
+
+        Returns:
+            List[dict]: Returned columns of the deleted rows.
+        """
+        verifier = TransferVerifier(self.sqlite_cursor, self.postgres_cursor, batch_size=self.batch_size)
+        id_columns = [column for column in verifier.get_columns(table_name, model_cls) if column.name == "id"]
+        if verifier.sqlite_summaries(table_name, id_columns) == verifier.postgres_summaries(table_name, id_columns):
+            return []
+
+        ids_table = f"{table_name}_source_ids"
+        try:
+            self.postgres_cursor.execute(f"CREATE TEMP TABLE {ids_table} (id UUID PRIMARY KEY) ON COMMIT DROP")
+            self.sqlite_cursor.execute(f"SELECT id FROM {table_name}")
+            with self.postgres_cursor.copy(f"COPY {ids_table} (id) FROM STDIN") as copy:
+                while ids := self.sqlite_cursor.fetchmany(self.batch_size):
+                    for row in ids:
+                        copy.write_row(row)
+            self.postgres_cursor.execute(
+                f"DELETE FROM content.{table_name} AS t "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {ids_table} s WHERE s.id = t.id) "
+                f"RETURNING {', '.join(f't.{column}' for column in returning)}"
+            )
+            deleted = self.postgres_cursor.fetchall()
+            self.postgres_conn.commit()
+        except Exception as e:
+            logger.error(f"Error deleting missing rows from {table_name}: {e}")
+            self.postgres_conn.rollback()
+            raise
+
+        logger.info(f"Deleted {len(deleted)} rows missing in SQLite from {table_name}")
+        return deleted
+
     def truncate_table(self, table_name: str):
         """
         Truncates the table in PostgreSQL.
@@ -118,58 +573,205 @@ class DataTransfer:
             value = datetime.fromisoformat(value.replace("Z", "+00:00"))
         if value.tzinfo is None:
             # Assume that the datetime is in UTC
-            value = value.replace(tzinfo=ZoneInfo("UTC"))
+            value = value.replace(tzinfo=UTC)
         
-        return value.astimezone(ZoneInfo("UTC"))
+        return value.astimezone(UTC)
 
     def test_transfer(self, table_name: str, model_cls: Type):
         """
-        Tests the data transfer by comparing the data in SQLite and PostgreSQL.
+        Tests the data transfer by comparing digests of the data in SQLite and PostgreSQL.
 
         Args:
             table_name (str): Name of the table in the database.
             model_cls (Type): Class of the dataclass.
         """
-        self.sqlite_cursor.execute(f"SELECT * FROM {table_name}")
-        while batch := self.sqlite_cursor.fetchmany(self.batch_size):
-            original_data = [
-                model_cls(**{
-                    key: (self.normalize_datetime(value) if key in ["created", "modified"] else value)
-                    for key, value in self.map_fields(dict(item), model_cls).items()
-                })
-                for item in batch
-            ]
-            ids = [item.id for item in original_data]
-
-            self.postgres_cursor.execute(f"SELECT * FROM content.{table_name} WHERE id = ANY(%s)", [ids])
-            transferred_data = [
-                model_cls(**{
-                    key: (self.normalize_datetime(value) if key in ["created", "modified"] else value)
-                    for key, value in self.map_fields(item, model_cls).items()
-                })
-                for item in self.postgres_cursor.fetchall()
-            ]
-
-            for original, transferred in zip(original_data, transferred_data):
-                if original != transferred:
-                    print("Mismatch found:")
-                    print(f"Original: {original}")
-                    print(f"Transferred: {transferred}")
-
-            assert len(original_data) == len(transferred_data), "Length mismatch"
-            assert original_data == transferred_data, "Data mismatch"
-
-    def transfer_table(self, table_name: str, model_cls: Type):
+        verifier = TransferVerifier(self.sqlite_cursor, self.postgres_cursor, batch_size=self.batch_size)
+        mismatches = verifier.verify(table_name, model_cls)
+
+        for mismatch in mismatches[:100]:
+            logger.error(f"Mismatch found in {table_name}: {mismatch}")
+
+        assert not mismatches, f"Data mismatch in {table_name}: {len(mismatches)} rows"
+
+    def transfer_table(self, table_name: str, model_cls: Type, truncate: bool = True, resume: bool = False) -> TransferStats:
         """
         Transfers data from SQLite to PostgreSQL for the specified table.
 
+        Every batch is committed together with its checkpoint, so a resumed
+        transfer continues right after the last committed batch. With a parallel
+        reader the checkpoint is the end of the rows loaded without gaps, and the
+        rows loaded after it are skipped when they are read again.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            model_cls (Type): Class of the dataclass.
+            truncate (bool): Whether to truncate the table before the transfer. Ignored when resuming.
+            resume (bool): Whether to continue from the saved checkpoint.
+
+        Returns:
+            TransferStats: Number of transferred rows and elapsed time.
+        """
+        logger.info(f"Transferring data for table: {table_name} (loader: {self.loader})")
+
+        started = time.perf_counter()
+        position = 0
+
+        if resume and self.checkpoints:
+            checkpoint = self.checkpoints.get(table_name)
+            if checkpoint.completed:
+                logger.info(f"Table {table_name} is already transferred, skipping")
+                return TransferStats(table_name, 0, 0.0)
+            position = checkpoint.position
+            logger.info(f"Resuming transfer of {table_name} after row {position}")
+        elif truncate:
+            self.truncate_table(table_name)
+            if self.checkpoints:
+                self.checkpoints.reset([table_name])
+            self.postgres_conn.commit()
+
+        fields = list(model_cls.__dataclass_fields__)
+
+        def load_batch(batch: List[tuple], data: List[tuple]):
+            nonlocal position
+            loaded = self.reader.resume_position(batch) if self.reader else batch[-1][0]
+            try:
+                self.load_data(table_name, fields, data)
+                if self.checkpoints:
+                    self.checkpoints.save(table_name, loaded)
+                self.postgres_conn.commit()
+            except Exception as e:
+                logger.error(f"Error loading data into {table_name} after row {position}: {e}")
+                self.postgres_conn.rollback()
+                raise
+            position = loaded
+
+        self.start_batching(table_name)
+        rows = self.process_batches(table_name, model_cls, self.extract_data(table_name, start_after=position), load_batch)
+        batch_size = self.finish_batching(table_name)
+
+        if self.checkpoints:
+            self.checkpoints.save(table_name, position, completed=True)
+            # The next incremental sync starts where the full reload ended
+            self.checkpoints.save_watermark(table_name, *self.get_max_watermark(table_name, model_cls))
+        self.postgres_conn.commit()
+
+        stats = TransferStats(table_name, rows, time.perf_counter() - started, batch_size)
+        logger.info(
+            f"Transferred {stats.rows} rows into {table_name} in {stats.seconds:.2f}s "
+            f"({stats.rows_per_second:.0f} rows/sec)"
+        )
+        return stats
+
+    def upsert_changes(self, table_name: str, model_cls: Type, watermark: Optional[str], position: int = 0, changed: Optional[Dict[str, Set]] = None) -> int:
+        """
+        Upserts the rows changed since the high-water mark and moves the mark forward.
+
+        Every batch is committed together with the watermark of its last row.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            model_cls (Type): Class of the dataclass.
+            watermark (Optional[str]): High-water mark of the previous run.
+            position (int): Rowid of the last row synchronized with the watermark value.
+            changed (Optional[Dict[str, Set]]): Collects the values of the CHANGE_KEYS columns of the upserted rows.
+
+        Returns:
+            int: Number of upserted rows.
+        """
+        column = self.get_watermark_column(model_cls)
+        fields = list(model_cls.__dataclass_fields__)
+        keys = {key: fields.index(key) for key in CHANGE_KEYS if key in fields}
+
+        def load_batch(batch: List[tuple], data: List[tuple]):
+            nonlocal watermark
+            last_value = batch[-1][self.get_source_columns().index(column)]
+            try:
+                self.load_data(table_name, fields, data, upsert=True)
+                self.checkpoints.save_watermark(table_name, last_value, batch[-1][0])
+                self.postgres_conn.commit()
+            except Exception as e:
+                logger.error(f"Error upserting data into {table_name} after {column} {watermark}: {e}")
+                self.postgres_conn.rollback()
+                raise
+            watermark = last_value
+            if changed is not None:
+                for key, index in keys.items():
+                    changed.setdefault(key, set()).update(row[index] for row in data)
+
+        return self.process_batches(table_name, model_cls, self.extract_changes(table_name, column, watermark, position), load_batch)
+
+    def upsert_rows(self, table_name: str, model_cls: Type, columns: Sequence[str], keys: List[tuple]) -> int:
+        """
+        Upserts the rows with the given values of the columns without moving the high-water mark.
+
         Args:
             table_name (str): Name of the table in the database.
             model_cls (Type): Class of the dataclass.
+            columns (Sequence[str]): Columns that identify the rows.
+            keys (List[tuple]): Values of the columns of the upserted rows.
+
+        Returns:
+            int: Number of upserted rows.
         """
-        logger.info(f"Transferring data for table: {table_name}")
+        fields = list(model_cls.__dataclass_fields__)
+
+        def load_batch(batch: List[tuple], data: List[tuple]):
+            try:
+                self.load_data(table_name, fields, data, upsert=True)
+                self.postgres_conn.commit()
+            except Exception as e:
+                logger.error(f"Error upserting data into {table_name} by {', '.join(columns)}: {e}")
+                self.postgres_conn.rollback()
+                raise
+
+        return self.process_batches(table_name, model_cls, self.extract_rows(table_name, columns, keys), load_batch)
+
+    def sync_table(self, table_name: str, model_cls: Type) -> TransferStats:
+        """
+        Synchronizes the table with SQLite incrementally.
+
+        Only the rows changed since the previous run are upserted. Link tables,
+        whose rows are never modified, are also checked for deleted rows. The keys
+        of the upserted and deleted rows are returned with the statistics.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            model_cls (Type): Class of the dataclass.
+
+        Returns:
+            TransferStats: Number of upserted and deleted rows and elapsed time.
+        """
+        if self.checkpoints is None:
+            raise ValueError("Incremental synchronization requires a checkpoint store")
+
+        checkpoint = self.checkpoints.get(table_name)
+        logger.info(f"Synchronizing table: {table_name} since {checkpoint.watermark} (loader: {self.loader})")
+
+        started = time.perf_counter()
+        changed: Dict[str, Set] = {}
+        self.start_batching(table_name)
+        rows = self.upsert_changes(table_name, model_cls, checkpoint.watermark, checkpoint.watermark_position, changed)
+
+        fields = model_cls.__dataclass_fields__
+        if "modified" not in fields:
+            keys = [key for key in CHANGE_KEYS if key in fields]
+            unique_fields = getattr(model_cls, "unique_fields", ())
+            deleted = self.delete_missing_rows(table_name, model_cls, list(dict.fromkeys([*keys, *unique_fields])))
+            if deleted and unique_fields:
+                # Rows re-created in SQLite were skipped by the unique constraints while the
+                # deleted rows held their values; they are already counted by the upsert above
+                self.upsert_rows(table_name, model_cls, unique_fields, [tuple(row[column] for column in unique_fields) for row in deleted])
+            for row in deleted:
+                for key in keys:
+                    changed.setdefault(key, set()).add(row[key])
+            rows += len(deleted)
 
-        self.truncate_table(table_name)
+        batch_size = self.finish_batching(table_name)
+        self.postgres_conn.commit()
 
-        for batch in self.transform_data(table_name, model_cls):
-            self.insert_data(table_name, batch)
+        stats = TransferStats(table_name, rows, time.perf_counter() - started, batch_size, changed)
+        logger.info(
+            f"Synchronized {stats.rows} rows of {table_name} in {stats.seconds:.2f}s "
+            f"({stats.rows_per_second:.0f} rows/sec)"
+        )
+        return stats
@@ -3,12 +3,55 @@
 import sqlite3
 import psycopg
 from contextlib import contextmanager
+from pathlib import Path
 from typing import Generator
 
+# Size of the source database mapped into memory, in bytes
+SOURCE_MMAP_SIZE = 8 * 1024 * 1024 * 1024
+# Size of the page cache of the source database, in KiB
+SOURCE_CACHE_SIZE = 512 * 1024
+
+@contextmanager
+def sqlite_connection(db_path: str, check_same_thread: bool = True) -> Generator[sqlite3.Connection, None, None]:
+    """ Context manager for SQLite connection. Pass check_same_thread=False to read it from another thread. """
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def connect_sqlite_source(db_path: str, mmap_size: int = SOURCE_MMAP_SIZE, cache_size: int = SOURCE_CACHE_SIZE, check_same_thread: bool = True, immutable: bool = False) -> sqlite3.Connection:
+    """
+    Opens the source database for reading only.
+
+    Pages are read through the memory map and a large page cache, and rows are plain
+    tuples. In the immutable mode SQLite takes no locks and neither looks for a journal
+    nor notices changes, which is only safe for a file nothing writes to, such as the
+    source of an offline full load. Otherwise the reads take shared locks and see
+    consistent snapshots while the source is being written.
+
+    Args:
+        db_path (str): Path to SQLite database.
+        mmap_size (int): Size of the database mapped into memory, in bytes.
+        cache_size (int): Size of the page cache, in KiB.
+        check_same_thread (bool): Whether only the creating thread may use the connection.
+        immutable (bool): Whether the file is known not to change while it is open.
+
+    Returns:
+        sqlite3.Connection: Read-only connection.
+    """
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro{'&immutable=1' if immutable else ''}"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    conn.execute(f"PRAGMA cache_size = -{int(cache_size)}")
+    conn.execute("PRAGMA query_only = ON")
+    conn.row_factory = None
+    return conn
+
 @contextmanager
-def sqlite_connection(db_path: str) -> Generator[sqlite3.Connection, None, None]:
-    """ Context manager for SQLite connection. """
-    conn = sqlite3.connect(db_path)
+def sqlite_source_connection(db_path: str, mmap_size: int = SOURCE_MMAP_SIZE, cache_size: int = SOURCE_CACHE_SIZE, check_same_thread: bool = True, immutable: bool = False) -> Generator[sqlite3.Connection, None, None]:
+    """ Context manager for the read-only connection to the source database. """
+    conn = connect_sqlite_source(db_path, mmap_size, cache_size, check_same_thread, immutable)
     try:
         yield conn
     finally:
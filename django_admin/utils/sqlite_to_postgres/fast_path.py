@@ -0,0 +1,124 @@
+# utils/sqlite_to_postgres/fast_path.py
+
+import typing
+from dataclasses import MISSING, fields
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple, Type
+from uuid import UUID
+
+UTC = timezone.utc
+
+
+@lru_cache(maxsize=65536)
+def parse_uuid(value: str) -> UUID:
+    """ Parses a UUID; foreign keys repeat a lot, so the results are cached. """
+    return UUID(value)
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value: str) -> datetime:
+    """ Parses a datetime string and normalizes it to UTC; timestamps repeat a lot, so the results are cached. """
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        # Assume that the datetime is in UTC
+        return parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC)
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: str) -> date:
+    """ Parses a date string. """
+    return date.fromisoformat(value[:10])
+
+
+def to_datetime(value) -> datetime:
+    """ Normalizes a datetime value that SQLite adapters already parsed to UTC. """
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+# Converters of the field values by their type: for strings, as SQLite returns them, and for parsed values
+CONVERTERS = {
+    UUID: (parse_uuid, lambda value: value),
+    datetime: (parse_datetime, to_datetime),
+    date: (parse_date, lambda value: value),
+}
+
+
+class RowPlan:
+    """
+    Precompiled conversion of the SQLite rows of a table into tuples for the loader.
+
+    The plan maps every field of the dataclass to the position of its source column
+    once, and compiles a single function that builds the output tuple straight from
+    the SQLite row, without intermediate dicts or dataclass instances.
+    """
+    def __init__(self, model_cls: Type, source_columns: Sequence[str]):
+        self.model_cls = model_cls
+        self.source_columns = list(source_columns)
+        self.fields = [field.name for field in fields(model_cls)]
+        self.convert_row = self.compile()
+
+    def __getstate__(self):
+        # The compiled function cannot be pickled, it is compiled again after unpickling
+        return {"model_cls": self.model_cls, "source_columns": self.source_columns}
+
+    def __setstate__(self, state):
+        self.__init__(state["model_cls"], state["source_columns"])
+
+    def get_converter(self, name: str, field_type: type) -> Optional[Tuple[Callable, Callable]]:
+        """ Returns the converters of the field value from a string and from a parsed value, or None if the value is used as is. """
+        if field_type is UUID and name == "id":
+            # Primary keys are unique, caching them would only evict the foreign keys
+            return UUID, CONVERTERS[UUID][1]
+        return CONVERTERS.get(field_type)
+
+    def compile(self) -> Callable[[Sequence], tuple]:
+        """ Compiles the function that converts a SQLite row into a tuple. """
+        field_mapping = getattr(self.model_cls, "field_mapping", {})
+        positions = {field_mapping.get(column, column): index for index, column in enumerate(self.source_columns)}
+
+        namespace = {}
+        expressions = []
+        for field in fields(self.model_cls):
+            if field.name not in positions:
+                if field.default is MISSING and field.default_factory is MISSING:
+                    raise ValueError(f"Column of the field {field.name} is missing in SQLite")
+                # The column is missing in SQLite, the default of the dataclass is used
+                default = field.default_factory() if field.default is MISSING else field.default
+                namespace[f"default_{field.name}"] = default
+                expressions.append(f"default_{field.name}")
+                continue
+
+            value = f"column_{positions[field.name]}"
+            arguments = typing.get_args(field.type)
+            optional = type(None) in arguments
+            field_type = next((arg for arg in arguments if arg is not type(None)), field.type)
+            converters = self.get_converter(field.name, field_type)
+            if converters is None:
+                expressions.append(value)
+                continue
+
+            # SQLite returns strings unless a converter of the connection parsed the value already
+            namespace[f"parse_{field.name}"], namespace[f"convert_{field.name}"] = converters
+            expression = f"(parse_{field.name}({value}) if {value}.__class__ is str else convert_{field.name}({value}))"
+            if optional or field.default is None:
+                expression = f"({expression} if {value} is not None else None)"
+            expressions.append(expression)
+
+        # The row is unpacked into locals once, so every column is read from the row a single time
+        columns = ", ".join(f"column_{index}" for index in range(len(self.source_columns)))
+        exec(f"def convert_row(row):\n    {columns}, = row\n    return ({', '.join(expressions)},)", namespace)
+        return namespace["convert_row"]
+
+    def convert(self, rows: Sequence[Sequence]) -> List[tuple]:
+        """
+        Converts the SQLite rows into tuples ordered as the fields of the dataclass.
+
+        Args:
+            rows (Sequence[Sequence]): Rows from SQLite.
+
+        Returns:
+            List[tuple]: Rows ready for the loader.
+        """
+        return list(map(self.convert_row, rows))
@@ -59,6 +59,8 @@ class FilmWork:
     def __post_init__(self):
         if isinstance(self.id, str):
             self.id = UUID(self.id)
+        if isinstance(self.creation_date, str):
+            self.creation_date = date.fromisoformat(self.creation_date)
 
 @dataclass
 class GenreFilmWork:
@@ -70,6 +72,7 @@ class GenreFilmWork:
     field_mapping = {
         "created_at": "created",
     }
+    unique_fields = ("film_work_id", "genre_id")
 
     def __post_init__(self):
         if isinstance(self.id, str):
@@ -90,6 +93,7 @@ class PersonFilmWork:
     field_mapping = {
         "created_at": "created",
     }
+    unique_fields = ("film_work_id", "person_id", "role")
 
     def __post_init__(self):
         if isinstance(self.id, str):
@@ -0,0 +1,243 @@
+# utils/sqlite_to_postgres/pipeline.py
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+# Size assumed for a value that is not a string or bytes, in bytes
+VALUE_SIZE = 16
+# Number of rows sampled to estimate the size of a batch
+SAMPLE_ROWS = 8
+
+
+def estimate_batch_bytes(batch: Sequence[Sequence]) -> int:
+    """
+    Estimates the size of a batch of rows from a sample of its rows.
+
+    Args:
+        batch (Sequence[Sequence]): Rows of the batch.
+
+    Returns:
+        int: Approximate size of the batch in bytes.
+    """
+    if not batch:
+        return 0
+    step = max(1, len(batch) // SAMPLE_ROWS)
+    sample = batch[::step]
+    sampled = sum(
+        len(value) if isinstance(value, (str, bytes)) else VALUE_SIZE
+        for row in sample
+        for value in row
+    )
+    return sampled * len(batch) // len(sample)
+
+
+class PipelineClosed(Exception):
+    """ Raised when a stage puts an item into a queue that was closed by another stage. """
+
+
+class BoundedQueue:
+    """
+    Queue between two stages of the pipeline, bounded by the number of items and by their size.
+
+    A producer waits while the queue is full, so a slow consumer slows down the
+    stages before it instead of letting the batches pile up in memory. A single
+    item larger than the byte limit is still accepted when the queue is empty.
+    """
+    def __init__(self, max_items: int, max_bytes: int):
+        self.max_items = max(1, max_items)
+        self.max_bytes = max_bytes
+        self.items = deque()
+        self.bytes = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def put(self, item: Any, size: int):
+        """ Adds the item, waiting while the queue is full. """
+        with self.condition:
+            while not self.closed and self.items and (len(self.items) >= self.max_items or self.bytes + size > self.max_bytes):
+                self.condition.wait()
+            if self.closed:
+                raise PipelineClosed()
+            self.items.append((item, size))
+            self.bytes += size
+            self.condition.notify_all()
+
+    def close(self, discard: bool = False):
+        """ Closes the queue; the items already queued are consumed unless they are discarded. """
+        with self.condition:
+            self.closed = True
+            if discard:
+                self.items.clear()
+                self.bytes = 0
+            self.condition.notify_all()
+
+    def __iter__(self) -> Iterator[Any]:
+        """ Yields the items until the queue is closed and empty. """
+        while True:
+            with self.condition:
+                while not self.items and not self.closed:
+                    self.condition.wait()
+                if not self.items:
+                    return
+                item, size = self.items.popleft()
+                self.bytes -= size
+                self.condition.notify_all()
+            yield item
+
+
+@dataclass
+class PipelineStats:
+    """
+    Time spent by every stage of the pipeline. The wall-clock time of a
+    pipelined run approaches the time of the slowest stage.
+    """
+    read_seconds: float = 0.0
+    transform_seconds: float = 0.0
+    load_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    batches: int = 0
+
+    @property
+    def slowest_stage(self) -> str:
+        stages = {"read": self.read_seconds, "transform": self.transform_seconds, "load": self.load_seconds}
+        return max(stages, key=stages.get)
+
+
+@dataclass
+class Pipeline:
+    """
+    Runs the extraction, the transformation and the loading of the batches at the same time.
+
+    The batches are read by a reader thread, converted by a transform thread and
+    loaded by the calling thread, which holds the PostgreSQL connection. The stages
+    are connected by queues bounded by the number of batches and by their size.
+    With processes the transform thread hands the batches over to a process pool,
+    so several batches are converted in parallel and loaded in their original order.
+    """
+    queue_depth: int = 4
+    queue_bytes: int = 64 * 1024 * 1024
+    processes: int = 0
+    executor: Optional[ProcessPoolExecutor] = field(default=None, init=False, repr=False, compare=False)
+    # The pipeline is shared by the threads of the table workers, which create the pool on first use
+    executor_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __getstate__(self):
+        # The process pool stays with the process that created it
+        state = {**self.__dict__, "executor": None}
+        del state["executor_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, executor_lock=threading.Lock())
+
+    def submit(self, function: Callable, *args) -> Future:
+        """
+        Runs the function in the process pool of the transformation.
+
+        Args:
+            function (Callable): Picklable function.
+            *args: Picklable arguments of the function.
+
+        Returns:
+            Future: Result of the function, resolved by the loading stage.
+        """
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.processes)
+            executor = self.executor
+        return executor.submit(function, *args)
+
+    def close(self):
+        """ Shuts down the process pool of the transformation. """
+        with self.executor_lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self, batches: Iterable[List], transform: Callable[[List], Any], load: Callable[[List, List[tuple]], None]) -> PipelineStats:
+        """
+        Passes the batches through the transformation into the loader.
+
+        Args:
+            batches (Iterable[List]): Batches extracted from SQLite; iterated by the reader thread.
+            transform (Callable[[List], Any]): Converts a batch into the loader rows,
+                or returns a future of them.
+            load (Callable[[List, List[tuple]], None]): Loads the converted rows of a batch;
+                called by the calling thread with the extracted batch and its rows.
+
+        Returns:
+            PipelineStats: Time spent by every stage.
+
+        Raises:
+            Exception: The first error raised by any of the stages.
+        """
+        stats = PipelineStats()
+        extracted = BoundedQueue(self.queue_depth, self.queue_bytes)
+        transformed = BoundedQueue(self.queue_depth, self.queue_bytes)
+        errors = []
+
+        def fail(error: Exception):
+            errors.append(error)
+            extracted.close(discard=True)
+            transformed.close(discard=True)
+
+        def read():
+            iterator = iter(batches)
+            try:
+                while True:
+                    started = time.perf_counter()
+                    batch = next(iterator, None)
+                    stats.read_seconds += time.perf_counter() - started
+                    if batch is None:
+                        break
+                    extracted.put(batch, estimate_batch_bytes(batch))
+                extracted.close()
+            except PipelineClosed:
+                pass
+            except Exception as e:
+                fail(e)
+
+        def convert():
+            try:
+                for batch in extracted:
+                    started = time.perf_counter()
+                    data = transform(batch)
+                    stats.transform_seconds += time.perf_counter() - started
+                    transformed.put((batch, data), estimate_batch_bytes(batch))
+                transformed.close()
+            except PipelineClosed:
+                pass
+            except Exception as e:
+                fail(e)
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=read, name="pipeline-reader", daemon=True),
+            threading.Thread(target=convert, name="pipeline-transform", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for batch, data in transformed:
+                if isinstance(data, Future):
+                    data = data.result()
+                load_started = time.perf_counter()
+                load(batch, data)
+                stats.load_seconds += time.perf_counter() - load_started
+                stats.batches += 1
+        except Exception as e:
+            fail(e)
+        finally:
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+        stats.wall_seconds = time.perf_counter() - started
+        return stats
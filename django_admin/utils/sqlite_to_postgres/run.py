@@ -1,34 +1,157 @@
 # utils/sqlite_to_postgres/run.py
 
-import sqlite3
 from contextlib import closing
+from functools import partial
+from typing import List, Optional
 from psycopg.rows import dict_row
-from utils.sqlite_to_postgres.db_manager import sqlite_connection, postgres_connection
-from utils.sqlite_to_postgres.data_transfer import DataTransfer
+from utils.sqlite_to_postgres.batching import AdaptiveBatching
+from utils.sqlite_to_postgres.bulk_load import BulkLoad
+from utils.sqlite_to_postgres.checkpoint import CheckpointStore
+from utils.sqlite_to_postgres.db_manager import connect_sqlite_source, sqlite_source_connection, postgres_connection
+from utils.sqlite_to_postgres.data_transfer import DataTransfer, TransferStats, truncate_tables
+from utils.sqlite_to_postgres.pipeline import Pipeline
 from utils.sqlite_to_postgres.models import Genre, Person, FilmWork, GenreFilmWork, PersonFilmWork
+from utils.sqlite_to_postgres.source_reader import ParallelReader
+from utils.sqlite_to_postgres.scheduler import TransferScheduler, build_dependency_graph
 
-def run_migration(sqlite_db_path: str, dls_postgres: dict):
+TABLES = {
+    "genre": Genre,
+    "person": Person,
+    "film_work": FilmWork,
+    "genre_film_work": GenreFilmWork,
+    "person_film_work": PersonFilmWork,
+}
+
+
+def transfer_worker(sqlite_db_path: str, dls_postgres: dict, loader: str, batch_size: int, resume: bool, incremental: bool, transform: str, pipeline: Optional[Pipeline], batching: Optional[AdaptiveBatching], readers: int, table_name: str) -> TransferStats:
     """
-    Migrate data from SQLite to PostgreSQL with testing.
+    Transfers and tests a single table over its own SQLite and PostgreSQL connections.
+
+    In the incremental mode only the changed rows are synchronized and the whole
+    table is not tested, so the run costs as much as the changes.
 
     Args:
         sqlite_db_path (str): Path to SQLite database.
         dls_postgres (dict): DLS for PostgreSQL.
+        loader (str): Loader used to write data into PostgreSQL ("insert" or "copy").
+        batch_size (int): Number of rows read and written per batch.
+        resume (bool): Whether to continue from the saved checkpoint.
+        incremental (bool): Whether to synchronize only the rows changed since the previous run.
+        transform (str): Transformation of the rows ("fast" or "validate").
+        pipeline (Optional[Pipeline]): Pipeline overlapping the extraction, the transformation and the loading.
+        batching (Optional[AdaptiveBatching]): Settings of the adaptive batch sizing.
+        readers (int): Number of SQLite connections reading the rowid ranges of a table at the same time.
+        table_name (str): Name of the table in the database.
+
+    Returns:
+        TransferStats: Transfer statistics for the table.
     """
-    tables = [
-        ("genre", Genre),
-        ("person", Person),
-        ("film_work", FilmWork),
-        ("genre_film_work", GenreFilmWork),
-        ("person_film_work", PersonFilmWork),
-    ]
-
-    with sqlite_connection(sqlite_db_path) as sqlite_conn, postgres_connection(dls_postgres) as postgres_conn:
-        sqlite_conn.row_factory = sqlite3.Row
+    model_cls = TABLES[table_name]
+
+    # Only the source of a full reload is offline; the incremental sync reads it while it is written
+    immutable = not incremental
+    reader = ParallelReader(partial(connect_sqlite_source, sqlite_db_path, immutable=immutable), readers) if readers > 1 else None
+
+    # The pipeline reads SQLite from its reader thread
+    with sqlite_source_connection(sqlite_db_path, check_same_thread=pipeline is None, immutable=immutable) as sqlite_conn, postgres_connection(dls_postgres) as postgres_conn:
         with closing(sqlite_conn.cursor()) as sqlite_cur, closing(postgres_conn.cursor(row_factory=dict_row)) as postgres_cur:
 
-            data_transfer = DataTransfer(sqlite_cur, postgres_cur, postgres_conn)
+            data_transfer = DataTransfer(
+                sqlite_cur, postgres_cur, postgres_conn,
+                batch_size=batch_size, loader=loader, checkpoints=CheckpointStore(postgres_cur),
+                transform=transform, pipeline=pipeline, batching=batching, reader=reader,
+            )
+
+            if incremental:
+                return data_transfer.sync_table(table_name, model_cls)
+
+            # The tables are truncated by run_migration before the workers start
+            stats = data_transfer.transfer_table(table_name, model_cls, truncate=False, resume=resume)
+            data_transfer.test_transfer(table_name, model_cls)
+
+    return stats
+
+
+def run_migration(sqlite_db_path: str, dls_postgres: dict, loader: str = "insert", batch_size: int = 100, workers: int = 1, pool: str = "thread", resume: bool = False, incremental: bool = False, transform: str = "fast", pipeline: Optional[Pipeline] = None, batching: Optional[AdaptiveBatching] = None, readers: int = 1, bulk_load: Optional[BulkLoad] = None) -> List[TransferStats]:
+    """
+    Migrate data from SQLite to PostgreSQL with testing.
+
+    Tables that do not depend on each other are transferred at the same time,
+    each one by its own worker with separate connections. Every committed batch
+    is recorded in the checkpoint store, so a failed migration can be resumed
+    without truncating the tables again. The incremental mode upserts only the rows
+    changed since the high-water mark of the previous run.
+
+    In the bulk load mode the secondary indexes and constraints of the tables are
+    dropped before the load and rebuilt after it. Definitions left dropped by a failed
+    run are restored before any migration starts.
+
+    Args:
+        sqlite_db_path (str): Path to SQLite database.
+        dls_postgres (dict): DLS for PostgreSQL.
+        loader (str): Loader used to write data into PostgreSQL ("insert" or "copy").
+        batch_size (int): Number of rows read and written per batch; the initial size with adaptive batching.
+        workers (int): Number of tables transferred at the same time.
+        pool (str): Kind of the worker pool ("thread" or "process").
+        resume (bool): Whether to continue from the saved checkpoints instead of a full reload.
+        incremental (bool): Whether to synchronize only the changes instead of a full reload.
+        transform (str): Transformation of the rows: precompiled tuples ("fast") or
+            dataclass instances that validate every row ("validate").
+        pipeline (Optional[Pipeline]): Pipeline overlapping the extraction, the transformation
+            and the loading of every table; its process pool is shut down at the end.
+        batching (Optional[AdaptiveBatching]): Settings of the adaptive batch sizing. The size every
+            table settles on is saved with its checkpoint and used as the initial size of the next run.
+        readers (int): Number of SQLite connections reading the rowid ranges of a table at the same
+            time during a full reload. The source of a full reload is opened as immutable and must not
+            change during the run; an incremental sync reads it with the usual locking.
+        bulk_load (Optional[BulkLoad]): Defers the secondary indexes and constraints of a full reload.
+
+    Returns:
+        List[TransferStats]: Transfer statistics for each table.
+
+    Raises:
+        ValueError: If the bulk load is combined with the incremental mode.
+        RuntimeError: If the definitions deferred by a previous run cannot be restored.
+    """
+    if bulk_load and incremental:
+        raise ValueError("The bulk load applies to full reloads only")
+
+    # Workers of the process pool must be able to pickle the settings
+    dls_postgres = dict(dls_postgres)
+
+    with postgres_connection(dls_postgres) as postgres_conn:
+        with closing(postgres_conn.cursor(row_factory=dict_row)) as postgres_cur:
+            checkpoints = CheckpointStore(postgres_cur)
+            checkpoints.ensure_table()
+            postgres_conn.commit()
+
+            if not resume and not incremental:
+                checkpoints.reset(list(TABLES))
+                truncate_tables(postgres_cur, TABLES)
+                postgres_conn.commit()
+
+    # The foreign keys dropped by a failed bulk load must be back before the dependencies are read
+    if (bulk_load or BulkLoad(dls_postgres)).restore():
+        raise RuntimeError(f"Indexes and constraints deferred by a previous run could not be restored, see {BulkLoad.table}")
+
+    with postgres_connection(dls_postgres) as postgres_conn:
+        with closing(postgres_conn.cursor(row_factory=dict_row)) as postgres_cur:
+            dependencies = build_dependency_graph(postgres_cur, TABLES)
+
+    if bulk_load:
+        bulk_load.defer(TABLES)
+
+    scheduler = TransferScheduler(dependencies, workers=workers, pool=pool)
+    try:
+        results = scheduler.run(partial(transfer_worker, sqlite_db_path, dls_postgres, loader, batch_size, resume, incremental, transform, pipeline, batching, readers))
+        if bulk_load:
+            bulk_load.rebuild(TABLES)
+    except Exception:
+        if bulk_load:
+            bulk_load.restore()
+        raise
+    finally:
+        if pipeline:
+            pipeline.close()
 
-            for table_name, model_cls in tables:
-                data_transfer.transfer_table(table_name, model_cls)
-                data_transfer.test_transfer(table_name, model_cls)
+    return [results[table_name] for table_name in TABLES]
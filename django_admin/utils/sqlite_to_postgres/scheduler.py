@@ -0,0 +1,98 @@
+# utils/sqlite_to_postgres/scheduler.py
+
+import psycopg
+from concurrent.futures import Executor, FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Set
+from config.components.logging_config import logger
+
+# Available worker pools for the scheduler
+POOLS = ("thread", "process")
+
+
+def build_dependency_graph(postgres_cursor: psycopg.Cursor, tables: Iterable[str]) -> Dict[str, Set[str]]:
+    """
+    Builds the dependency graph of the tables from the foreign keys in PostgreSQL.
+
+    Args:
+        postgres_cursor (psycopg.Cursor): Cursor of the PostgreSQL connection.
+        tables (Iterable[str]): Names of the transferred tables.
+
+    Returns:
+        Dict[str, Set[str]]: Mapping of the table name to the names of the tables it references.
+    """
+    graph = {table_name: set() for table_name in tables}
+    postgres_cursor.execute(
+        "SELECT child.relname AS child, parent.relname AS parent "
+        "FROM pg_constraint c "
+        "JOIN pg_class child ON child.oid = c.conrelid "
+        "JOIN pg_class parent ON parent.oid = c.confrelid "
+        "WHERE c.contype = 'f' AND child.relnamespace = 'content'::regnamespace"
+    )
+    for row in postgres_cursor.fetchall():
+        child, parent = row["child"], row["parent"]
+        if child in graph and parent in graph and child != parent:
+            graph[child].add(parent)
+    return graph
+
+
+class TransferScheduler:
+    """
+    Runs the transfer of the tables in the order of their dependencies.
+
+    A table is started as soon as all the tables it references are transferred,
+    so independent tables are transferred at the same time.
+    """
+    def __init__(self, dependencies: Dict[str, Set[str]], workers: int = 1, pool: str = "thread"):
+        if pool not in POOLS:
+            raise ValueError(f"Unknown pool: {pool}. Available pools: {', '.join(POOLS)}")
+
+        self.dependencies = dependencies
+        self.workers = max(1, workers)
+        self.pool = pool
+
+    def create_executor(self) -> Executor:
+        """ Creates the pool of workers. """
+        if self.pool == "process":
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="transfer")
+
+    def run(self, task: Callable[[str], Any]) -> Dict[str, Any]:
+        """
+        Runs the task for every table once all its dependencies are completed.
+
+        Args:
+            task (Callable[[str], Any]): Function that transfers a table by its name.
+                It must be picklable when the process pool is used.
+
+        Returns:
+            Dict[str, Any]: Results of the task by the table name.
+
+        Raises:
+            ValueError: If the dependencies contain a cycle.
+        """
+        pending = {table_name: set(parents) for table_name, parents in self.dependencies.items()}
+        running = {}
+        results = {}
+
+        executor = self.create_executor()
+        try:
+            while pending or running:
+                for table_name in [name for name, parents in pending.items() if not parents]:
+                    logger.info(f"Scheduling transfer of table: {table_name}")
+                    running[executor.submit(task, table_name)] = table_name
+                    del pending[table_name]
+
+                if not running:
+                    raise ValueError(f"Cyclic dependencies between tables: {', '.join(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table_name = running.pop(future)
+                    results[table_name] = future.result()
+                    for parents in pending.values():
+                        parents.discard(table_name)
+        finally:
+            # Do not start new tables after a failure, but let the running ones finish
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return results
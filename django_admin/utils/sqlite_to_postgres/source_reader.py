@@ -0,0 +1,177 @@
+# utils/sqlite_to_postgres/source_reader.py
+
+import sqlite3
+import threading
+from bisect import bisect_left
+from contextlib import closing
+from typing import Callable, Generator, List, Optional, Tuple
+from utils.sqlite_to_postgres.pipeline import BoundedQueue, PipelineClosed, estimate_batch_bytes
+
+# Name of the SQLite rowid column added to the extracted rows
+ROWID_COLUMN = "_rowid"
+
+
+def rowid_ranges(sqlite_cursor: sqlite3.Cursor, table_name: str, parts: int, start_after: int = 0) -> List[Tuple[int, int]]:
+    """
+    Splits the rows of the table into rowid ranges of the same width.
+
+    The bounds are computed from the first and the last rowid, which SQLite reads
+    from the rowid b-tree without scanning the rows. The ranges
+    hold about the same number of rows as long as the rowids have no large gaps,
+    which is so for tables that are only appended to.
+
+    Args:
+        sqlite_cursor (sqlite3.Cursor): Cursor of the source database.
+        table_name (str): Name of the table in the database.
+        parts (int): Number of ranges.
+        start_after (int): Rowid after which the ranges start.
+
+    Returns:
+        List[Tuple[int, int]]: Ranges as (exclusive lower bound, inclusive upper bound), in rowid order.
+    """
+    # Both are single b-tree lookups: the first rowid after the start and the last one
+    sqlite_cursor.execute(f"SELECT rowid FROM {table_name} WHERE rowid > ? ORDER BY rowid LIMIT 1", (start_after,))
+    row = sqlite_cursor.fetchone()
+    if row is None:
+        return []
+    first = row[0]
+    sqlite_cursor.execute(f"SELECT max(rowid) FROM {table_name}")
+    last = sqlite_cursor.fetchone()[0]
+
+    low = first - 1
+    parts = max(1, min(parts, last - low))
+    bounds = [low + (last - low) * part // parts for part in range(parts + 1)]
+    bounds[0] = start_after
+    return list(zip(bounds, bounds[1:]))
+
+
+class RangeProgress:
+    """
+    Tracks the loaded rows of the rowid ranges read by the parallel reader.
+
+    The batches of a range are loaded in rowid order, but the ranges are interleaved,
+    so the rowid of the last loaded row is not a resume position by itself. The
+    position is the end of the loaded rows of the first range not loaded completely:
+    every row before it has been loaded.
+    """
+    def __init__(self, ranges: List[Tuple[int, int]], start_after: int):
+        self.ranges = ranges
+        self.highs = [high for _, high in ranges]
+        self.loaded = [low for low, _ in ranges]
+        # Rowid of the last row of every range whose reading has finished
+        self.finished: List[Optional[int]] = [None] * len(ranges)
+        self.position = start_after
+        self.lock = threading.Lock()
+
+    def finish(self, index: int, last: int):
+        """ Records that the range was read up to the given rowid. """
+        with self.lock:
+            self.finished[index] = last
+
+    def advance(self, batch: List[tuple]) -> int:
+        """
+        Records the loaded batch and returns the rowid after which the transfer may resume.
+        """
+        rowid = batch[-1][0]
+        with self.lock:
+            index = bisect_left(self.highs, rowid)
+            self.loaded[index] = rowid
+            for (low, high), loaded, finished in zip(self.ranges, self.loaded, self.finished):
+                if finished is None or loaded < finished:
+                    self.position = max(self.position, loaded)
+                    break
+                self.position = high
+            return self.position
+
+
+class ParallelReader:
+    """
+    Reads a table with several SQLite connections at the same time.
+
+    The table is split into rowid ranges and every range is read by its own thread
+    over its own connection into a queue shared by the readers. The batches are
+    yielded as they arrive, so every reader keeps working while the others wait;
+    the rows of a range stay in rowid order, and resume_position gives the
+    checkpoint of the loaded batches. The loading of a full reload skips the rows
+    that already exist, so a resumed transfer may read a few batches again.
+    """
+    def __init__(self, connect: Callable[[], sqlite3.Connection], readers: int = 2, queue_depth: int = 4, queue_bytes: int = 64 * 1024 * 1024):
+        self.connect = connect
+        self.readers = max(1, readers)
+        self.queue_depth = queue_depth
+        self.queue_bytes = queue_bytes
+        self.progress: Optional[RangeProgress] = None
+
+    def resume_position(self, batch: List[tuple]) -> int:
+        """
+        Records the batch as loaded and returns the rowid after which every row is loaded.
+
+        The batches of the last read must be passed in the order they were yielded.
+        """
+        return self.progress.advance(batch)
+
+    def read(self, table_name: str, start_after: int, batch_size: Callable[[], int]) -> Generator[List[tuple], None, None]:
+        """
+        Reads the rows of the table after the given rowid, in rowid order within every range.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            start_after (int): Rowid after which the extraction starts.
+            batch_size (Callable[[], int]): Returns the number of rows per batch, read before every fetch.
+
+        Yields:
+            Generator[List[tuple], None, None]: Rows of the table with the rowid as the first column.
+        """
+        with closing(self.connect()) as connection:
+            ranges = rowid_ranges(connection.cursor(), table_name, self.readers, start_after)
+
+        progress = self.progress = RangeProgress(ranges, start_after)
+        if not ranges:
+            return
+
+        queue = BoundedQueue(self.queue_depth * len(ranges), self.queue_bytes)
+        errors = []
+        running = [len(ranges)]
+        lock = threading.Lock()
+
+        def read_range(index: int, low: int, high: int):
+            last = low
+            try:
+                with closing(self.connect()) as connection:
+                    cursor = connection.execute(
+                        f"SELECT rowid AS {ROWID_COLUMN}, * FROM {table_name} WHERE rowid > ? AND rowid <= ? ORDER BY rowid",
+                        (low, high),
+                    )
+                    while batch := cursor.fetchmany(batch_size()):
+                        queue.put(batch, estimate_batch_bytes(batch))
+                        last = batch[-1][0]
+            except PipelineClosed:
+                return
+            except Exception as e:
+                errors.append(e)
+                queue.close(discard=True)
+                return
+            progress.finish(index, last)
+            # The last reader to finish ends the queue
+            with lock:
+                running[0] -= 1
+                if not running[0]:
+                    queue.close()
+
+        threads = [
+            threading.Thread(target=read_range, args=(index, low, high), name=f"reader-{table_name}-{index}", daemon=True)
+            for index, (low, high) in enumerate(ranges)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            yield from queue
+        finally:
+            # Stops the readers when the consumer fails or stops early
+            queue.close(discard=True)
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
@@ -0,0 +1,224 @@
+# utils/sqlite_to_postgres/verification.py
+
+import hashlib
+import sqlite3
+import psycopg
+import typing
+from dataclasses import MISSING, dataclass, fields
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+from config.components.logging_config import logger
+
+# Separator of the canonical column values, the same on both sides
+SEPARATOR = "\x1f"
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def canonical_uuid(value) -> str:
+    return str(value).lower()
+
+
+def canonical_text(value) -> str:
+    return str(value)
+
+
+def canonical_float(value) -> str:
+    return f"{float(value):.6f}"
+
+
+def canonical_date(value) -> str:
+    return value.isoformat() if isinstance(value, date) else str(value)[:10]
+
+
+def canonical_datetime(value) -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        # Assume that the datetime is in UTC, as the transfer does
+        value = value.replace(tzinfo=timezone.utc)
+    return str((value - EPOCH) // MICROSECOND)
+
+
+# Canonical representation of a value by its type: Python converter and PostgreSQL expression
+CANONICAL_FORMS: Dict[type, Tuple[Callable, str]] = {
+    UUID: (canonical_uuid, "{column}::text"),
+    str: (canonical_text, "{column}::text"),
+    float: (canonical_float, "round({column}::numeric, 6)::text"),
+    date: (canonical_date, "to_char({column}, 'YYYY-MM-DD')"),
+    datetime: (canonical_datetime, "(extract(epoch FROM {column}) * 1000000)::bigint::text"),
+}
+
+
+@dataclass
+class CanonicalColumn:
+    """
+    Column of the table compared by the verifier.
+    """
+    name: str
+    source_name: Optional[str]
+    convert: Callable
+    expression: str
+    default: Optional[object] = None
+
+
+class TransferVerifier:
+    """
+    Verifies the transferred data by comparing digests of the rows in SQLite and PostgreSQL.
+
+    Rows are split into buckets by the leading hex digits of their id. Every row is
+    reduced to a canonical string and hashed; a bucket is summarized by its row count
+    and the sum of the row hashes, which does not depend on the order of the rows.
+    PostgreSQL computes the summaries in SQL and SQLite is read in a single streaming
+    pass. Only the buckets whose summaries differ are compared row by row.
+    """
+    def __init__(self, sqlite_cursor: sqlite3.Cursor, postgres_cursor: psycopg.Cursor, prefix_length: int = 2, batch_size: int = 1000):
+        self.sqlite_cursor = sqlite_cursor
+        self.postgres_cursor = postgres_cursor
+        self.prefix_length = prefix_length
+        self.batch_size = batch_size
+
+    def get_columns(self, table_name: str, model_cls: Type) -> List[CanonicalColumn]:
+        """
+        Returns the compared columns of the table in the order of the dataclass fields.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            model_cls (Type): Class of the dataclass.
+
+        Returns:
+            List[CanonicalColumn]: Compared columns.
+        """
+        self.sqlite_cursor.execute(f"SELECT * FROM {table_name} LIMIT 0")
+        source_columns = {description[0] for description in self.sqlite_cursor.description}
+        field_mapping = getattr(model_cls, "field_mapping", {})
+        source_names = {field: column for column, field in field_mapping.items()}
+
+        columns = []
+        for field in fields(model_cls):
+            # Optional[X] is compared as X
+            field_type = next((arg for arg in typing.get_args(field.type) if arg is not type(None)), field.type)
+            convert, expression = CANONICAL_FORMS[field_type]
+            source_name = source_names.get(field.name, field.name)
+            columns.append(CanonicalColumn(
+                name=field.name,
+                source_name=source_name if source_name in source_columns else None,
+                convert=convert,
+                expression=expression.format(column=field.name),
+                default=None if field.default is MISSING else field.default,
+            ))
+        return columns
+
+    def row_digest_expression(self, columns: List[CanonicalColumn]) -> str:
+        """ Returns the SQL expression of the row hash as a signed 64-bit integer. """
+        values = ", ".join(f"coalesce('v' || {column.expression}, 'n')" for column in columns)
+        return f"('x' || substr(md5(concat_ws(chr(31), {values})), 1, 16))::bit(64)::bigint"
+
+    def row_digest(self, columns: List[CanonicalColumn], row: tuple) -> int:
+        """ Returns the hash of the SQLite row as a signed 64-bit integer. """
+        canonical = SEPARATOR.join(
+            "n" if value is None else "v" + column.convert(value)
+            for column, value in zip(columns, row)
+        )
+        return int.from_bytes(hashlib.md5(canonical.encode("utf-8")).digest()[:8], "big", signed=True)
+
+    def bucket_bounds(self, bucket: str) -> Tuple[str, str]:
+        """ Returns the smallest and the greatest id of the bucket. """
+        low, high = bucket.ljust(32, "0"), bucket.ljust(32, "f")
+        return str(UUID(low)), str(UUID(high))
+
+    def sqlite_query(self, table_name: str, columns: List[CanonicalColumn]) -> str:
+        """ Returns the query selecting the compared columns from SQLite. """
+        selected = ", ".join(column.source_name or "NULL" for column in columns)
+        return f"SELECT {selected} FROM {table_name}"
+
+    def sqlite_rows(self, table_name: str, columns: List[CanonicalColumn], bucket: Optional[str] = None):
+        """ Yields the SQLite rows with the defaults of the columns missing in SQLite. """
+        id_column = columns[0].source_name
+        if bucket is None:
+            self.sqlite_cursor.execute(self.sqlite_query(table_name, columns))
+        else:
+            self.sqlite_cursor.execute(
+                f"{self.sqlite_query(table_name, columns)} WHERE lower(substr({id_column}, 1, ?)) = ?",
+                (self.prefix_length, bucket),
+            )
+        while batch := self.sqlite_cursor.fetchmany(self.batch_size):
+            for row in batch:
+                yield tuple(
+                    value if column.source_name else column.default
+                    for column, value in zip(columns, row)
+                )
+
+    def sqlite_summaries(self, table_name: str, columns: List[CanonicalColumn]) -> Dict[str, Tuple[int, int]]:
+        """ Returns the row count and the sum of the row hashes of every bucket in SQLite. """
+        summaries: Dict[str, List[int]] = {}
+        for row in self.sqlite_rows(table_name, columns):
+            summary = summaries.setdefault(canonical_uuid(row[0])[:self.prefix_length], [0, 0])
+            summary[0] += 1
+            summary[1] += self.row_digest(columns, row)
+        return {bucket: (count, digest) for bucket, (count, digest) in summaries.items()}
+
+    def postgres_summaries(self, table_name: str, columns: List[CanonicalColumn]) -> Dict[str, Tuple[int, int]]:
+        """ Returns the row count and the sum of the row hashes of every bucket in PostgreSQL. """
+        self.postgres_cursor.execute(
+            f"SELECT left(id::text, {self.prefix_length}) AS bucket, count(*) AS count, "
+            f"sum({self.row_digest_expression(columns)}) AS digest "
+            f"FROM content.{table_name} GROUP BY 1"
+        )
+        return {
+            row["bucket"]: (row["count"], int(row["digest"]))
+            for row in self.postgres_cursor.fetchall()
+        }
+
+    def compare_bucket(self, table_name: str, columns: List[CanonicalColumn], bucket: str) -> List[str]:
+        """
+        Compares the rows of a bucket one by one.
+
+        Returns:
+            List[str]: Descriptions of the mismatched rows.
+        """
+        source = {
+            canonical_uuid(row[0]): self.row_digest(columns, row)
+            for row in self.sqlite_rows(table_name, columns, bucket)
+        }
+
+        low, high = self.bucket_bounds(bucket)
+        self.postgres_cursor.execute(
+            f"SELECT id::text AS id, {self.row_digest_expression(columns)} AS digest "
+            f"FROM content.{table_name} WHERE id BETWEEN %s AND %s",
+            [low, high],
+        )
+        target = {row["id"]: row["digest"] for row in self.postgres_cursor.fetchall()}
+
+        mismatches = [f"{row_id}: missing in PostgreSQL" for row_id in source.keys() - target.keys()]
+        mismatches += [f"{row_id}: missing in SQLite" for row_id in target.keys() - source.keys()]
+        mismatches += [
+            f"{row_id}: different values"
+            for row_id in source.keys() & target.keys()
+            if source[row_id] != target[row_id]
+        ]
+        return mismatches
+
+    def verify(self, table_name: str, model_cls: Type) -> List[str]:
+        """
+        Compares the table in SQLite and PostgreSQL.
+
+        Args:
+            table_name (str): Name of the table in the database.
+            model_cls (Type): Class of the dataclass.
+
+        Returns:
+            List[str]: Descriptions of the mismatched rows; empty if the data is the same.
+        """
+        columns = self.get_columns(table_name, model_cls)
+        source = self.sqlite_summaries(table_name, columns)
+        target = self.postgres_summaries(table_name, columns)
+
+        buckets = sorted(bucket for bucket in source.keys() | target.keys() if source.get(bucket) != target.get(bucket))
+        logger.info(f"Verified {len(source.keys() | target.keys())} buckets of {table_name}, {len(buckets)} differ")
+
+        mismatches = []
+        for bucket in buckets:
+            mismatches += self.compare_bucket(table_name, columns, bucket)
+        return mismatches
@@ -0,0 +1,22 @@
+#!/bin/bash
+
+# Остановить выполнение скрипта при ошибке
+set -e
+
+# Логирование
+log() {
+  echo "[$(date '+%Y-%m-%d %H:%M:%S')] $1"
+}
+
+# Запуск uvicorn для асинхронного API (/api/async/): каждый процесс обслуживает
+# все свои соединения в одном цикле событий, не занимая поток на каждый запрос.
+# Статические файлы и миграции остаются за контейнером uWSGI.
+log "Запускаем uvicorn..."
+exec uvicorn config.asgi:application \
+  --host 0.0.0.0 \
+  --port 8001 \
+  --workers "${ASGI_WORKERS:-2}" \
+  --lifespan off \
+  --proxy-headers \
+  --forwarded-allow-ips '*' \
+  --no-access-log